@@ -1,13 +1,19 @@
+import atexit
 from click import ClickException
 from datetime import datetime
 import json
+import threading
 from time import sleep
 
 from humanize import naturalsize
 from slugify import slugify
 from .logging import clog
+from .cache import cached_response
+from .ratelimit import throttle
+from .retry import call_with_retry, log_retry_stats, safe_to_retry
+from .tracing import instrument_pool_manager, trace_request
 from .config import get_api_config, from_variable
-from .utils import exit_on_timeout
+from .utils import exit_on_timeout, parse_retry_after, PollSchedule
 
 import nuvolos_client_api
 from nuvolos_client_api.models import (
@@ -74,42 +80,217 @@ class HumanizedApplication(Application):
         )
 
 
-def list_orgs():
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.OrganizationsV1Api(api_client)
-        try:
-            return api_instance.get_orgs()
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e, f"Exception when listing Nuvolos organizations: {e}"
+class NuvolosApiClient(nuvolos_client_api.ApiClient):
+    """
+    ApiClient that applies the client-side rate limit to every request (see `ratelimit.throttle`),
+    retries transient failures of idempotent requests (see `retry.call_with_retry`)
+    and records every attempt when tracing is enabled (see `tracing.trace_request`).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(NuvolosApiClient, self).__init__(*args, **kwargs)
+        instrument_pool_manager(self.rest_client.pool_manager)
+
+    def call_api(
+        self,
+        method,
+        url,
+        header_params=None,
+        body=None,
+        post_params=None,
+        _request_timeout=None,
+    ):
+        def send():
+            return super(NuvolosApiClient, self).call_api(
+                method,
+                url,
+                header_params=header_params,
+                body=body,
+                post_params=post_params,
+                _request_timeout=_request_timeout,
             )
 
+        def request():
+            throttle(self.configuration.host)
+            return trace_request(send, method, url)
+
+        return call_with_retry(request, method, url)
+
+
+class ApiClientManager(object):
+    """
+    Keeps one pooled, keep-alive ApiClient per (host, API key) for the lifetime of the process,
+    so that consecutive API calls and polling loops reuse the same connections.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def get(self, config=None) -> nuvolos_client_api.ApiClient:
+        if config is None:
+            config = get_api_config()
+        key = (config.host, config.api_key.get("ApiKeyAuth"))
+        with self._lock:
+            api_client = self._clients.get(key)
+            if api_client is None:
+                clog.debug(
+                    f"Creating pooled API client for [{config.host}] with pool size {config.connection_pool_maxsize}"
+                )
+                api_client = NuvolosApiClient(config)
+                self._clients[key] = api_client
+            return api_client
+
+    def close(self):
+        with self._lock:
+            for api_client in self._clients.values():
+                api_client.rest_client.pool_manager.clear()
+            self._clients.clear()
+
+
+client_manager = ApiClientManager()
+atexit.register(client_manager.close)
+atexit.register(log_retry_stats)
+
 
+def get_api_client() -> nuvolos_client_api.ApiClient:
+    """
+    Returns the shared, pooled API client for the currently configured host and API key.
+    """
+    return client_manager.get()
+
+
+@cached_response("orgs")
+def list_orgs():
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.OrganizationsV1Api(api_client)
+    try:
+        return api_instance.get_orgs()
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e, f"Exception when listing Nuvolos organizations: {e}"
+        )
+
+
+@cached_response("spaces")
 def list_spaces(org_slug: str):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.SpacesV1Api(api_client)
-        try:
-            return api_instance.get_spaces(slug=org_slug)
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e, f"Exception when listing Nuvolos spaces for org [{org_slug}]: {e}"
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.SpacesV1Api(api_client)
+    try:
+        return api_instance.get_spaces(slug=org_slug)
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e, f"Exception when listing Nuvolos spaces for org [{org_slug}]: {e}"
+        )
 
 
+@cached_response("instances")
 def list_instances(org_slug: str, space_slug: str):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.InstancesV1Api(api_client)
-        try:
-            return api_instance.get_instances(org_slug=org_slug, space_slug=space_slug)
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when listing Nuvolos instances for org [{org_slug}] and space [{space_slug}]: {e}",
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.InstancesV1Api(api_client)
+    try:
+        return api_instance.get_instances(org_slug=org_slug, space_slug=space_slug)
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when listing Nuvolos instances for org [{org_slug}] and space [{space_slug}]: {e}",
+        )
+
+
+HIERARCHY_LEVELS = ("org", "space", "instance", "snapshot", "app")
+
+
+def _list_hierarchy_children(level: str, path: dict):
+    if level == "org":
+        return list_spaces(org_slug=path["org_slug"])
+    elif level == "space":
+        return list_instances(org_slug=path["org_slug"], space_slug=path["space_slug"])
+    elif level == "instance":
+        return list_snapshots(
+            org_slug=path["org_slug"],
+            space_slug=path["space_slug"],
+            instance_slug=path["instance_slug"],
+        )
+    elif level == "snapshot":
+        return list_apps(
+            org_slug=path["org_slug"],
+            space_slug=path["space_slug"],
+            instance_slug=path["instance_slug"],
+            snapshot_slug=path["snapshot_slug"],
+        )
+    raise ValueError(f"The [{level}] level has no children")
+
+
+def crawl_hierarchy(org_slugs=None, depth: str = "instance", max_workers: int = None):
+    """
+    Crawls the organization / space / instance / snapshot / app hierarchy on a bounded thread pool.
+
+    Every listing is submitted as soon as its parent is known, so the levels are fetched concurrently
+    and results are yielded as they arrive rather than level by level.
+
+    Args:
+        org_slugs: The organizations to crawl (defaults to all organizations of the current user)
+        depth: The deepest level to crawl, one of HIERARCHY_LEVELS
+        max_workers: Maximum number of concurrent requests (defaults to NUVOLOS_CLI_CRAWL_CONCURRENCY or 16)
+
+    Yields:
+        Dicts with the `level` of the entry, its `path` (the slugs of the entry and its parents) and its `data`.
+        Listings that fail are reported with an `error` instead of failing the whole crawl.
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    if depth not in HIERARCHY_LEVELS:
+        raise ValueError(f"Invalid depth [{depth}], must be one of {HIERARCHY_LEVELS}")
+    if max_workers is None:
+        max_workers = int(from_variable("NUVOLOS_CLI_CRAWL_CONCURRENCY", 16))
+    max_level = HIERARCHY_LEVELS.index(depth)
+
+    orgs = list_orgs()
+    if org_slugs:
+        orgs = [o for o in orgs if o.slug in org_slugs]
+        missing = set(org_slugs) - {o.slug for o in orgs}
+        if missing:
+            raise ClickException(
+                f"Organization(s) not found: {', '.join(sorted(missing))}"
             )
 
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+
+        def visit(level_index, path, model):
+            level = HIERARCHY_LEVELS[level_index]
+            path = dict(path, **{f"{level}_slug": model.slug})
+            if level_index < max_level:
+                future = executor.submit(_list_hierarchy_children, level, path)
+                futures[future] = (level_index + 1, path)
+            return {"level": level, "path": path, "data": model}
+
+        for org in orgs:
+            yield visit(0, {}, org)
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                level_index, path = futures.pop(future)
+                try:
+                    children = future.result()
+                except ClickException as e:
+                    error = (
+                        f"HTTP {e.status}: {e.reason}"
+                        if isinstance(e, NuvolosCliException)
+                        else e.message
+                    )
+                    clog.warning(
+                        f"Could not list the {HIERARCHY_LEVELS[level_index]}s of {path}: {error}"
+                    )
+                    yield {
+                        "level": HIERARCHY_LEVELS[level_index - 1],
+                        "path": path,
+                        "error": error,
+                    }
+                    continue
+                for child in children:
+                    yield visit(level_index, path, child)
+
 
 def create_snapshot(
     org_slug: str,
@@ -119,66 +300,63 @@ def create_snapshot(
     snapshot_description: str = None,
     email_once_finished: bool = False,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.InstancesV1Api(api_client)
-        try:
-            return api_instance.create_snapshot(
-                org_slug=org_slug,
-                space_slug=space_slug,
-                instance_slug=instance_slug,
-                body=nuvolos_client_api.SnapshotCreateRequest.from_dict(
-                    {
-                        "name": snapshot_name,
-                        "slug": slugify(snapshot_name, separator="_"),
-                        "description": snapshot_description,
-                        "email_once_finished": email_once_finished,
-                    }
-                ),
-                _headers={"Content-Type": "application/json"},
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when creating Nuvolos snapshot for org [{org_slug}], space [{space_slug}] and instance [{instance_slug}]: {e}",
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.InstancesV1Api(api_client)
+    try:
+        return api_instance.create_snapshot(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_slug=instance_slug,
+            body=nuvolos_client_api.SnapshotCreateRequest.from_dict(
+                {
+                    "name": snapshot_name,
+                    "slug": slugify(snapshot_name, separator="_"),
+                    "description": snapshot_description,
+                    "email_once_finished": email_once_finished,
+                }
+            ),
+            _headers={"Content-Type": "application/json"},
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when creating Nuvolos snapshot for org [{org_slug}], space [{space_slug}] and instance [{instance_slug}]: {e}",
+        )
 
 
 def list_snapshots(org_slug: str, space_slug: str, instance_slug: str):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.SnapshotsV1Api(api_client)
-        try:
-            return api_instance.get_snapshots(
-                org_slug=org_slug,
-                space_slug=space_slug,
-                instance_slug=instance_slug,
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when listing Nuvolos snapshots for org [{org_slug}], space [{space_slug}] and instance [{instance_slug}]: {e}",
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.SnapshotsV1Api(api_client)
+    try:
+        return api_instance.get_snapshots(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_slug=instance_slug,
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when listing Nuvolos snapshots for org [{org_slug}], space [{space_slug}] and instance [{instance_slug}]: {e}",
+        )
 
 
 def delete_snapshot(
     org_slug: str, space_slug: str, instance_slug: str, snapshot_slug: str
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.SnapshotsV1Api(api_client)
-        try:
-            return api_instance.delete_snapshot(
-                org_slug=org_slug,
-                space_slug=space_slug,
-                instance_slug=instance_slug,
-                snapshot_slug=snapshot_slug,
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when deleting Nuvolos snapshot [{snapshot_slug}] for org [{org_slug}], space [{space_slug}] and instance [{instance_slug}]: {e}",
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.SnapshotsV1Api(api_client)
+    try:
+        return api_instance.delete_snapshot(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_slug=instance_slug,
+            snapshot_slug=snapshot_slug,
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when deleting Nuvolos snapshot [{snapshot_slug}] for org [{org_slug}], space [{space_slug}] and instance [{instance_slug}]: {e}",
+        )
 
 
 def get_task(tkid: int) -> Task1:
@@ -191,59 +369,198 @@ def get_task(tkid: int) -> Task1:
     Returns:
         The task object with status information
     """
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.TasksV1Api(api_client)
-        try:
-            return api_instance.get_task(tkid=tkid)
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e, f"Exception when getting task status for task [{tkid}]: {e}"
+    task, _ = _get_task_with_headers(tkid)
+    return task
+
+
+def _get_task_with_headers(tkid: int):
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.TasksV1Api(api_client)
+    try:
+        response = api_instance.get_task_with_http_info(tkid=tkid)
+        return response.data, response.headers
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e, f"Exception when getting task status for task [{tkid}]: {e}"
+        )
+
+
+TASK_PENDING_STATUSES = ("CREATED", "QUEUED", "RUNNING")
+# Status of the tasks whose status could not be retrieved by `wait_for_tasks`
+TASK_ERROR_STATUS = "ERROR"
+
+
+class TaskPoller(object):
+    """
+    Polling schedule, timeout and final status handling of `wait_for_task`, shared by the synchronous
+    and the asyncio (`async_api_client.wait_for_task`) versions, which only differ in how they request
+    the status and sleep:
+
+        poller = TaskPoller(tkid)
+        task, headers = _get_task_with_headers(tkid)
+        while (delay := poller.next_delay(task, headers)) is not None:
+            sleep(delay)
+            task, headers = _get_task_with_headers(tkid)
+        return poller.finish(task)
+    """
+
+    def __init__(
+        self,
+        tkid: int,
+        timeout_secs: int = None,
+        poll_min_secs: float = None,
+        poll_max_secs: float = None,
+    ):
+        if timeout_secs is None:
+            timeout_secs = int(from_variable("APP_TASK_TIMEOUT_SECS", 600))
+        self.tkid = tkid
+        self.timeout_secs = timeout_secs
+        self.schedule = PollSchedule(initial_secs=poll_min_secs, max_secs=poll_max_secs)
+        self.start = datetime.utcnow()
+
+    def next_delay(self, task: Task1, headers=None):
+        """
+        Returns the time to wait before polling the task again, or None if the task reached a final status.
+        Exits if the task is still pending after the timeout.
+        """
+        # Use status rather than numeric codes
+        if task.status not in TASK_PENDING_STATUSES:
+            return None
+        exit_on_timeout(
+            self.start,
+            timeout_secs=self.timeout_secs,
+            err=f"Task [{self.tkid}] is still in progress (status={task.status}) after {self.timeout_secs} seconds",
+        )
+        remaining_secs = (
+            self.timeout_secs - (datetime.utcnow() - self.start).total_seconds()
+        )
+        delay = self.schedule.next_delay(retry_after=parse_retry_after(headers))
+        clog.debug(
+            f"Task [{self.tkid}] is {task.status}, polling again in {delay:.2f}s"
+        )
+        return max(0.0, min(delay, remaining_secs))
+
+    def finish(self, task: Task1):
+        """
+        Returns the completed task, or raises a NuvolosCliException if it failed or was cancelled.
+        """
+        if task.status == "COMPLETED":
+            clog.info(f"Task [{self.tkid}] completed successfully")
+            return task
+        elif task.status == "FAILED":
+            error_msg = f"Task [{self.tkid}] failed with error: {task.result}"
+            reason = "Task failed"
+        elif task.status == "CANCELLED":
+            error_msg = f"Task [{self.tkid}] was cancelled"
+            reason = "Task cancelled"
+        else:
+            error_msg = (
+                f"Task [{self.tkid}] ended with unexpected status: {task.status}"
             )
+            reason = "Unexpected task status"
+        clog.error(error_msg)
+        raise NuvolosCliException(500, reason, error_msg, {}, "")
 
 
-def wait_for_task(tkid: int, timeout_secs: int = None):
+def wait_for_task(
+    tkid: int,
+    timeout_secs: int = None,
+    poll_min_secs: float = None,
+    poll_max_secs: float = None,
+):
     """
-    Waits for a task to complete, periodically checking its status.
+    Waits for a task to complete, polling its status with exponential backoff.
 
     Args:
         tkid: The ID of the task to wait for
         timeout_secs: Maximum time to wait in seconds before timing out (defaults to APP_TASK_TIMEOUT_SECS or 600)
+        poll_min_secs: Initial polling interval (defaults to NUVOLOS_CLI_POLL_MIN_SECS or 0.25)
+        poll_max_secs: Maximum polling interval (defaults to NUVOLOS_CLI_POLL_MAX_SECS or 15)
 
     Returns:
         The completed task object
     """
+    poller = TaskPoller(tkid, timeout_secs, poll_min_secs, poll_max_secs)
+    task, headers = _get_task_with_headers(tkid)
+    while (delay := poller.next_delay(task, headers)) is not None:
+        sleep(delay)
+        task, headers = _get_task_with_headers(tkid)
+    return poller.finish(task)
+
+
+def wait_for_tasks(
+    tkids,
+    timeout_secs: int = None,
+    max_workers: int = None,
+    poll_min_secs: float = None,
+    poll_max_secs: float = None,
+):
+    """
+    Waits for many tasks concurrently, yielding each task as soon as it reaches a final status.
+
+    All pending tasks are polled in rounds on a bounded thread pool and share one backoff schedule, so waiting for
+    many tasks costs at most `max_workers` concurrent requests per polling interval.
+
+    Args:
+        tkids: The IDs of the tasks to wait for
+        timeout_secs: Maximum time to wait in seconds before timing out (defaults to APP_TASK_TIMEOUT_SECS or 600)
+        max_workers: Maximum number of concurrent status requests (defaults to NUVOLOS_CLI_POLL_CONCURRENCY or 8)
+        poll_min_secs: Initial polling interval (defaults to NUVOLOS_CLI_POLL_MIN_SECS or 0.25)
+        poll_max_secs: Maximum polling interval (defaults to NUVOLOS_CLI_POLL_MAX_SECS or 15)
+
+    Yields:
+        The task objects in the order they finish, whatever their final status is. Tasks whose status cannot be
+        retrieved (e.g. unknown task IDs) are yielded with the ERROR status and the error as their result.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
     if timeout_secs is None:
         timeout_secs = int(from_variable("APP_TASK_TIMEOUT_SECS", 600))
+    if max_workers is None:
+        max_workers = int(from_variable("NUVOLOS_CLI_POLL_CONCURRENCY", 8))
 
+    pending = list(dict.fromkeys(tkids))
+    schedule = PollSchedule(initial_secs=poll_min_secs, max_secs=poll_max_secs)
     start = datetime.utcnow()
-    task = get_task(tkid)
-
-    # Use status rather than numeric codes
-    while task.status in ["CREATED", "QUEUED", "RUNNING"]:
-        exit_on_timeout(
-            start,
-            timeout_secs=timeout_secs,
-            err=f"Task [{tkid}] is still in progress (status={task.status}) after {timeout_secs} seconds",
-        )
-        sleep(5)
-        task = get_task(tkid)
-
-    if task.status == "COMPLETED":
-        clog.info(f"Task [{tkid}] completed successfully")
-        return task
-    elif task.status == "FAILED":
-        error_msg = f"Task [{tkid}] failed with error: {task.error}"
-        clog.error(error_msg)
-        raise NuvolosCliException(500, "Task failed", error_msg, {}, "")
-    elif task.status == "CANCELLED":
-        error_msg = f"Task [{tkid}] was cancelled"
-        clog.error(error_msg)
-        raise NuvolosCliException(500, "Task cancelled", error_msg, {}, "")
-    else:
-        error_msg = f"Task [{tkid}] ended with unexpected status: {task.status}"
-        clog.error(error_msg)
-        raise NuvolosCliException(500, "Unexpected task status", error_msg, {}, "")
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(pending) or 1))
+    ) as executor:
+        while pending:
+            retry_after = None
+            still_pending = []
+            futures = {
+                executor.submit(_get_task_with_headers, tkid): tkid for tkid in pending
+            }
+            for future in as_completed(futures):
+                tkid = futures[future]
+                try:
+                    task, headers = future.result()
+                except ClickException as e:
+                    # A task whose status cannot be retrieved is reported on its own, the others are still waited for
+                    yield Task1(id=tkid, status=TASK_ERROR_STATUS, result=e.message)
+                    continue
+                if task.status in TASK_PENDING_STATUSES:
+                    still_pending.append(tkid)
+                    retry_after = max(
+                        filter(None, [retry_after, parse_retry_after(headers)]),
+                        default=None,
+                    )
+                else:
+                    yield task
+            pending = still_pending
+            if not pending:
+                break
+            exit_on_timeout(
+                start,
+                timeout_secs=timeout_secs,
+                err=f"Tasks {pending} are still in progress after {timeout_secs} seconds",
+            )
+            remaining_secs = timeout_secs - (datetime.utcnow() - start).total_seconds()
+            delay = schedule.next_delay(retry_after=retry_after)
+            clog.debug(
+                f"{len(pending)} task(s) in progress, polling again in {delay:.2f}s"
+            )
+            sleep(max(0.0, min(delay, remaining_secs)))
 
 
 def list_apps(
@@ -252,182 +569,379 @@ def list_apps(
     instance_slug: str,
     snapshot_slug: str,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.AppsV1Api(api_client)
-        try:
-            return [
-                HumanizedApplication.from_application(a)
-                for a in api_instance.get_apps(
-                    org_slug=org_slug,
-                    space_slug=space_slug,
-                    instance_slug=instance_slug,
-                    snapshot_slug=snapshot_slug,
-                )
-            ]
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when listing Nuvolos apps for org [{org_slug}], space [{space_slug}] and instance [{instance_slug}]: {e}",
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.AppsV1Api(api_client)
+    try:
+        return [
+            HumanizedApplication.from_application(a)
+            for a in api_instance.get_apps(
+                org_slug=org_slug,
+                space_slug=space_slug,
+                instance_slug=instance_slug,
+                snapshot_slug=snapshot_slug,
             )
+        ]
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when listing Nuvolos apps for org [{org_slug}], space [{space_slug}] and instance [{instance_slug}]: {e}",
+        )
 
 
 def list_all_running_apps():
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.WorkloadsV1Api(api_client)
-        try:
-            return api_instance.get_workloads()
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e, f"Exception when listing running Nuvolos apps: {e}"
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.WorkloadsV1Api(api_client)
+    try:
+        return api_instance.get_workloads()
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e, f"Exception when listing running Nuvolos apps: {e}"
+        )
 
 
 def list_all_running_workloads_for_app(
     org_slug: str, space_slug: str, instance_slug: str, app_slug: str
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.WorkloadsV1Api(api_client)
-        try:
-            return api_instance.get_workloads_for_app(
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.WorkloadsV1Api(api_client)
+    try:
+        return api_instance.get_workloads_for_app(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_slug=instance_slug,
+            app_slug=app_slug,
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when listing running workloads for Nuvolos app {app_slug}: {e}",
+        )
+
+
+def start_app(
+    org_slug: str,
+    space_slug: str,
+    instance_slug: str,
+    app_slug: str,
+    node_pool: str = None,
+):
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.WorkloadsV1Api(api_client)
+    try:
+        if node_pool is not None:
+            res = api_instance.create_workload(
                 org_slug=org_slug,
                 space_slug=space_slug,
                 instance_slug=instance_slug,
                 app_slug=app_slug,
+                body=StartApp.from_dict({"node_pool": node_pool}),
+                _headers={"Content-Type": "application/json"},
+            )
+            clog.info(
+                f"App [{app_slug}] successfully started on node pool [{node_pool}]:\n{res}"
             )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when listing running workloads for Nuvolos app {app_slug}: {e}",
+        else:
+            res = api_instance.create_workload(
+                org_slug=org_slug,
+                space_slug=space_slug,
+                instance_slug=instance_slug,
+                app_slug=app_slug,
             )
+            clog.info(f"App [{app_slug}] successfully started:\n{res}")
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when starting Nuvolos app [{app_slug}]: {e}",
+        )
 
 
-def start_app(
+# Workload statuses after which an application will not become running without a new start
+WORKLOAD_FAILED_STATUSES = ("FAILED", "ERROR")
+# State of an application that has no workload yet while waiting for it to run, distinct from any workload status
+APP_NO_WORKLOAD_STATE = "PENDING"
+
+
+def _app_state(app: dict, until: str):
+    """
+    Returns the state of an application from all of its workloads: RUNNING if any workload is running,
+    PENDING (when waiting for it to run) or STOPPED (when waiting for it to stop) if it has no workload,
+    and the status of its first workload that has one otherwise.
+    """
+    workloads = list_all_running_workloads_for_app(
+        org_slug=app["org_slug"],
+        space_slug=app["space_slug"],
+        instance_slug=app["instance_slug"],
+        app_slug=app["app_slug"],
+    )
+    if not workloads:
+        return APP_NO_WORKLOAD_STATE if until == "running" else "STOPPED"
+    statuses = [w.status for w in workloads if w.status]
+    if "RUNNING" in statuses:
+        return "RUNNING"
+    return statuses[0] if statuses else "STARTING"
+
+
+def wait_for_apps(
+    apps,
+    until: str = "running",
+    timeout_secs: int = None,
+    no_workload_timeout_secs: int = None,
+    max_workers: int = None,
+    poll_min_secs: float = None,
+    poll_max_secs: float = None,
+):
+    """
+    Waits for many applications concurrently until they are running, or until all their workloads are gone.
+
+    The workloads of all pending applications are polled in rounds on a bounded thread pool and share one backoff
+    schedule, like `wait_for_tasks`. The schedule is reset whenever an application changes state, so that polling
+    is frequent while applications are making progress and backs off while they are not.
+
+    Args:
+        apps: Dicts with the `org_slug`, `space_slug`, `instance_slug` and `app_slug` of the applications
+        until: `running` or `stopped`
+        timeout_secs: Maximum time to wait in seconds
+            (defaults to APP_START_TIMEOUT_SECS or APP_STOP_TIMEOUT_SECS, or 600)
+        no_workload_timeout_secs: Maximum time to wait for an application to have a workload at all when waiting
+            for it to run (defaults to APP_NO_WORKLOAD_TIMEOUT_SECS or 30)
+        max_workers: Maximum number of concurrent status requests (defaults to NUVOLOS_CLI_POLL_CONCURRENCY or 8)
+        poll_min_secs: Initial polling interval (defaults to NUVOLOS_CLI_POLL_MIN_SECS or 0.25)
+        poll_max_secs: Maximum polling interval (defaults to NUVOLOS_CLI_POLL_MAX_SECS or 15)
+
+    Yields:
+        A state-transition event for every application whenever its state changes (e.g. PENDING, STARTING, RUNNING),
+        as a dict with the `app`, its `state`, its `previous` state, the `elapsed_secs` since waiting started,
+        whether the state is `final` and the `error` of FAILED applications. The last event of every application
+        is final, with the RUNNING or STOPPED state, or FAILED.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if until not in ("running", "stopped"):
+        raise ValueError(f"Invalid state [{until}], must be `running` or `stopped`")
+    target = until.upper()
+    if timeout_secs is None:
+        timeout_secs = int(
+            from_variable(
+                (
+                    "APP_START_TIMEOUT_SECS"
+                    if until == "running"
+                    else "APP_STOP_TIMEOUT_SECS"
+                ),
+                600,
+            )
+        )
+    if no_workload_timeout_secs is None:
+        no_workload_timeout_secs = int(
+            from_variable("APP_NO_WORKLOAD_TIMEOUT_SECS", 30)
+        )
+    if max_workers is None:
+        max_workers = int(from_variable("NUVOLOS_CLI_POLL_CONCURRENCY", 8))
+
+    def poll(app):
+        try:
+            return _app_state(app, until), None
+        except ClickException as e:
+            return None, (
+                f"HTTP {e.status}: {e.reason}"
+                if isinstance(e, NuvolosCliException)
+                else e.message
+            )
+
+    def event(app, state, previous, elapsed_secs, error=None):
+        return {
+            "app": app,
+            "state": state,
+            "previous": previous,
+            "elapsed_secs": round(elapsed_secs, 1),
+            "final": state in (target, "FAILED"),
+            "error": error,
+        }
+
+    pending = list(apps)
+    states = {}
+    schedule = PollSchedule(initial_secs=poll_min_secs, max_secs=poll_max_secs)
+    start = datetime.utcnow()
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(pending) or 1))
+    ) as executor:
+        while pending:
+            elapsed_secs = (datetime.utcnow() - start).total_seconds()
+            changed = False
+            still_pending = []
+            for app, (state, error) in zip(pending, executor.map(poll, pending)):
+                previous = states.get(id(app))
+                if error is None and state in WORKLOAD_FAILED_STATUSES:
+                    error = f"The workload is in {state} state"
+                if error is None and state != target:
+                    if (
+                        state == APP_NO_WORKLOAD_STATE
+                        and elapsed_secs > no_workload_timeout_secs
+                    ):
+                        error = f"No workload is available after {no_workload_timeout_secs} seconds"
+                    elif elapsed_secs > timeout_secs:
+                        error = f"Still in {state} state after {timeout_secs} seconds"
+                if error is not None:
+                    yield event(app, "FAILED", previous, elapsed_secs, error)
+                    continue
+                if state != previous:
+                    states[id(app)] = state
+                    changed = True
+                    yield event(app, state, previous, elapsed_secs)
+                if state != target:
+                    still_pending.append(app)
+            pending = still_pending
+            if not pending:
+                break
+            if changed:
+                schedule.reset()
+            delay = schedule.next_delay()
+            clog.debug(
+                f"{len(pending)} application(s) not {until} yet, polling again in {delay:.2f}s"
+            )
+            sleep(delay)
+
+
+def _wait_for_app(
     org_slug: str,
     space_slug: str,
     instance_slug: str,
     app_slug: str,
-    node_pool: str = None,
+    until: str,
+    timeout_secs: int = None,
+    no_workload_timeout_secs: int = None,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.WorkloadsV1Api(api_client)
-        try:
-            if node_pool is not None:
-                res = api_instance.create_workload(
-                    org_slug=org_slug,
-                    space_slug=space_slug,
-                    instance_slug=instance_slug,
-                    app_slug=app_slug,
-                    body=StartApp.from_dict({"node_pool": node_pool}),
-                    _headers={"Content-Type": "application/json"},
-                )
-                clog.info(
-                    f"App [{app_slug}] successfully started on node pool [{node_pool}]:\n{res}"
-                )
-            else:
-                res = api_instance.create_workload(
-                    org_slug=org_slug,
-                    space_slug=space_slug,
-                    instance_slug=instance_slug,
-                    app_slug=app_slug,
-                )
-                clog.info(f"App [{app_slug}] successfully started:\n{res}")
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when starting Nuvolos app [{app_slug}]: {e}",
-            )
+    app = {
+        "org_slug": org_slug,
+        "space_slug": space_slug,
+        "instance_slug": instance_slug,
+        "app_slug": app_slug,
+    }
+    for e in wait_for_apps(
+        [app],
+        until=until,
+        timeout_secs=timeout_secs,
+        no_workload_timeout_secs=no_workload_timeout_secs,
+    ):
+        if e["state"] == "FAILED":
+            raise ClickException(f"Application [{app_slug}]: {e['error']}")
+        if not e["final"]:
+            clog.info(f"App [{app_slug}] is {e['state']} ({e['elapsed_secs']}s)")
+    return e["elapsed_secs"]
 
 
 def wait_for_app_running(
-    org_slug: str, space_slug: str, instance_slug: str, app_slug: str
+    org_slug: str,
+    space_slug: str,
+    instance_slug: str,
+    app_slug: str,
+    timeout_secs: int = None,
+    no_workload_timeout_secs: int = None,
 ):
-    running = False
-    start = datetime.utcnow()
-    stopped_timeout_secs = 30
-    starting_timeout_secs = int(from_variable("APP_START_TIMEOUT_SECS", 600))
-    while not running:
-        workloads = list_all_running_workloads_for_app(
+    """
+    Waits until the application has a running workload, logging its state transitions.
+    Returns the time it took in seconds.
+    """
+    elapsed_secs = _wait_for_app(
+        org_slug,
+        space_slug,
+        instance_slug,
+        app_slug,
+        until="running",
+        timeout_secs=timeout_secs,
+        no_workload_timeout_secs=no_workload_timeout_secs,
+    )
+    clog.info(
+        f"App [{app_slug}] is successfully started and running after {elapsed_secs}s."
+    )
+    return elapsed_secs
+
+
+def wait_for_app_stopped(
+    org_slug: str,
+    space_slug: str,
+    instance_slug: str,
+    app_slug: str,
+    timeout_secs: int = None,
+):
+    """
+    Waits until all workloads of the application are gone, logging its state transitions.
+    Returns the time it took in seconds.
+    """
+    elapsed_secs = _wait_for_app(
+        org_slug,
+        space_slug,
+        instance_slug,
+        app_slug,
+        until="stopped",
+        timeout_secs=timeout_secs,
+    )
+    clog.info(f"App [{app_slug}] is stopped after {elapsed_secs}s.")
+    return elapsed_secs
+
+
+@safe_to_retry
+def stop_app(org_slug: str, space_slug: str, instance_slug: str, app_slug: str):
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.WorkloadsV1Api(api_client)
+    try:
+        api_instance.delete_workload(
             org_slug=org_slug,
             space_slug=space_slug,
             instance_slug=instance_slug,
             app_slug=app_slug,
         )
-        if len(workloads) == 0:
-            exit_on_timeout(
-                start,
-                timeout_secs=stopped_timeout_secs,
-                err=f"No workload is available for app [{app_slug}] after {stopped_timeout_secs} seconds",
-            )
-            sleep(5)
-        else:
-            if workloads[0].status == "RUNNING":
-                running = True
-            else:
-                exit_on_timeout(
-                    start,
-                    timeout_secs=starting_timeout_secs,
-                    err=f"Application [{app_slug}] is still in STARTING state after {starting_timeout_secs} seconds",
-                )
-                sleep(5)
-    clog.info(f"App [{app_slug}] is successfully started and running.")
-
-
-def stop_app(org_slug: str, space_slug: str, instance_slug: str, app_slug: str):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.WorkloadsV1Api(api_client)
-        try:
-            api_instance.delete_workload(
-                org_slug=org_slug,
-                space_slug=space_slug,
-                instance_slug=instance_slug,
-                app_slug=app_slug,
-            )
-            clog.info(f"App [{app_slug}] successfully stopped")
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when stopping Nuvolos app [{app_slug}]: {e}",
-            )
+        clog.info(f"App [{app_slug}] successfully stopped")
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when stopping Nuvolos app [{app_slug}]: {e}",
+        )
 
 
 def execute_command_in_app(
-    org_slug: str, space_slug: str, instance_slug: str, app_slug: str, command: str
+    org_slug: str,
+    space_slug: str,
+    instance_slug: str,
+    app_slug: str,
+    command: str,
+    timeout_secs: float = None,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.WorkloadsV1Api(api_client)
-        try:
-            return api_instance.execute_command(
-                org_slug=org_slug,
-                space_slug=space_slug,
-                instance_slug=instance_slug,
-                app_slug=app_slug,
-                body=ExecuteCommand.from_dict({"command": command}),
-                _headers={"Content-Type": "application/json"},
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when running command {command} in Nuvolos app [{app_slug}]: {e}",
-            )
+    import urllib3
+
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.WorkloadsV1Api(api_client)
+    try:
+        return api_instance.execute_command(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_slug=instance_slug,
+            app_slug=app_slug,
+            execute_command=ExecuteCommand.from_dict({"command": command}),
+            _headers={"Content-Type": "application/json"},
+            _request_timeout=timeout_secs,
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when running command {command} in Nuvolos app [{app_slug}]: {e}",
+        )
+    except urllib3.exceptions.TimeoutError:
+        raise ClickException(
+            f"Running command {command} in Nuvolos app [{app_slug}] timed out after {timeout_secs} seconds"
+        )
 
 
+@cached_response("nodepools")
 def list_nodepools():
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.WorkloadsV1Api(api_client)
-        try:
-            return api_instance.get_nodepools()
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when listing nodepools: {e}",
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.WorkloadsV1Api(api_client)
+    try:
+        return api_instance.get_nodepools()
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when listing nodepools: {e}",
+        )
 
 
 def create_instance(
@@ -437,27 +951,28 @@ def create_instance(
     instance_slug: str,
     instance_description: str = None,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.InstancesV1Api(api_client)
-        try:
-            return api_instance.create_instance(
-                org_slug=org_slug,
-                space_slug=space_slug,
-                instance_create_request=InstanceCreateRequest.from_dict(
-                    {
-                        "name": instance_name,
-                        "slug": instance_slug,
-                        "description": instance_description,
-                    }
-                ),
-                _headers={"Content-Type": "application/json"},
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when creating instance [{instance_name}] in org [{org_slug}], space [{space_slug}]: {e}",
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.InstancesV1Api(api_client)
+    try:
+        res = api_instance.create_instance(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_create_request=InstanceCreateRequest.from_dict(
+                {
+                    "name": instance_name,
+                    "slug": instance_slug,
+                    "description": instance_description,
+                }
+            ),
+            _headers={"Content-Type": "application/json"},
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when creating instance [{instance_name}] in org [{org_slug}], space [{space_slug}]: {e}",
+        )
+    list_instances.invalidate(org_slug=org_slug, space_slug=space_slug)
+    return res
 
 
 def create_app(
@@ -469,27 +984,26 @@ def create_app(
     description: str = None,
     pars: str = None,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.AppsV1Api(api_client)
-        body = {"imid": imid, "long_id": long_id}
-        if description is not None:
-            body["description"] = description
-        if pars is not None:
-            body["pars"] = pars
-        try:
-            return api_instance.create_app(
-                org_slug=org_slug,
-                space_slug=space_slug,
-                instance_slug=instance_slug,
-                app_create=AppCreate.from_dict(body),
-                _headers={"Content-Type": "application/json"},
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when creating app in org [{org_slug}], space [{space_slug}], instance [{instance_slug}]: {e}",
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.AppsV1Api(api_client)
+    body = {"imid": imid, "long_id": long_id}
+    if description is not None:
+        body["description"] = description
+    if pars is not None:
+        body["pars"] = pars
+    try:
+        return api_instance.create_app(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_slug=instance_slug,
+            app_create=AppCreate.from_dict(body),
+            _headers={"Content-Type": "application/json"},
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when creating app in org [{org_slug}], space [{space_slug}], instance [{instance_slug}]: {e}",
+        )
 
 
 def derive_app(
@@ -500,38 +1014,37 @@ def derive_app(
     image_tag: str = None,
     email_once_finished: bool = True,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.AppsV1Api(api_client)
-        body = {"email_once_finished": email_once_finished}
-        if image_tag is not None:
-            body["image_tag"] = image_tag
-        try:
-            return api_instance.derive_app(
-                org_slug=org_slug,
-                space_slug=space_slug,
-                instance_slug=instance_slug,
-                app_slug=app_slug,
-                derive_app=DeriveApp.from_dict(body),
-                _headers={"Content-Type": "application/json"},
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when deriving app [{app_slug}] in org [{org_slug}], space [{space_slug}], instance [{instance_slug}]: {e}",
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.AppsV1Api(api_client)
+    body = {"email_once_finished": email_once_finished}
+    if image_tag is not None:
+        body["image_tag"] = image_tag
+    try:
+        return api_instance.derive_app(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_slug=instance_slug,
+            app_slug=app_slug,
+            derive_app=DeriveApp.from_dict(body),
+            _headers={"Content-Type": "application/json"},
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when deriving app [{app_slug}] in org [{org_slug}], space [{space_slug}], instance [{instance_slug}]: {e}",
+        )
 
 
+@cached_response("images")
 def list_images():
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.ImagesV1Api(api_client)
-        try:
-            return api_instance.get_images()
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e, f"Exception when listing images: {e}"
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.ImagesV1Api(api_client)
+    try:
+        return api_instance.get_images()
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e, f"Exception when listing images: {e}"
+        )
 
 
 def create_image(
@@ -550,43 +1063,44 @@ def create_image(
     complexity: int = None,
     tags: dict = None,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.ImagesV1Api(api_client)
-        body = {
-            "name": name,
-            "docker_image_url": docker_image_url,
-            "description_md": description_md,
-            "ifid": ifid,
-            "public": public,
-        }
-        if description is not None:
-            body["description"] = description
-        if public_description is not None:
-            body["public_description"] = public_description
-        if org_slug is not None:
-            body["org_slug"] = org_slug
-        if space_slug is not None:
-            body["space_slug"] = space_slug
-        if app_type is not None:
-            body["app_type"] = app_type
-        if configuration is not None:
-            body["configuration"] = configuration
-        if has_tables is not None:
-            body["has_tables"] = has_tables
-        if complexity is not None:
-            body["complexity"] = complexity
-        if tags is not None:
-            body["tags"] = tags
-        try:
-            return api_instance.create_image(
-                image_create=ImageCreate.from_dict(body),
-                _headers={"Content-Type": "application/json"},
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e, f"Exception when creating image [{name}]: {e}"
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.ImagesV1Api(api_client)
+    body = {
+        "name": name,
+        "docker_image_url": docker_image_url,
+        "description_md": description_md,
+        "ifid": ifid,
+        "public": public,
+    }
+    if description is not None:
+        body["description"] = description
+    if public_description is not None:
+        body["public_description"] = public_description
+    if org_slug is not None:
+        body["org_slug"] = org_slug
+    if space_slug is not None:
+        body["space_slug"] = space_slug
+    if app_type is not None:
+        body["app_type"] = app_type
+    if configuration is not None:
+        body["configuration"] = configuration
+    if has_tables is not None:
+        body["has_tables"] = has_tables
+    if complexity is not None:
+        body["complexity"] = complexity
+    if tags is not None:
+        body["tags"] = tags
+    try:
+        res = api_instance.create_image(
+            image_create=ImageCreate.from_dict(body),
+            _headers={"Content-Type": "application/json"},
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e, f"Exception when creating image [{name}]: {e}"
+        )
+    list_images.invalidate()
+    return res
 
 
 def update_image(
@@ -602,67 +1116,66 @@ def update_image(
     complexity: int = None,
     tags: dict = None,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.ImagesV1Api(api_client)
-        body = {}
-        if name is not None:
-            body["name"] = name
-        if docker_image_url is not None:
-            body["docker_image_url"] = docker_image_url
-        if description is not None:
-            body["description"] = description
-        if description_md is not None:
-            body["description_md"] = description_md
-        if public is not None:
-            body["public"] = public
-        if public_description is not None:
-            body["public_description"] = public_description
-        if app_type is not None:
-            body["app_type"] = app_type
-        if configuration is not None:
-            body["configuration"] = configuration
-        if complexity is not None:
-            body["complexity"] = complexity
-        if tags is not None:
-            body["tags"] = tags
-        try:
-            return api_instance.update_image(
-                imid=imid,
-                image_update=ImageUpdate.from_dict(body),
-                _headers={"Content-Type": "application/json"},
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e, f"Exception when updating image [{imid}]: {e}"
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.ImagesV1Api(api_client)
+    body = {}
+    if name is not None:
+        body["name"] = name
+    if docker_image_url is not None:
+        body["docker_image_url"] = docker_image_url
+    if description is not None:
+        body["description"] = description
+    if description_md is not None:
+        body["description_md"] = description_md
+    if public is not None:
+        body["public"] = public
+    if public_description is not None:
+        body["public_description"] = public_description
+    if app_type is not None:
+        body["app_type"] = app_type
+    if configuration is not None:
+        body["configuration"] = configuration
+    if complexity is not None:
+        body["complexity"] = complexity
+    if tags is not None:
+        body["tags"] = tags
+    try:
+        res = api_instance.update_image(
+            imid=imid,
+            image_update=ImageUpdate.from_dict(body),
+            _headers={"Content-Type": "application/json"},
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e, f"Exception when updating image [{imid}]: {e}"
+        )
+    list_images.invalidate()
+    return res
 
 
+@cached_response("image_families")
 def list_image_families():
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.ImageFamiliesV1Api(api_client)
-        try:
-            response = api_instance.get_image_families_without_preload_content()
-            raw_payload = response.data.decode("utf-8") if response.data else "[]"
-            families = json.loads(raw_payload)
-
-            # Some backend records may contain null entries inside groups,
-            # while the generated client expects every item to be a string.
-            sanitized_families = []
-            for family in families:
-                groups = family.get("groups")
-                if isinstance(groups, list):
-                    family["groups"] = [group for group in groups if group is not None]
-                sanitized_families.append(
-                    nuvolos_client_api.ImageFamily.from_dict(family)
-                )
-
-            return sanitized_families
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e, f"Exception when listing image families: {e}"
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.ImageFamiliesV1Api(api_client)
+    try:
+        response = api_instance.get_image_families_without_preload_content()
+        raw_payload = response.data.decode("utf-8") if response.data else "[]"
+        families = json.loads(raw_payload)
+
+        # Some backend records may contain null entries inside groups,
+        # while the generated client expects every item to be a string.
+        sanitized_families = []
+        for family in families:
+            groups = family.get("groups")
+            if isinstance(groups, list):
+                family["groups"] = [group for group in groups if group is not None]
+            sanitized_families.append(nuvolos_client_api.ImageFamily.from_dict(family))
+
+        return sanitized_families
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e, f"Exception when listing image families: {e}"
+        )
 
 
 def create_image_family(
@@ -671,35 +1184,36 @@ def create_image_family(
     description: str = None,
     groups: list = None,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.ImageFamiliesV1Api(api_client)
-        body = {"name": name, "icon_url": icon_url}
-        if description is not None:
-            body["description"] = description
-        if groups is not None:
-            body["groups"] = groups
-        try:
-            return api_instance.create_image_family(
-                image_family_create=ImageFamilyCreate.from_dict(body),
-                _headers={"Content-Type": "application/json"},
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e, f"Exception when creating image family [{name}]: {e}"
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.ImageFamiliesV1Api(api_client)
+    body = {"name": name, "icon_url": icon_url}
+    if description is not None:
+        body["description"] = description
+    if groups is not None:
+        body["groups"] = groups
+    try:
+        res = api_instance.create_image_family(
+            image_family_create=ImageFamilyCreate.from_dict(body),
+            _headers={"Content-Type": "application/json"},
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e, f"Exception when creating image family [{name}]: {e}"
+        )
+    list_image_families.invalidate()
+    return res
 
 
+@cached_response("image_links")
 def list_image_links():
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.ImageLinksV1Api(api_client)
-        try:
-            return api_instance.get_image_links()
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e, f"Exception when listing image links: {e}"
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.ImageLinksV1Api(api_client)
+    try:
+        return api_instance.get_image_links()
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e, f"Exception when listing image links: {e}"
+        )
 
 
 def list_sessions(
@@ -712,30 +1226,100 @@ def list_sessions(
     session_id: str = None,
     sort: str = None,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.SessionsV1Api(api_client)
-        kwargs = {
-            "org_slug": org_slug,
-            "space_slug": space_slug,
-            "instance_slug": instance_slug,
-            "app_slug": app_slug,
-        }
-        if page is not None:
-            kwargs["page"] = page
-        if per_page is not None:
-            kwargs["per_page"] = per_page
-        if session_id is not None:
-            kwargs["session_id"] = session_id
-        if sort is not None:
-            kwargs["sort"] = sort
-        try:
-            return api_instance.get_sessions(**kwargs)
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when listing sessions for app [{app_slug}]: {e}",
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.SessionsV1Api(api_client)
+    kwargs = {
+        "org_slug": org_slug,
+        "space_slug": space_slug,
+        "instance_slug": instance_slug,
+        "app_slug": app_slug,
+    }
+    if page is not None:
+        kwargs["page"] = page
+    if per_page is not None:
+        kwargs["per_page"] = per_page
+    if session_id is not None:
+        kwargs["session_id"] = session_id
+    if sort is not None:
+        kwargs["sort"] = sort
+    try:
+        return api_instance.get_sessions(**kwargs)
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when listing sessions for app [{app_slug}]: {e}",
+        )
+
+
+# Largest page of sessions requested when iterating over all sessions, to keep the number of requests low
+SESSIONS_MAX_PER_PAGE = 1000
+
+
+def iter_sessions(
+    org_slug: str,
+    space_slug: str,
+    instance_slug: str,
+    app_slug: str,
+    per_page: int = None,
+    sort: str = None,
+    prefetch: int = 2,
+):
+    """
+    Iterates over all sessions of an application, fetching the pages lazily.
+
+    While the sessions of a page are consumed, up to `prefetch` following pages are already being fetched
+    in the background, so that the next page is usually available when it is needed. Pages are requested
+    with `per_page` sessions (default: NUVOLOS_CLI_SESSIONS_PER_PAGE or SESSIONS_MAX_PER_PAGE). If the API
+    returns smaller pages than requested, the size of the largest page is used to detect the last one.
+
+    Yields:
+        The sessions of every page, in the order returned by the API
+    """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    if per_page is None:
+        per_page = int(
+            from_variable("NUVOLOS_CLI_SESSIONS_PER_PAGE", SESSIONS_MAX_PER_PAGE)
+        )
+    prefetch = max(1, prefetch)
+    with ThreadPoolExecutor(max_workers=prefetch) as executor:
+        futures = deque()
+        next_page = 1
+
+        def fetch_next_page():
+            nonlocal next_page
+            futures.append(
+                executor.submit(
+                    list_sessions,
+                    org_slug=org_slug,
+                    space_slug=space_slug,
+                    instance_slug=instance_slug,
+                    app_slug=app_slug,
+                    page=next_page,
+                    per_page=per_page,
+                    sort=sort,
+                )
             )
+            next_page += 1
+
+        for _ in range(prefetch):
+            fetch_next_page()
+        page_size = 0
+        try:
+            while futures:
+                sessions = futures.popleft().result()
+                if not sessions or len(sessions) < page_size:
+                    # Last page, the pages prefetched after it are empty
+                    yield from sessions
+                    return
+                # The API may cap the page size below `per_page`
+                page_size = len(sessions)
+                fetch_next_page()
+                yield from sessions
+        finally:
+            for future in futures:
+                future.cancel()
 
 
 def get_session_logs(
@@ -744,33 +1328,218 @@ def get_session_logs(
     max_lines: int = None,
     from_start: str = None,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.SessionsV1Api(api_client)
-        kwargs = {
-            "session_id": session_id,
-            "container_name": container_name,
-        }
-        if max_lines is not None:
-            kwargs["max_lines"] = max_lines
-        if from_start is not None:
-            kwargs["from_start"] = from_start
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.SessionsV1Api(api_client)
+    kwargs = {
+        "session_id": session_id,
+        "container_name": container_name,
+    }
+    if max_lines is not None:
+        kwargs["max_lines"] = max_lines
+    if from_start is not None:
+        kwargs["from_start"] = from_start
+    try:
+        response = api_instance.get_session_logs_without_preload_content(**kwargs)
+        raw_payload = response.data.decode("utf-8") if response.data else "[]"
+        if not raw_payload.strip():
+            return []
         try:
-            response = api_instance.get_session_logs_without_preload_content(**kwargs)
-            raw_payload = response.data.decode("utf-8") if response.data else "[]"
-            if not raw_payload.strip():
-                return []
-            try:
-                return json.loads(raw_payload)
-            except json.JSONDecodeError:
-                return raw_payload
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when getting session logs for session [{session_id}], container [{container_name}]: {e}",
+            return json.loads(raw_payload)
+        except json.JSONDecodeError:
+            return raw_payload
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when getting session logs for session [{session_id}], container [{container_name}]: {e}",
+        )
+
+
+def merge_session_logs(
+    session_id: str,
+    container_names,
+    max_lines: int = None,
+    from_start: str = None,
+    max_workers: int = None,
+):
+    """
+    Fetches the logs of several containers of a session concurrently and merges them into one stream
+    ordered by timestamp (`ts`), with a heap-based k-way merge.
+
+    Every entry gets a `container` field with the name of the container it comes from.
+    Only the current entry of every container is compared, so the merge itself is lazy.
+
+    Yields:
+        The log entries of all containers in chronological order
+    """
+    import heapq
+    from concurrent.futures import ThreadPoolExecutor
+
+    def stream(container_name, future):
+        result = future.result()
+        if isinstance(result, dict):
+            result = [result]
+        if not isinstance(result, list) or not all(
+            isinstance(entry, dict) and entry.get("ts") is not None for entry in result
+        ):
+            raise ClickException(
+                f"The logs of container [{container_name}] are not structured log entries with a `ts` field and cannot be merged"
+            )
+        for entry in sorted(result, key=lambda e: e["ts"]):
+            yield dict({"container": container_name}, **entry)
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers or min(len(container_names), 8) or 1
+    ) as executor:
+        streams = [
+            stream(
+                container_name,
+                executor.submit(
+                    get_session_logs,
+                    session_id=session_id,
+                    container_name=container_name,
+                    max_lines=max_lines,
+                    from_start=from_start,
+                ),
+            )
+            for container_name in container_names
+        ]
+        yield from heapq.merge(*streams, key=lambda e: e["ts"])
+
+
+class LogCursor(object):
+    """
+    Position in the logs of a session container, used to page through the logs with `from_start`.
+
+    The cursor is advanced to the latest timestamp (`ts`) received. Since `from_start` is inclusive, the entries
+    already seen at that timestamp are remembered (as hashes) and skipped, so no entry is returned twice
+    at batch boundaries.
+    """
+
+    def __init__(self, from_start: str = None, last_ts=None, seen=()):
+        self.from_start = from_start
+        self.last_ts = last_ts
+        self.seen = set(seen)
+
+    @property
+    def position(self):
+        return self.from_start if self.last_ts is None else str(self.last_ts)
+
+    def advance(self, batch):
+        """
+        Returns the new entries of a batch in chronological order and moves the cursor past them.
+        """
+        import hashlib
+
+        if isinstance(batch, dict):
+            batch = [batch]
+        if not isinstance(batch, list) or not all(
+            isinstance(entry, dict) and entry.get("ts") is not None for entry in batch
+        ):
+            raise ClickException(
+                "Paging through logs is only supported for structured log entries with a `ts` field"
+            )
+        new_entries = []
+        for entry in sorted(batch, key=lambda e: e["ts"]):
+            if self.last_ts is not None and entry["ts"] < self.last_ts:
+                continue
+            key = hashlib.sha1(
+                json.dumps(entry, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest()
+            if entry["ts"] == self.last_ts:
+                if key in self.seen:
+                    continue
+            else:
+                self.last_ts = entry["ts"]
+                self.seen = set()
+            self.seen.add(key)
+            new_entries.append(entry)
+        return new_entries
+
+    def to_dict(self):
+        return {
+            "from_start": self.from_start,
+            "last_ts": self.last_ts,
+            "seen": sorted(self.seen),
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d.get("from_start"), d.get("last_ts"), d.get("seen", ()))
+
+
+# The API returns at most 100 lines per request by default
+DEFAULT_LOG_LINES = 100
+
+
+def iter_session_log_chunks(
+    session_id: str,
+    container_name: str,
+    cursor: LogCursor,
+    max_lines: int = None,
+):
+    """
+    Pages through the entire log history of a session container, yielding the new entries of every request
+    in chronological order. The `cursor` is advanced as the chunks are consumed, so it can be saved after
+    each chunk and used to resume later. Stops at the end of the available logs.
+    """
+    chunk_size = max_lines or DEFAULT_LOG_LINES
+    while True:
+        batch = get_session_logs(
+            session_id=session_id,
+            container_name=container_name,
+            max_lines=max_lines,
+            from_start=cursor.position,
+        )
+        entries = cursor.advance(batch)
+        if entries:
+            yield entries
+        if len(batch) < chunk_size:
+            return
+        if not entries:
+            raise ClickException(
+                f"More than {chunk_size} log entries share the timestamp [{cursor.last_ts}], increase the number of lines per request"
             )
 
 
+def follow_session_logs(
+    session_id: str,
+    container_name: str,
+    max_lines: int = None,
+    from_start: str = None,
+    poll_min_secs: float = None,
+    poll_max_secs: float = None,
+):
+    """
+    Follows the logs of a session, yielding new structured log entries as they arrive.
+
+    Every request starts from the last timestamp received (see `LogCursor`). Polling backs off exponentially
+    while no new lines arrive, and is immediate while full batches of `max_lines` are returned.
+
+    Yields:
+        The log entries in chronological order
+    """
+    schedule = PollSchedule(initial_secs=poll_min_secs, max_secs=poll_max_secs)
+    cursor = LogCursor(from_start)
+    while True:
+        batch = get_session_logs(
+            session_id=session_id,
+            container_name=container_name,
+            max_lines=max_lines,
+            from_start=cursor.position,
+        )
+        new_entries = cursor.advance(batch)
+        yield from new_entries
+
+        if new_entries:
+            schedule.reset()
+            if len(batch) >= (max_lines or DEFAULT_LOG_LINES):
+                # More lines are probably waiting, fetch them right away
+                continue
+        delay = schedule.next_delay()
+        clog.debug(f"Polling logs of session [{session_id}] again in {delay:.2f}s")
+        sleep(delay)
+
+
 def distribute_content(
     org_slug: str,
     space_slug: str,
@@ -784,35 +1553,34 @@ def distribute_content(
     notify_target_users: bool = False,
     custom_email_message: str = None,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.DistributionV1Api(api_client)
-        request_body = {
-            "target_instances": target_instances,
-            "auto_snapshot": auto_snapshot,
-            "notify_target_users": notify_target_users,
-        }
-        if source_applications:
-            request_body["source_applications"] = source_applications
-        if source_files:
-            request_body["source_files"] = source_files
-        if source_tables:
-            request_body["source_tables"] = source_tables
-        if custom_email_message:
-            request_body["custom_email_message"] = custom_email_message
-        try:
-            return api_instance.distribute_content(
-                org_slug=org_slug,
-                space_slug=space_slug,
-                instance_slug=instance_slug,
-                snapshot_slug=snapshot_slug,
-                distribution_request=DistributionRequest.from_dict(request_body),
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when distributing content from org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.DistributionV1Api(api_client)
+    request_body = {
+        "target_instances": target_instances,
+        "auto_snapshot": auto_snapshot,
+        "notify_target_users": notify_target_users,
+    }
+    if source_applications:
+        request_body["source_applications"] = source_applications
+    if source_files:
+        request_body["source_files"] = source_files
+    if source_tables:
+        request_body["source_tables"] = source_tables
+    if custom_email_message:
+        request_body["custom_email_message"] = custom_email_message
+    try:
+        return api_instance.distribute_content(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_slug=instance_slug,
+            snapshot_slug=snapshot_slug,
+            distribution_request=DistributionRequest.from_dict(request_body),
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when distributing content from org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
+        )
 
 
 def list_files(
@@ -823,86 +1591,83 @@ def list_files(
     area: str = "files",
     local_path: str = None,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.FilesV1Api(api_client)
-        try:
-            if area == "files":
-                if local_path:
-                    return api_instance.get_files_in_files_area_0(
-                        org_slug=org_slug,
-                        space_slug=space_slug,
-                        instance_slug=instance_slug,
-                        snapshot_slug=snapshot_slug,
-                        local_path=local_path,
-                    )
-                return api_instance.get_files_in_files_area(
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.FilesV1Api(api_client)
+    try:
+        if area == "files":
+            if local_path:
+                return api_instance.get_files_in_files_area_0(
                     org_slug=org_slug,
                     space_slug=space_slug,
                     instance_slug=instance_slug,
                     snapshot_slug=snapshot_slug,
+                    local_path=local_path,
                 )
+            return api_instance.get_files_in_files_area(
+                org_slug=org_slug,
+                space_slug=space_slug,
+                instance_slug=instance_slug,
+                snapshot_slug=snapshot_slug,
+            )
 
-            if area == "home":
-                if local_path:
-                    return api_instance.get_files_in_home_area_0(
-                        org_slug=org_slug,
-                        space_slug=space_slug,
-                        instance_slug=instance_slug,
-                        snapshot_slug=snapshot_slug,
-                        local_path=local_path,
-                    )
-                return api_instance.get_files_in_home_area(
+        if area == "home":
+            if local_path:
+                return api_instance.get_files_in_home_area_0(
                     org_slug=org_slug,
                     space_slug=space_slug,
                     instance_slug=instance_slug,
                     snapshot_slug=snapshot_slug,
+                    local_path=local_path,
                 )
-
-            raise ClickException("Area must be either 'files' or 'home'")
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when listing files in area [{area}] for org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
-            )
-
-
-def list_tables(org_slug: str, space_slug: str, instance_slug: str, snapshot_slug: str):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.TablesV1Api(api_client)
-        try:
-            return api_instance.get_tables(
+            return api_instance.get_files_in_home_area(
                 org_slug=org_slug,
                 space_slug=space_slug,
                 instance_slug=instance_slug,
                 snapshot_slug=snapshot_slug,
             )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when listing tables for org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
-            )
+
+        raise ClickException("Area must be either 'files' or 'home'")
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when listing files in area [{area}] for org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
+        )
+
+
+def list_tables(org_slug: str, space_slug: str, instance_slug: str, snapshot_slug: str):
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.TablesV1Api(api_client)
+    try:
+        return api_instance.get_tables(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_slug=instance_slug,
+            snapshot_slug=snapshot_slug,
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when listing tables for org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
+        )
 
 
 def get_schema_ddl(
     org_slug: str, space_slug: str, instance_slug: str, snapshot_slug: str
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.TablesV1Api(api_client)
-        try:
-            return api_instance.get_schema_ddl(
-                org_slug=org_slug,
-                space_slug=space_slug,
-                instance_slug=instance_slug,
-                snapshot_slug=snapshot_slug,
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when retrieving schema DDL for org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.TablesV1Api(api_client)
+    try:
+        return api_instance.get_schema_ddl(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_slug=instance_slug,
+            snapshot_slug=snapshot_slug,
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when retrieving schema DDL for org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
+        )
 
 
 def get_table_columns(
@@ -912,22 +1677,21 @@ def get_table_columns(
     snapshot_slug: str,
     table_slug: str,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.TablesV1Api(api_client)
-        try:
-            return api_instance.get_table_columns(
-                org_slug=org_slug,
-                space_slug=space_slug,
-                instance_slug=instance_slug,
-                snapshot_slug=snapshot_slug,
-                table_slug=table_slug,
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when retrieving columns for table [{table_slug}] in org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.TablesV1Api(api_client)
+    try:
+        return api_instance.get_table_columns(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_slug=instance_slug,
+            snapshot_slug=snapshot_slug,
+            table_slug=table_slug,
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when retrieving columns for table [{table_slug}] in org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
+        )
 
 
 def get_table_ddl(
@@ -937,22 +1701,21 @@ def get_table_ddl(
     snapshot_slug: str,
     table_slug: str,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.TablesV1Api(api_client)
-        try:
-            return api_instance.get_table_ddl(
-                org_slug=org_slug,
-                space_slug=space_slug,
-                instance_slug=instance_slug,
-                snapshot_slug=snapshot_slug,
-                table_slug=table_slug,
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when retrieving DDL for table [{table_slug}] in org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.TablesV1Api(api_client)
+    try:
+        return api_instance.get_table_ddl(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_slug=instance_slug,
+            snapshot_slug=snapshot_slug,
+            table_slug=table_slug,
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when retrieving DDL for table [{table_slug}] in org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
+        )
 
 
 def rename_table(
@@ -972,24 +1735,23 @@ def rename_table(
     if not body:
         raise ClickException("Provide at least one of --new-slug or --new-name")
 
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.TablesV1Api(api_client)
-        try:
-            return api_instance.rename_table(
-                org_slug=org_slug,
-                space_slug=space_slug,
-                instance_slug=instance_slug,
-                snapshot_slug=snapshot_slug,
-                table_slug=table_slug,
-                table_update=TableUpdate.from_dict(body),
-                _headers={"Content-Type": "application/json"},
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when renaming table [{table_slug}] in org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.TablesV1Api(api_client)
+    try:
+        return api_instance.rename_table(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_slug=instance_slug,
+            snapshot_slug=snapshot_slug,
+            table_slug=table_slug,
+            table_update=TableUpdate.from_dict(body),
+            _headers={"Content-Type": "application/json"},
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when renaming table [{table_slug}] in org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
+        )
 
 
 def delete_table(
@@ -999,19 +1761,18 @@ def delete_table(
     snapshot_slug: str,
     table_slug: str,
 ):
-    config = get_api_config()
-    with nuvolos_client_api.ApiClient(config) as api_client:
-        api_instance = nuvolos_client_api.TablesV1Api(api_client)
-        try:
-            return api_instance.delete_table(
-                org_slug=org_slug,
-                space_slug=space_slug,
-                instance_slug=instance_slug,
-                snapshot_slug=snapshot_slug,
-                table_slug=table_slug,
-            )
-        except nuvolos_client_api.ApiException as e:
-            raise NuvolosCliException.from_api_exception(
-                e,
-                f"Exception when deleting table [{table_slug}] in org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
-            )
+    api_client = get_api_client()
+    api_instance = nuvolos_client_api.TablesV1Api(api_client)
+    try:
+        return api_instance.delete_table(
+            org_slug=org_slug,
+            space_slug=space_slug,
+            instance_slug=instance_slug,
+            snapshot_slug=snapshot_slug,
+            table_slug=table_slug,
+        )
+    except nuvolos_client_api.ApiException as e:
+        raise NuvolosCliException.from_api_exception(
+            e,
+            f"Exception when deleting table [{table_slug}] in org [{org_slug}], space [{space_slug}], instance [{instance_slug}], snapshot [{snapshot_slug}]: {e}",
+        )
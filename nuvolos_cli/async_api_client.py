@@ -0,0 +1,159 @@
+"""
+Asyncio versions of the API client functions.
+
+The generated Nuvolos API client is synchronous, so every coroutine runs its request on a shared thread pool,
+using the same pooled `ApiClient` as the synchronous functions. In-flight requests are limited by the size of
+the thread pool, while waiting (e.g. between polls) does not occupy a thread. This allows a single event loop
+to drive thousands of concurrent operations:
+
+    from nuvolos_cli import async_api_client as aapi
+
+    async def main(tkids):
+        return await asyncio.gather(*(aapi.wait_for_task(tkid) for tkid in tkids))
+
+    tasks = aapi.run(main([1, 2, 3]))
+
+This module is meant for scripts that use the CLI as a library. The CLI commands do not use it: their fan-out
+paths (e.g. `tasks wait`, `tree` or `apps bulk-start`) already poll in rounds on bounded thread pools and sleep
+between rounds on a single thread, so they gain nothing from an event loop. Every request still occupies a pool
+thread while it is in flight, so the async API mainly saves the threads that would otherwise sleep between polls
+when a script waits for many operations independently.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import api_client
+from .api_client import TaskPoller
+from .config import from_variable, get_api_config
+
+_lock = threading.Lock()
+_executor = None
+_concurrency = None
+
+
+def get_concurrency():
+    """
+    Returns the maximum number of concurrent requests, which defaults to the size of the connection pool
+    so that every in-flight request can reuse a pooled connection.
+    Can be overridden with the NUVOLOS_CLI_ASYNC_CONCURRENCY environment variable or `set_concurrency`.
+    """
+    global _concurrency
+    with _lock:
+        if _concurrency is None:
+            concurrency = from_variable("NUVOLOS_CLI_ASYNC_CONCURRENCY")
+            _concurrency = (
+                int(concurrency)
+                if concurrency
+                else get_api_config().connection_pool_maxsize
+            )
+        return _concurrency
+
+
+def set_concurrency(concurrency: int):
+    """
+    Sets the maximum number of concurrent requests. Must be called before the first request is made.
+    """
+    global _concurrency
+    with _lock:
+        if _executor is not None:
+            raise RuntimeError(
+                "The concurrency cannot be changed after the first request"
+            )
+        _concurrency = concurrency
+
+
+def _get_executor():
+    global _executor
+    concurrency = get_concurrency()
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=concurrency, thread_name_prefix="nuvolos-async"
+            )
+        return _executor
+
+
+async def call(f, *args, **kwargs):
+    """
+    Runs a synchronous API client function on the shared thread pool, whose size is the concurrency limit.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_executor(), functools.partial(f, *args, **kwargs)
+    )
+
+
+def _make_async(f):
+    @functools.wraps(f)
+    async def wrapper(*args, **kwargs):
+        return await call(f, *args, **kwargs)
+
+    return wrapper
+
+
+list_orgs = _make_async(api_client.list_orgs)
+list_spaces = _make_async(api_client.list_spaces)
+list_instances = _make_async(api_client.list_instances)
+create_instance = _make_async(api_client.create_instance)
+list_snapshots = _make_async(api_client.list_snapshots)
+create_snapshot = _make_async(api_client.create_snapshot)
+delete_snapshot = _make_async(api_client.delete_snapshot)
+get_task = _make_async(api_client.get_task)
+_get_task_with_headers = _make_async(api_client._get_task_with_headers)
+list_apps = _make_async(api_client.list_apps)
+list_all_running_apps = _make_async(api_client.list_all_running_apps)
+list_all_running_workloads_for_app = _make_async(
+    api_client.list_all_running_workloads_for_app
+)
+start_app = _make_async(api_client.start_app)
+stop_app = _make_async(api_client.stop_app)
+execute_command_in_app = _make_async(api_client.execute_command_in_app)
+create_app = _make_async(api_client.create_app)
+derive_app = _make_async(api_client.derive_app)
+list_nodepools = _make_async(api_client.list_nodepools)
+list_images = _make_async(api_client.list_images)
+create_image = _make_async(api_client.create_image)
+update_image = _make_async(api_client.update_image)
+list_image_families = _make_async(api_client.list_image_families)
+create_image_family = _make_async(api_client.create_image_family)
+list_image_links = _make_async(api_client.list_image_links)
+list_sessions = _make_async(api_client.list_sessions)
+get_session_logs = _make_async(api_client.get_session_logs)
+distribute_content = _make_async(api_client.distribute_content)
+list_files = _make_async(api_client.list_files)
+list_tables = _make_async(api_client.list_tables)
+get_schema_ddl = _make_async(api_client.get_schema_ddl)
+get_table_columns = _make_async(api_client.get_table_columns)
+get_table_ddl = _make_async(api_client.get_table_ddl)
+rename_table = _make_async(api_client.rename_table)
+delete_table = _make_async(api_client.delete_table)
+
+
+async def wait_for_task(
+    tkid: int,
+    timeout_secs: int = None,
+    poll_min_secs: float = None,
+    poll_max_secs: float = None,
+):
+    """
+    Waits for a task to complete, polling its status with exponential backoff (see `api_client.TaskPoller`).
+    Only the status requests run on the thread pool, the waits between them do not occupy a thread.
+
+    Returns:
+        The completed task object
+    """
+    poller = TaskPoller(tkid, timeout_secs, poll_min_secs, poll_max_secs)
+    task, headers = await _get_task_with_headers(tkid)
+    while (delay := poller.next_delay(task, headers)) is not None:
+        await asyncio.sleep(delay)
+        task, headers = await _get_task_with_headers(tkid)
+    return poller.finish(task)
+
+
+def run(coro):
+    """
+    Runs a coroutine to completion from synchronous code, e.g. from a CLI command.
+    """
+    return asyncio.run(coro)
@@ -0,0 +1,315 @@
+"""
+Bulk operations on many applications, e.g. starting all student applications before a class.
+
+The applications are either read from a manifest (a CSV file with a header, or a YAML list of mappings)
+or selected with glob patterns on the instance and application slugs of a space.
+"""
+
+import csv
+import io
+import time
+from fnmatch import fnmatch
+
+from click import ClickException
+
+from .config import from_variable
+from .logging import clog
+
+# Manifest columns, the `_slug` suffix is optional
+APP_FIELDS = ("org_slug", "space_slug", "instance_slug", "app_slug")
+
+
+def _normalize_app(row: dict, defaults: dict, line: int):
+    app = {}
+    for field in APP_FIELDS:
+        name = field[: -len("_slug")]
+        value = row.get(field) or row.get(name) or defaults.get(field)
+        if not value:
+            raise ClickException(f"Entry {line} of the manifest has no [{name}]")
+        app[field] = str(value).strip()
+    node_pool = row.get("node_pool") or defaults.get("node_pool")
+    app["node_pool"] = str(node_pool).strip() if node_pool else None
+    return app
+
+
+def load_manifest(f, defaults: dict = None):
+    """
+    Reads the applications of a manifest file, either a YAML list of mappings (or a mapping with an `apps` list)
+    or a CSV file with an `org`, `space`, `instance`, `app` and optional `node_pool` header.
+    Missing org, space, instance and node pool values are taken from `defaults`.
+    """
+    import yaml
+
+    content = f.read()
+    rows = None
+    name = getattr(f, "name", "") or ""
+    if not name.endswith(".csv"):
+        try:
+            rows = yaml.safe_load(content)
+        except yaml.YAMLError:
+            rows = None
+        if isinstance(rows, dict):
+            rows = rows.get("apps")
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            rows = None
+    if rows is None:
+        rows = list(csv.DictReader(io.StringIO(content), skipinitialspace=True))
+    apps = [
+        _normalize_app(row, defaults or {}, line)
+        for line, row in enumerate(rows, start=1)
+    ]
+    if not apps:
+        raise ClickException("The manifest does not contain any application")
+    return apps
+
+
+def select_apps(
+    org_slug: str,
+    space_slug: str,
+    instance_pattern: str = "*",
+    app_pattern: str = "*",
+    snapshot_slug: str = "development",
+    node_pool: str = None,
+    max_workers: int = None,
+):
+    """
+    Returns the applications of the instances of a space whose slugs match the given glob patterns.
+    The applications of the matching instances are listed concurrently.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from .api_client import list_instances, list_apps
+
+    if max_workers is None:
+        max_workers = int(from_variable("NUVOLOS_CLI_CRAWL_CONCURRENCY", 16))
+
+    instances = [
+        i.slug
+        for i in list_instances(org_slug=org_slug, space_slug=space_slug)
+        if fnmatch(i.slug, instance_pattern)
+    ]
+
+    def apps_of(instance_slug):
+        return [
+            {
+                "org_slug": org_slug,
+                "space_slug": space_slug,
+                "instance_slug": instance_slug,
+                "app_slug": a.slug,
+                "node_pool": node_pool,
+            }
+            for a in list_apps(
+                org_slug=org_slug,
+                space_slug=space_slug,
+                instance_slug=instance_slug,
+                snapshot_slug=snapshot_slug,
+            )
+            if fnmatch(a.slug, app_pattern)
+        ]
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(instances) or 1))
+    ) as executor:
+        apps = [app for apps in executor.map(apps_of, instances) for app in apps]
+    if not apps:
+        raise ClickException(
+            f"No application matches [{app_pattern}] in the instances matching [{instance_pattern}]"
+        )
+    return apps
+
+
+def running_apps(
+    org_slug: str = None,
+    space_slug: str = None,
+    instance_pattern: str = "*",
+    app_pattern: str = "*",
+):
+    """
+    Returns the running applications of the current user, optionally only those of an organization and space
+    whose instance and application slugs match the given glob patterns.
+    """
+    from .api_client import list_all_running_apps
+
+    apps = {}
+    for w in list_all_running_apps():
+        if (
+            (org_slug and w.org_slug != org_slug)
+            or (space_slug and w.space_slug != space_slug)
+            or not fnmatch(w.instance_slug or "", instance_pattern)
+            or not fnmatch(w.slug or "", app_pattern)
+        ):
+            continue
+        key = (w.org_slug, w.space_slug, w.instance_slug, w.slug)
+        apps.setdefault(key, dict(zip(APP_FIELDS, key), node_pool=w.node_pool))
+    if not apps:
+        raise ClickException("No running application matches the given filters")
+    return list(apps.values())
+
+
+def _error_message(e: ClickException):
+    from .api_client import NuvolosCliException
+
+    if isinstance(e, NuvolosCliException):
+        return f"HTTP {e.status}: {e.reason}"
+    return e.message
+
+
+def _result(app: dict, status: str, started: float = None, error: str = None):
+    return {
+        "org": app["org_slug"],
+        "space": app["space_slug"],
+        "instance": app["instance_slug"],
+        "app": app["app_slug"],
+        "status": status,
+        "elapsed_secs": round(time.monotonic() - started, 1) if started else None,
+        "error": error,
+    }
+
+
+def _run_bulk(apps, action, max_workers: int):
+    """
+    Runs `action` on every application on a bounded thread pool.
+    Yields (app, start time, result of the action, error) tuples as soon as every action finishes.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    if max_workers is None:
+        max_workers = int(from_variable("NUVOLOS_CLI_BULK_CONCURRENCY", 8))
+
+    def run(app):
+        started = time.monotonic()
+        try:
+            return app, started, action(app), None
+        except ClickException as e:
+            return app, started, None, _error_message(e)
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(apps) or 1))
+    ) as executor:
+        for future in as_completed([executor.submit(run, app) for app in apps]):
+            yield future.result()
+
+
+def _wait_results(apps, started: dict, until: str, timeout_secs: int = None):
+    """
+    Waits for the started applications with `wait_for_apps`, logging their state transitions,
+    and yields the final result of every application.
+    """
+    from .api_client import wait_for_apps
+
+    clog.info(f"Waiting for {len(started)} application(s) to be {until}")
+    for event in wait_for_apps(
+        [app for app in apps if id(app) in started],
+        until=until,
+        timeout_secs=timeout_secs,
+    ):
+        app = event["app"]
+        if event["state"] == "FAILED":
+            clog.error(f"App [{app['app_slug']}] is not {until}: {event['error']}")
+            yield _result(app, "FAILED", started[id(app)], event["error"])
+        elif event["final"]:
+            yield _result(app, event["state"], started[id(app)])
+        else:
+            clog.debug(
+                f"App [{app['app_slug']}] is {event['state']} ({event['elapsed_secs']}s)"
+            )
+
+
+def bulk_start(
+    apps,
+    max_workers: int = None,
+    wait: bool = False,
+    timeout_secs: int = None,
+):
+    """
+    Starts many applications with bounded parallelism and optionally waits until all of them are running.
+
+    Yields a result for every application as soon as it is known: `STARTED` (or `RUNNING` when waiting)
+    with the time from the start request, or `FAILED` with the error.
+    """
+    from .api_client import start_app
+
+    def action(app):
+        start_app(
+            org_slug=app["org_slug"],
+            space_slug=app["space_slug"],
+            instance_slug=app["instance_slug"],
+            app_slug=app["app_slug"],
+            node_pool=app.get("node_pool"),
+        )
+
+    started = {}
+    for app, start, _, error in _run_bulk(apps, action, max_workers):
+        if error is not None:
+            clog.error(f"Could not start app [{app['app_slug']}]: {error}")
+            yield _result(app, "FAILED", start, error)
+        elif wait:
+            started[id(app)] = start
+        else:
+            yield _result(app, "STARTED", start)
+
+    if started:
+        yield from _wait_results(apps, started, "running", timeout_secs)
+
+
+def bulk_stop(
+    apps,
+    max_workers: int = None,
+    wait: bool = False,
+    timeout_secs: int = None,
+):
+    """
+    Stops many applications with bounded parallelism and optionally waits until all their workloads are gone.
+
+    Yields a result for every application as soon as it is known: `STOPPED` with the time from the stop request,
+    or `FAILED` with the error.
+    """
+    from .api_client import stop_app
+
+    def action(app):
+        stop_app(
+            org_slug=app["org_slug"],
+            space_slug=app["space_slug"],
+            instance_slug=app["instance_slug"],
+            app_slug=app["app_slug"],
+        )
+
+    started = {}
+    for app, start, _, error in _run_bulk(apps, action, max_workers):
+        if error is not None:
+            clog.error(f"Could not stop app [{app['app_slug']}]: {error}")
+            yield _result(app, "FAILED", start, error)
+        elif wait:
+            started[id(app)] = start
+        else:
+            yield _result(app, "STOPPED", start)
+
+    if started:
+        yield from _wait_results(apps, started, "stopped", timeout_secs)
+
+
+def bulk_execute(apps, command: str, max_workers: int = None, timeout_secs=None):
+    """
+    Executes a command in many applications with bounded parallelism, yielding a result for every application
+    as soon as its request finished: `OK` with the response of the API, or `FAILED` with the error.
+    """
+    from .api_client import execute_command_in_app
+    from .utils import _model_to_dict
+
+    def action(app):
+        return execute_command_in_app(
+            org_slug=app["org_slug"],
+            space_slug=app["space_slug"],
+            instance_slug=app["instance_slug"],
+            app_slug=app["app_slug"],
+            command=command,
+            timeout_secs=timeout_secs,
+        )
+
+    for app, start, response, error in _run_bulk(apps, action, max_workers):
+        if error is not None:
+            yield _result(app, "FAILED", start, error)
+        else:
+            result = _result(app, "OK", start)
+            if response is not None:
+                result.update(_model_to_dict(response))
+            yield result
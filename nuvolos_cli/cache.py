@@ -0,0 +1,317 @@
+import hashlib
+import inspect
+import json
+import os
+import pathlib
+import tempfile
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from .logging import clog
+
+# Default time-to-live of the cached responses in seconds, per endpoint.
+# Can be overridden with the NUVOLOS_CLI_CACHE_TTL_<ENDPOINT> environment variables.
+DEFAULT_TTLS = {
+    "orgs": 600,
+    "spaces": 300,
+    "instances": 120,
+    "images": 600,
+    "image_families": 600,
+    "image_links": 600,
+    "nodepools": 300,
+}
+DEFAULT_MAX_SIZE_MB = 50
+
+CACHE_MODE_USE = "use"
+CACHE_MODE_REFRESH = "refresh"
+CACHE_MODE_OFF = "off"
+
+_cache_mode = CACHE_MODE_USE
+# In-memory copy of the cache entries, keyed by (cache directory, key). Only used by long-running processes.
+_memory_cache = None
+
+
+def set_cache_mode(mode: str):
+    """
+    Sets how the response cache is used by the current process:
+    `use` reads and writes the cache, `refresh` only writes it and `off` bypasses it completely.
+    """
+    global _cache_mode
+    if mode not in (CACHE_MODE_USE, CACHE_MODE_REFRESH, CACHE_MODE_OFF):
+        raise ValueError(f"Invalid cache mode [{mode}]")
+    _cache_mode = mode
+
+
+@contextmanager
+def cache_mode(mode: str):
+    """
+    Sets the cache mode of the current process within the block and restores the previous one afterwards,
+    e.g. to bypass the cache while `--watch` polls a command.
+    """
+    previous = _cache_mode
+    set_cache_mode(mode)
+    try:
+        yield
+    finally:
+        set_cache_mode(previous)
+
+
+def get_cache_mode():
+    if os.environ.get("NUVOLOS_CLI_NO_CACHE", "false").lower() in ("true", "1", "yes"):
+        return CACHE_MODE_OFF
+    return _cache_mode
+
+
+def enable_memory_cache():
+    """
+    Keeps the cache entries in memory as well as on disk, so that a long-running process like
+    the `nuvolos serve` daemon does not read and parse the cache files on every hit.
+    """
+    global _memory_cache
+    if _memory_cache is None:
+        _memory_cache = {}
+
+
+def memory_cache_changes(since: dict):
+    """
+    Returns the entries of the in-memory cache that were added or replaced since `since` (a copy of it),
+    and the keys that were removed, e.g. to pass the entries cached by a `nuvolos serve` worker to the daemon.
+    """
+    if _memory_cache is None:
+        return {"set": [], "deleted": []}
+    return {
+        "set": [
+            [list(key), entry]
+            for key, entry in _memory_cache.items()
+            if since.get(key) is not entry
+        ],
+        "deleted": [list(key) for key in since if key not in _memory_cache],
+    }
+
+
+def apply_memory_cache_changes(changes: dict):
+    """Applies the changes returned by `memory_cache_changes` in another process to the in-memory cache."""
+    if _memory_cache is None:
+        return
+    for key, entry in changes.get("set", []):
+        _memory_cache[tuple(key)] = entry
+    for key in changes.get("deleted", []):
+        _memory_cache.pop(tuple(key), None)
+
+
+def get_cache_dir():
+    cache_dir = os.environ.get("NUVOLOS_CLI_CACHE_DIR")
+    if cache_dir:
+        return pathlib.Path(cache_dir)
+    return pathlib.Path.home() / ".nuvolos" / "cache"
+
+
+def get_ttl(endpoint: str):
+    ttl = os.environ.get(f"NUVOLOS_CLI_CACHE_TTL_{endpoint.upper()}")
+    return int(ttl) if ttl else DEFAULT_TTLS.get(endpoint, 0)
+
+
+def get_max_size():
+    max_size_mb = os.environ.get("NUVOLOS_CLI_CACHE_MAX_MB")
+    return int(float(max_size_mb or DEFAULT_MAX_SIZE_MB) * 1024 * 1024)
+
+
+class ResponseCache(object):
+    """
+    Persistent cache of API responses, stored as one JSON file per request.
+
+    Entries are written atomically, so that parallel processes never read a partially written entry.
+    The modification time of an entry is bumped on every hit, and the least recently used entries are evicted
+    once the cache grows above its size cap.
+    """
+
+    def __init__(self, path, max_size):
+        self.path = pathlib.Path(path)
+        self.max_size = max_size
+
+    @staticmethod
+    def make_key(endpoint: str, *parts):
+        digest = hashlib.sha256(
+            json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        return f"{endpoint}-{digest}"
+
+    def _entry_path(self, key: str):
+        return self.path / f"{key}.json"
+
+    def get(self, key: str, ttl: int):
+        entry_path = self._entry_path(key)
+        if _memory_cache is not None:
+            entry = _memory_cache.get((str(self.path), key))
+            if entry is not None:
+                if time.time() - entry.get("created", 0) > ttl:
+                    return None
+                try:
+                    # Also checks that the entry was not evicted or cleared by another process
+                    os.utime(entry_path)
+                    return entry
+                except FileNotFoundError:
+                    _memory_cache.pop((str(self.path), key), None)
+                    return None
+                except OSError:
+                    return entry
+        try:
+            with entry_path.open(mode="r") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self.delete(key)
+            return None
+        if time.time() - entry.get("created", 0) > ttl:
+            return None
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        if _memory_cache is not None:
+            _memory_cache[(str(self.path), key)] = entry
+        return entry
+
+    def set(self, key: str, entry: dict):
+        entry = dict(entry, created=time.time())
+        self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, mode="w") as f:
+                json.dump(entry, f, default=str)
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        if _memory_cache is not None:
+            _memory_cache[(str(self.path), key)] = entry
+        self.evict()
+
+    def delete(self, key: str):
+        if _memory_cache is not None:
+            _memory_cache.pop((str(self.path), key), None)
+        try:
+            self._entry_path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        entries = []
+        total_size = 0
+        for entry_path in self.path.glob("*.json"):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total_size += stat.st_size
+        if total_size <= self.max_size:
+            return
+        for _, size, entry_path in sorted(entries):
+            self.delete(entry_path.stem)
+            total_size -= size
+            if total_size <= self.max_size:
+                break
+
+    def clear(self):
+        for entry_path in self.path.glob("*.json"):
+            self.delete(entry_path.stem)
+
+
+def get_response_cache():
+    return ResponseCache(get_cache_dir(), get_max_size())
+
+
+def _dump_response(res):
+    from pydantic import BaseModel
+
+    items = res if isinstance(res, list) else [res]
+    models = {type(m).__name__ for m in items if isinstance(m, BaseModel)}
+    if models and (len(models) > 1 or not all(isinstance(m, BaseModel) for m in items)):
+        # Mixed responses are not cached
+        return None
+    return {
+        "model": models.pop() if models else None,
+        "is_list": isinstance(res, list),
+        "items": [
+            m.model_dump(mode="json", by_alias=True) if isinstance(m, BaseModel) else m
+            for m in items
+        ],
+    }
+
+
+def _load_response(entry):
+    import nuvolos_client_api
+
+    items = entry["items"]
+    if entry.get("model"):
+        model_cls = getattr(nuvolos_client_api.models, entry["model"])
+        items = [model_cls.from_dict(i) for i in items]
+    return items if entry.get("is_list", True) else items[0]
+
+
+def _cache_key_parts(signature, args, kwargs):
+    from .config import get_api_config
+
+    config = get_api_config()
+    api_key = config.api_key.get("ApiKeyAuth") or ""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return (
+        config.host,
+        hashlib.sha256(api_key.encode("utf-8")).hexdigest(),
+        dict(bound.arguments),
+    )
+
+
+def cached_response(endpoint: str):
+    """
+    Caches the response of a read-only API call on disk for the TTL configured for the endpoint.
+    The cache key includes the API host, a hash of the API key and the call arguments.
+    """
+
+    def decorator(f):
+        signature = inspect.signature(f)
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            mode = get_cache_mode()
+            ttl = get_ttl(endpoint)
+            if mode == CACHE_MODE_OFF or ttl <= 0:
+                return f(*args, **kwargs)
+            cache = get_response_cache()
+            key = cache.make_key(endpoint, *_cache_key_parts(signature, args, kwargs))
+            if mode == CACHE_MODE_USE:
+                entry = cache.get(key, ttl)
+                if entry is not None:
+                    try:
+                        res = _load_response(entry)
+                        clog.debug(f"Using cached response for [{endpoint}]")
+                        return res
+                    except Exception as e:
+                        clog.debug(f"Discarding cached response for [{endpoint}]: {e}")
+                        cache.delete(key)
+            res = f(*args, **kwargs)
+            entry = _dump_response(res)
+            if entry is not None:
+                try:
+                    cache.set(key, entry)
+                except OSError as e:
+                    clog.debug(f"Could not write the response cache: {e}")
+            return res
+
+        def invalidate(*args, **kwargs):
+            cache = get_response_cache()
+            cache.delete(
+                cache.make_key(endpoint, *_cache_key_parts(signature, args, kwargs))
+            )
+
+        wrapper.invalidate = invalidate
+        return wrapper
+
+    return decorator
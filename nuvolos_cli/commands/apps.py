@@ -0,0 +1,785 @@
+import click
+
+from ..logging import clog
+from ..config import check_api_key_configured
+from ..api_client import (
+    list_apps,
+    list_all_running_apps,
+    start_app,
+    stop_app,
+    execute_command_in_app,
+    list_all_running_workloads_for_app,
+    list_nodepools,
+    wait_for_app_running,
+    wait_for_app_stopped,
+    wait_for_task,
+    create_app,
+    derive_app,
+)
+from ..utils import (
+    format_response,
+    watch_option,
+    get_effective_snapshot_context,
+    print_models,
+    echo,
+)
+
+
+@click.group("apps")
+def nv_apps():
+    """Manages Nuvolos applications."""
+    pass
+
+
+@nv_apps.command("list")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the Nuvolos organization to use to list applications",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="The slug of the Nuvolos space to use to list applications",
+)
+@click.option(
+    "-i",
+    "--instance",
+    type=str,
+    help="The slug of the Nuvolos instance to use to list applications",
+)
+@click.option(
+    "-p",
+    "--snapshot",
+    type=str,
+    default="development",
+    help="The slug of the Nuvolos snapshot to use to list applications",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+@watch_option
+@format_response
+def nv_apps_list(ctx, **kwargs):
+    """
+    Lists the Nuvolos applications available to the current user.
+    """
+    check_api_key_configured()
+    snapshot_ctx = get_effective_snapshot_context(ctx, **kwargs)
+    return list_apps(
+        org_slug=snapshot_ctx.get("org_slug"),
+        space_slug=snapshot_ctx.get("space_slug"),
+        instance_slug=snapshot_ctx.get("instance_slug"),
+        snapshot_slug=kwargs["snapshot"],
+    )
+
+
+@nv_apps.command("start")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the Nuvolos organization to use to start an application",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="The slug of the Nuvolos space to use to start an application",
+)
+@click.option(
+    "-i",
+    "--instance",
+    type=str,
+    help="The slug of the Nuvolos instance to use to start an application",
+)
+@click.argument("app")
+@click.option(
+    "-n",
+    "--node-pool",
+    type=str,
+    help="The node pool to use to run the app",
+)
+@click.option(
+    "-w",
+    "--wait",
+    is_flag=True,
+    help="Waits until the started application is in a running state",
+)
+@click.option(
+    "--timeout",
+    type=click.IntRange(min=1),
+    help="Maximum time in seconds to wait for the application to run (default: APP_START_TIMEOUT_SECS or 600)",
+)
+@click.option(
+    "--no-workload-timeout",
+    type=click.IntRange(min=1),
+    help="Maximum time in seconds to wait for the application to have a workload (default: APP_NO_WORKLOAD_TIMEOUT_SECS or 30)",
+)
+@click.pass_context
+def nv_apps_start(ctx, app, **kwargs):
+    """
+    Starts the Nuvolos application with the APP application slug.
+    """
+    check_api_key_configured()
+    snapshot_ctx = get_effective_snapshot_context(ctx, **kwargs)
+    start_app(
+        org_slug=snapshot_ctx.get("org_slug"),
+        space_slug=snapshot_ctx.get("space_slug"),
+        instance_slug=snapshot_ctx.get("instance_slug"),
+        app_slug=app,
+        node_pool=kwargs.get("node_pool", None),
+    )
+    if kwargs.get("wait"):
+        wait_for_app_running(
+            org_slug=snapshot_ctx.get("org_slug"),
+            space_slug=snapshot_ctx.get("space_slug"),
+            instance_slug=snapshot_ctx.get("instance_slug"),
+            app_slug=app,
+            timeout_secs=kwargs.get("timeout"),
+            no_workload_timeout_secs=kwargs.get("no_workload_timeout"),
+        )
+
+
+@nv_apps.command("stop")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the Nuvolos organization to use to stop an application",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="The slug of the Nuvolos space to use to stop an application",
+)
+@click.option(
+    "-i",
+    "--instance",
+    type=str,
+    help="The slug of the Nuvolos instance to use to stop an application",
+)
+@click.option(
+    "-a",
+    "--app",
+    type=str,
+    help="The slug of the Nuvolos application to stop",
+    required=True,
+)
+@click.option(
+    "-w",
+    "--wait",
+    is_flag=True,
+    help="Waits until all workloads of the stopped application are gone",
+)
+@click.option(
+    "--timeout",
+    type=click.IntRange(min=1),
+    help="Maximum time in seconds to wait for the application to stop (default: APP_STOP_TIMEOUT_SECS or 600)",
+)
+@click.pass_context
+def nv_apps_stop(ctx, **kwargs):
+    """
+    Stops the Nuvolos application with the given application slug.
+    """
+    check_api_key_configured()
+    snapshot_ctx = get_effective_snapshot_context(ctx, **kwargs)
+    stop_app(
+        org_slug=snapshot_ctx.get("org_slug"),
+        space_slug=snapshot_ctx.get("space_slug"),
+        instance_slug=snapshot_ctx.get("instance_slug"),
+        app_slug=kwargs.get("app"),
+    )
+    if kwargs.get("wait"):
+        wait_for_app_stopped(
+            org_slug=snapshot_ctx.get("org_slug"),
+            space_slug=snapshot_ctx.get("space_slug"),
+            instance_slug=snapshot_ctx.get("instance_slug"),
+            app_slug=kwargs.get("app"),
+            timeout_secs=kwargs.get("timeout"),
+        )
+
+
+@nv_apps.command("running")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the Nuvolos organization to use to list running workloads for an application",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="The slug of the Nuvolos space to use to list running workloads for an application",
+)
+@click.option(
+    "-i",
+    "--instance",
+    type=str,
+    help="The slug of the Nuvolos instance to use to list running workloads for an application",
+)
+@click.option(
+    "-a",
+    "--app",
+    type=str,
+    help="The slug of the Nuvolos application to use to list running an workloads",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+@watch_option
+@format_response
+def nv_apps_running(ctx, **kwargs):
+    """
+    Lists all running Nuvolos applications of the user. If the app is specified, lists all running workloads
+    for the given application.
+    """
+    check_api_key_configured()
+    app_slug = kwargs.get("app", None)
+    if app_slug:
+        snapshot_ctx = get_effective_snapshot_context(ctx, **kwargs)
+        res = list_all_running_workloads_for_app(
+            org_slug=snapshot_ctx.get("org_slug"),
+            space_slug=snapshot_ctx.get("space_slug"),
+            instance_slug=snapshot_ctx.get("instance_slug"),
+            app_slug=kwargs.get("app"),
+        )
+    else:
+        res = list_all_running_apps()
+    return res
+
+
+@nv_apps.command("execute")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the Nuvolos organization to use to execute a command in an application",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="The slug of the Nuvolos space to use to execute a command in an application",
+)
+@click.option(
+    "-i",
+    "--instance",
+    type=str,
+    help="The slug of the Nuvolos instance to use to execute a command in an application",
+)
+@click.option(
+    "-a",
+    "--app",
+    type=str,
+    help="The slug of the Nuvolos application where the command is executed",
+    required=True,
+)
+@click.argument("command")
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+@format_response
+def nv_apps_execute(ctx, command, **kwargs):
+    """
+    Executes COMMAND in a Nuvolos application.
+
+    Example:
+    nuvolos apps execute -a my_slug "python -c 'from time import sleep;sleep(10)'"
+    """
+    check_api_key_configured()
+    snapshot_ctx = get_effective_snapshot_context(ctx, **kwargs)
+    res = execute_command_in_app(
+        org_slug=snapshot_ctx.get("org_slug"),
+        space_slug=snapshot_ctx.get("space_slug"),
+        instance_slug=snapshot_ctx.get("instance_slug"),
+        app_slug=kwargs.get("app"),
+        command=command,
+    )
+    return res
+
+
+@nv_apps.command("nodepools")
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@watch_option
+@format_response
+def nv_apps_list_nodepools(**kwargs):
+    """
+    Lists all nodepools available for dedicated app launch.
+    """
+    check_api_key_configured()
+    res = list_nodepools()
+
+    return res
+
+
+@nv_apps.command("create")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the Nuvolos organization",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="The slug of the Nuvolos space",
+)
+@click.option(
+    "-i",
+    "--instance",
+    type=str,
+    help="The slug of the Nuvolos instance",
+)
+@click.option(
+    "--imid",
+    type=int,
+    required=True,
+    help="The image ID to use for the application",
+)
+@click.option(
+    "-n",
+    "--name",
+    type=str,
+    required=True,
+    help="The long_id (display name) of the application",
+)
+@click.option(
+    "-d",
+    "--description",
+    type=str,
+    help="The description of the application",
+)
+@click.option(
+    "--pars",
+    type=str,
+    help="JSON string of application parameters",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+@format_response
+def nv_apps_create(ctx, **kwargs):
+    """
+    Creates a new application in the development snapshot of the specified instance.
+    """
+    check_api_key_configured()
+    snapshot_ctx = get_effective_snapshot_context(ctx, **kwargs)
+    res = create_app(
+        org_slug=snapshot_ctx.get("org_slug"),
+        space_slug=snapshot_ctx.get("space_slug"),
+        instance_slug=snapshot_ctx.get("instance_slug"),
+        imid=kwargs["imid"],
+        long_id=kwargs["name"],
+        description=kwargs.get("description"),
+        pars=kwargs.get("pars"),
+    )
+    return res
+
+
+@nv_apps.command("derive")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the Nuvolos organization",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="The slug of the Nuvolos space",
+)
+@click.option(
+    "-i",
+    "--instance",
+    type=str,
+    help="The slug of the Nuvolos instance",
+)
+@click.option(
+    "-a",
+    "--app",
+    type=str,
+    required=True,
+    help="The slug of the application to derive from",
+)
+@click.option(
+    "-t",
+    "--tag",
+    type=str,
+    help="The image tag for the derived image",
+)
+@click.option(
+    "-e",
+    "--email/--no-email",
+    default=True,
+    help="Send email once the derivation is finished (default: yes)",
+)
+@click.option(
+    "-w",
+    "--wait",
+    is_flag=True,
+    help="Wait until the derivation task is complete",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+@format_response
+def nv_apps_derive(ctx, **kwargs):
+    """
+    Creates a derived image from an existing Nuvolos application.
+    """
+    check_api_key_configured()
+    snapshot_ctx = get_effective_snapshot_context(ctx, **kwargs)
+    task = derive_app(
+        org_slug=snapshot_ctx.get("org_slug"),
+        space_slug=snapshot_ctx.get("space_slug"),
+        instance_slug=snapshot_ctx.get("instance_slug"),
+        app_slug=kwargs["app"],
+        image_tag=kwargs.get("tag"),
+        email_once_finished=kwargs.get("email", True),
+    )
+
+    if kwargs.get("wait") and task is not None and hasattr(task, "tkid"):
+        clog.info(f"Waiting for derive task {task.tkid} to complete...")
+        task = wait_for_task(tkid=task.tkid)
+
+    return task
+
+
+def _bulk_options(f):
+    options = [
+        click.option(
+            "-o",
+            "--org",
+            type=str,
+            help="The slug of the Nuvolos organization of the applications",
+        ),
+        click.option(
+            "-s",
+            "--space",
+            type=str,
+            help="The slug of the Nuvolos space of the applications",
+        ),
+        click.option(
+            "-i",
+            "--instance",
+            type=str,
+            help="Glob pattern of the instance slugs to select applications from (default: all instances)",
+        ),
+        click.option(
+            "-a",
+            "--app",
+            type=str,
+            help="Glob pattern of the application slugs to select, e.g. `jupyter-*`",
+        ),
+        click.option(
+            "-p",
+            "--snapshot",
+            type=str,
+            default="development",
+            help="The slug of the Nuvolos snapshot to select applications from",
+        ),
+        click.option(
+            "-m",
+            "--manifest",
+            type=click.File("r"),
+            help="CSV or YAML file listing the org, space, instance, app and optional node_pool of the applications",
+        ),
+        click.option(
+            "--concurrency",
+            type=click.IntRange(min=1),
+            help="Maximum number of concurrent requests (default: NUVOLOS_CLI_BULK_CONCURRENCY or 8)",
+        ),
+        click.option(
+            "-f",
+            "--format",
+            type=str,
+            default="tabulated",
+            help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+        ),
+    ]
+    for option in reversed(options):
+        f = option(f)
+    return f
+
+
+def _bulk_targets(ctx, node_pool=None, **kwargs):
+    from ..bulk import load_manifest, select_apps
+
+    context = dict(ctx.obj or {})
+    for name in ("org", "space"):
+        if kwargs.get(name):
+            context[f"{name}_slug"] = kwargs[name]
+    if kwargs.get("manifest"):
+        defaults = dict(context, node_pool=node_pool)
+        if kwargs.get("instance"):
+            defaults["instance_slug"] = kwargs["instance"]
+        return load_manifest(kwargs["manifest"], defaults)
+    if not kwargs.get("app"):
+        raise click.UsageError(
+            "Please specify the applications with --manifest or an --app pattern"
+        )
+    if not context.get("org_slug") or not context.get("space_slug"):
+        raise click.UsageError(
+            "Please specify the org and space of the applications with the --org and --space arguments"
+        )
+    return select_apps(
+        org_slug=context["org_slug"],
+        space_slug=context["space_slug"],
+        instance_pattern=kwargs.get("instance") or context.get("instance_slug") or "*",
+        app_pattern=kwargs["app"],
+        snapshot_slug=kwargs["snapshot"],
+        node_pool=node_pool,
+    )
+
+
+def _print_bulk_results(results, format, action):
+    succeeded = []
+    failed = []
+
+    def report():
+        for result in results:
+            (failed if result["status"] == "FAILED" else succeeded).append(result)
+            yield result
+
+    print_models(report(), format)
+    times = sorted(
+        r["elapsed_secs"] for r in succeeded if r["elapsed_secs"] is not None
+    )
+    if times:
+        clog.info(
+            f"{len(succeeded)} application(s) {action} in {times[len(times) // 2]}s (median), {times[-1]}s (max)"
+        )
+    if failed:
+        raise click.ClickException(
+            f"{len(failed)} of {len(succeeded) + len(failed)} application(s) failed"
+        )
+
+
+@nv_apps.command("bulk-start")
+@_bulk_options
+@click.option(
+    "-n",
+    "--node-pool",
+    type=str,
+    help="The node pool to use to run the applications that have no node pool in the manifest",
+)
+@click.option(
+    "-w",
+    "--wait",
+    is_flag=True,
+    help="Waits until all started applications are in a running state",
+)
+@click.option(
+    "--timeout",
+    type=click.IntRange(min=1),
+    help="Maximum time in seconds to wait for the applications to run (default: APP_START_TIMEOUT_SECS or 600)",
+)
+@click.pass_context
+def nv_apps_bulk_start(ctx, node_pool, wait, timeout, concurrency, format, **kwargs):
+    """
+    Starts many Nuvolos applications at once.
+
+    The applications are read from a manifest (`--manifest`), or selected in a space with glob patterns on the
+    instance and application slugs (`--instance`, `--app`). The start requests are sent concurrently and,
+    with `--wait`, all applications are then waited for concurrently. Every application is reported with its
+    status, the time it took to start (or to be running with `--wait`) and its error if it failed.
+    """
+    from ..bulk import bulk_start
+
+    check_api_key_configured()
+    apps = _bulk_targets(ctx, node_pool=node_pool, **kwargs)
+    clog.info(f"Starting {len(apps)} application(s)")
+    _print_bulk_results(
+        bulk_start(apps, max_workers=concurrency, wait=wait, timeout_secs=timeout),
+        format,
+        "running" if wait else "started",
+    )
+
+
+@nv_apps.command("bulk-stop")
+@_bulk_options
+@click.option(
+    "-w",
+    "--wait",
+    is_flag=True,
+    help="Waits until the workloads of all stopped applications are gone",
+)
+@click.option(
+    "--timeout",
+    type=click.IntRange(min=1),
+    help="Maximum time in seconds to wait for the applications to stop (default: APP_STOP_TIMEOUT_SECS or 600)",
+)
+@click.pass_context
+def nv_apps_bulk_stop(ctx, wait, timeout, concurrency, format, **kwargs):
+    """
+    Stops many Nuvolos applications at once.
+
+    The applications are read from a manifest (`--manifest`), or selected in a space with glob patterns on the
+    instance and application slugs (`--instance`, `--app`). The stop requests are sent concurrently and,
+    with `--wait`, all applications are then waited for concurrently. Every application is reported with its
+    status, the time it took to stop and its error if it failed.
+    """
+    from ..bulk import bulk_stop
+
+    check_api_key_configured()
+    apps = _bulk_targets(ctx, **kwargs)
+    clog.info(f"Stopping {len(apps)} application(s)")
+    _print_bulk_results(
+        bulk_stop(apps, max_workers=concurrency, wait=wait, timeout_secs=timeout),
+        format,
+        "stopped",
+    )
+
+
+def _print_execute_result(result):
+    prefix = f"[{result['instance']}/{result['app']}]"
+    if result["status"] == "FAILED":
+        lines = [f"FAILED after {result['elapsed_secs']}s: {result['error']}"]
+    else:
+        lines = [f"OK after {result['elapsed_secs']}s"] + [
+            f"{k}: {v}"
+            for k, v in result.items()
+            if k
+            not in (
+                "org",
+                "space",
+                "instance",
+                "app",
+                "status",
+                "elapsed_secs",
+                "error",
+            )
+            and v is not None
+        ]
+    for line in lines:
+        for part in str(line).splitlines() or [""]:
+            echo(f"{prefix} {part}")
+
+
+@nv_apps.command("execute-many")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="Only run the command in the applications of this Nuvolos organization",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="Only run the command in the applications of this Nuvolos space",
+)
+@click.option(
+    "-i",
+    "--instance",
+    type=str,
+    help="Glob pattern of the instance slugs of the applications (default: all instances)",
+)
+@click.option(
+    "-a",
+    "--app",
+    type=str,
+    help="Glob pattern of the application slugs (default: all applications)",
+)
+@click.option(
+    "-m",
+    "--manifest",
+    type=click.File("r"),
+    help="CSV or YAML file listing the org, space, instance and app of the applications, instead of the running applications",
+)
+@click.argument("command")
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    help="Maximum number of applications the command is executed in at the same time (default: NUVOLOS_CLI_BULK_CONCURRENCY or 8)",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Maximum time in seconds to wait for the response of each application",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="text",
+    help="Sets the output into the desired format. Available values: `text` (lines prefixed by the application), `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+def nv_apps_execute_many(ctx, command, concurrency, timeout, format, **kwargs):
+    """
+    Executes COMMAND in many Nuvolos applications concurrently.
+
+    By default, the command is executed in all running applications of the current user, optionally filtered
+    by organization, space and glob patterns on the instance and application slugs. With `--manifest`, the
+    command is executed in the listed applications instead. The result of every application is printed as soon
+    as it completes, and the command fails if the execution failed in any of the applications.
+
+    Example:
+    nuvolos apps execute-many -o my_org -s my_space -a 'jupyter*' "pip install -U pandas"
+    """
+    from ..bulk import bulk_execute, load_manifest, running_apps
+
+    check_api_key_configured()
+    if kwargs.get("manifest"):
+        defaults = dict(ctx.obj or {})
+        for name in ("org", "space", "instance"):
+            if kwargs.get(name):
+                defaults[f"{name}_slug"] = kwargs[name]
+        apps = load_manifest(kwargs["manifest"], defaults)
+    else:
+        apps = running_apps(
+            org_slug=kwargs.get("org"),
+            space_slug=kwargs.get("space"),
+            instance_pattern=kwargs.get("instance") or "*",
+            app_pattern=kwargs.get("app") or "*",
+        )
+    clog.info(f"Executing the command in {len(apps)} application(s)")
+    results = bulk_execute(apps, command, max_workers=concurrency, timeout_secs=timeout)
+    if format == "text":
+        failed = 0
+        for result in results:
+            _print_execute_result(result)
+            failed += result["status"] == "FAILED"
+        if failed:
+            raise click.ClickException(f"{failed} of {len(apps)} application(s) failed")
+    else:
+        _print_bulk_results(results, format, "executed the command")
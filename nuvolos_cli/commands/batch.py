@@ -0,0 +1,234 @@
+import io
+import json
+import shlex
+import time
+
+import click
+
+from ..config import from_variable
+from ..daemon import is_long_running
+from ..logging import clog
+from ..utils import echo, output_to
+
+# Commands that cannot be run from a batch file
+EXCLUDED_COMMANDS = ("batch", "serve")
+
+
+def parse_operation(line: str):
+    """
+    Parses a line of a batch file into the arguments of a CLI subcommand.
+
+    A line is either written in the same syntax as the command line, e.g. `apps stop -o my_org -s my_space`,
+    or as a JSON object with the `command`, its `options` and positional `arguments`, and an optional `id`, e.g.
+    `{"command": "apps stop", "options": {"org": "my_org", "space": "my_space"}}`.
+
+    Returns the arguments and the ID of the operation (None if the line has no `id`).
+    """
+    if not line.startswith("{"):
+        return shlex.split(line), None
+
+    try:
+        op = json.loads(line)
+    except ValueError as e:
+        raise click.UsageError(f"Invalid JSON: {e}")
+    command = op.get("command")
+    if not command:
+        raise click.UsageError("JSON operations must have a `command`")
+    args = shlex.split(command) if isinstance(command, str) else list(command)
+    for name, value in (op.get("options") or {}).items():
+        option = "--" + name.replace("_", "-")
+        if value is True:
+            args.append(option)
+        elif value is False or value is None:
+            continue
+        elif isinstance(value, (list, tuple)):
+            for v in value:
+                args += [option, str(v)]
+        else:
+            args += [option, str(value)]
+    args += [str(a) for a in op.get("arguments") or []]
+    return args, op.get("id")
+
+
+def check_operation(args):
+    """
+    Raises a UsageError if the arguments of an operation cannot be run in a batch: the `batch` and `serve`
+    commands, operations that poll or stream until interrupted (e.g. with `--watch`, `--follow` or `--wait`,
+    see `daemon.is_long_running`), which would block a worker forever, and operations that read the standard
+    input (`-`), which is the batch file itself.
+    """
+    if not args:
+        raise click.UsageError("Empty command")
+    if args[0] in EXCLUDED_COMMANDS:
+        raise click.UsageError(f"The `{args[0]}` command cannot be used in a batch")
+    if is_long_running(args):
+        raise click.UsageError(
+            "Long-running operations (`--watch`, `--follow`, `--wait` or `tasks wait`) cannot be used in a batch"
+        )
+    if "-" in args:
+        raise click.UsageError(
+            "Operations cannot read the standard input (`-`) in a batch"
+        )
+
+
+def _run_operation(root_ctx, cmd_name, cmd, args):
+    """
+    Runs a subcommand under the root context, capturing its output.
+    Returns the exit code, the captured output and the error message (None on success).
+    """
+    from ..api_client import NuvolosCliException
+
+    exit_code = 0
+    error = None
+    http_status = None
+    with output_to(io.StringIO()) as output:
+        try:
+            with cmd.make_context(cmd_name, args, parent=root_ctx) as ctx:
+                cmd.invoke(ctx)
+        except click.exceptions.Exit as e:
+            exit_code = e.exit_code
+        except click.Abort:
+            exit_code, error = 1, "Aborted"
+        except click.ClickException as e:
+            exit_code, error = e.exit_code, e.format_message()
+            if isinstance(e, NuvolosCliException):
+                http_status = e.status
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception as e:
+            exit_code, error = 1, f"{type(e).__name__}: {e}"
+    if exit_code and error is None:
+        error = f"Exited with code {exit_code}"
+    return exit_code, output.getvalue(), error, http_status
+
+
+def run_batch(root_ctx, lines, concurrency: int, fail_fast: bool):
+    """
+    Runs the operations read from `lines` on a bounded thread pool, sharing the API client and its connections.
+
+    Operations are read lazily and submitted as soon as a worker is free. A result is yielded for every
+    operation as soon as it finishes, in completion order, with its line number, status and duration.
+    With `fail_fast`, no operation is started after the first failure.
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    group = root_ctx.command
+
+    def start(line_no, line):
+        record = {"line": line_no, "command": line}
+        try:
+            args, op_id = parse_operation(line)
+            if op_id is not None:
+                record["id"] = op_id
+            record["command"] = shlex.join(args)
+            check_operation(args)
+            # Resolved here, so that subcommands are loaded by one thread only
+            cmd_name, cmd, args = group.resolve_command(root_ctx, args)
+        except (click.UsageError, ValueError) as e:
+            record.update(
+                status="failed",
+                exit_code=2,
+                duration_secs=0.0,
+                output="",
+                error=e.format_message() if isinstance(e, click.UsageError) else str(e),
+            )
+            return None, record
+        started = time.monotonic()
+        future = executor.submit(_run_operation, root_ctx, cmd_name, cmd, args)
+        return future, (record, started)
+
+    def finish(record, started, future):
+        exit_code, output, error, http_status = future.result()
+        record.update(
+            status="failed" if exit_code else "ok",
+            exit_code=exit_code,
+            duration_secs=round(time.monotonic() - started, 3),
+            output=output,
+            error=error,
+        )
+        if http_status is not None:
+            record["http_status"] = http_status
+        return record
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {}
+        failed = False
+        operations = (
+            (line_no, line.strip())
+            for line_no, line in enumerate(lines, start=1)
+            if line.strip() and not line.lstrip().startswith("#")
+        )
+        exhausted = False
+        while True:
+            while (
+                not exhausted
+                and not (fail_fast and failed)
+                and len(futures) < concurrency
+            ):
+                try:
+                    line_no, line = next(operations)
+                except StopIteration:
+                    exhausted = True
+                    break
+                future, state = start(line_no, line)
+                if future is None:
+                    failed = True
+                    yield state
+                else:
+                    futures[future] = state
+            if not futures:
+                return
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = finish(*futures.pop(future), future)
+                failed = failed or record["status"] != "ok"
+                yield record
+
+
+@click.command("batch")
+@click.argument("file", type=click.File("r"))
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    help="Maximum number of operations run at the same time (default: NUVOLOS_CLI_BATCH_CONCURRENCY or 4)",
+)
+@click.option(
+    "--fail-fast/--continue-on-error",
+    default=False,
+    show_default=True,
+    help="Stop starting new operations after the first failure, or run all operations regardless of failures",
+)
+@click.pass_context
+def nv_batch(ctx, file, concurrency, fail_fast):
+    """
+    Runs many CLI operations from FILE (or the standard input if FILE is `-`) in a single process.
+
+    Every non-empty line is one operation, either in the same syntax as the CLI subcommands,
+    e.g. `apps stop -o my_org -s my_space -i my_instance -a my_app`, or as a JSON object,
+    e.g. `{"id": "a1", "command": "apps stop", "options": {"org": "my_org", "app": "my_app"}}`.
+    Lines starting with `#` are ignored. Operations that run until interrupted, e.g. with `--watch`,
+    and operations that read the standard input are rejected.
+
+    The operations share the API connections and run concurrently. The result of every operation is printed
+    as a line of JSON as soon as it finishes, with its line number, `status`, `exit_code`, `duration_secs`,
+    the captured `output` and the `error` message of failed operations.
+    The command fails if any of the operations failed.
+    """
+    if concurrency is None:
+        concurrency = int(from_variable("NUVOLOS_CLI_BATCH_CONCURRENCY", 4))
+    root_ctx = ctx.find_root()
+
+    total = 0
+    failures = 0
+    for record in run_batch(root_ctx, file, concurrency, fail_fast):
+        total += 1
+        if record["status"] != "ok":
+            failures += 1
+            clog.error(f"Operation on line {record['line']} failed: {record['error']}")
+        echo(json.dumps(record, default=str))
+
+    if failures:
+        raise click.ClickException(
+            f"{failures} of {total} operation(s) failed"
+            + (", no further operations were started" if fail_fast else "")
+        )
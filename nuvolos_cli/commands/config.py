@@ -0,0 +1,28 @@
+import click
+
+from ..config import init_cli_config, info
+
+
+@click.command("config")
+@click.option(
+    "--api-key",
+    type=str,
+    help="The Nuvolos API key to use for authentication",
+    required=True,
+)
+def nv_cli_config(**kwargs):
+    """
+    Initializes a new Nuvolos CLI configuration in the current directory.
+    """
+    init_cli_config(
+        api_key=kwargs.get("api_key"),
+    )
+
+
+@click.command("info")
+@click.pass_context
+def nv_info(ctx):
+    """
+    Prints information about the Nuvolos CLI.
+    """
+    info(nuvolos_ctx=ctx.obj)
@@ -0,0 +1,138 @@
+import json
+import click
+
+from ..logging import clog
+from ..config import check_api_key_configured
+from ..api_client import (
+    wait_for_task,
+    distribute_content,
+)
+from ..utils import (
+    format_response,
+    get_effective_snapshot_context,
+)
+
+
+@click.group("distribution")
+def nv_distribution():
+    """Distributes content from a snapshot to target instances."""
+    pass
+
+
+@nv_distribution.command("distribute")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the source Nuvolos organization",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="The slug of the source Nuvolos space",
+)
+@click.option(
+    "-i",
+    "--instance",
+    type=str,
+    help="The slug of the source Nuvolos instance",
+)
+@click.option(
+    "-p",
+    "--snapshot",
+    type=str,
+    default="development",
+    help="The slug of the source snapshot to distribute from (default: development)",
+)
+@click.option(
+    "--targets",
+    type=str,
+    required=True,
+    help="JSON array of target instances, each with org_slug, space_slug, instance_slug",
+)
+@click.option(
+    "--apps",
+    type=str,
+    help="Comma-separated list of application slugs to distribute",
+)
+@click.option(
+    "--files",
+    type=str,
+    help="Comma-separated list of file paths to distribute",
+)
+@click.option(
+    "--tables",
+    type=str,
+    help="Comma-separated list of table names to distribute",
+)
+@click.option(
+    "--auto-snapshot/--no-auto-snapshot",
+    default=False,
+    help="Create a snapshot of target instances before distributing (default: no)",
+)
+@click.option(
+    "--notify/--no-notify",
+    default=False,
+    help="Notify target users when distribution is complete (default: no)",
+)
+@click.option(
+    "--message",
+    type=str,
+    help="Custom email message to send with the notification",
+)
+@click.option(
+    "-w",
+    "--wait",
+    is_flag=True,
+    help="Wait until the distribution task is complete",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+@format_response
+def nv_distribution_distribute(ctx, **kwargs):
+    """
+    Distribute selected files, applications, and tables from a snapshot to target instances.
+    """
+    check_api_key_configured()
+    snapshot_ctx = get_effective_snapshot_context(ctx, **kwargs)
+
+    target_instances = json.loads(kwargs["targets"])
+
+    source_applications = None
+    if kwargs.get("apps"):
+        source_applications = [a.strip() for a in kwargs["apps"].split(",")]
+
+    source_files = None
+    if kwargs.get("files"):
+        source_files = [f.strip() for f in kwargs["files"].split(",")]
+
+    source_tables = None
+    if kwargs.get("tables"):
+        source_tables = [t.strip() for t in kwargs["tables"].split(",")]
+
+    task = distribute_content(
+        org_slug=snapshot_ctx.get("org_slug"),
+        space_slug=snapshot_ctx.get("space_slug"),
+        instance_slug=snapshot_ctx.get("instance_slug"),
+        snapshot_slug=kwargs["snapshot"],
+        target_instances=target_instances,
+        source_applications=source_applications,
+        source_files=source_files,
+        source_tables=source_tables,
+        auto_snapshot=kwargs.get("auto_snapshot", False),
+        notify_target_users=kwargs.get("notify", False),
+        custom_email_message=kwargs.get("message"),
+    )
+
+    if kwargs.get("wait") and task is not None and hasattr(task, "tkid"):
+        clog.info(f"Waiting for distribution task {task.tkid} to complete...")
+        task = wait_for_task(tkid=task.tkid)
+
+    return task
@@ -0,0 +1,79 @@
+import click
+
+from ..config import check_api_key_configured
+from ..api_client import list_files
+from ..utils import (
+    format_response,
+    watch_option,
+    get_effective_snapshot_context,
+)
+
+
+@click.group("files")
+def nv_files():
+    """Manages files in snapshot areas."""
+    pass
+
+
+@nv_files.command("list")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the Nuvolos organization",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="The slug of the Nuvolos space",
+)
+@click.option(
+    "-i",
+    "--instance",
+    type=str,
+    help="The slug of the Nuvolos instance",
+)
+@click.option(
+    "-p",
+    "--snapshot",
+    type=str,
+    default="development",
+    help="The slug of the Nuvolos snapshot to use",
+)
+@click.option(
+    "-a",
+    "--area",
+    type=click.Choice(["files", "home"]),
+    default="files",
+    help="Area to list files from (default: files)",
+)
+@click.option(
+    "--path",
+    type=str,
+    help="Optional path inside the selected area",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+@watch_option
+@format_response
+def nv_files_list(ctx, **kwargs):
+    """
+    Lists files in the selected snapshot area.
+    """
+    check_api_key_configured()
+    snapshot_ctx = get_effective_snapshot_context(ctx, **kwargs)
+    return list_files(
+        org_slug=snapshot_ctx.get("org_slug"),
+        space_slug=snapshot_ctx.get("space_slug"),
+        instance_slug=snapshot_ctx.get("instance_slug"),
+        snapshot_slug=kwargs["snapshot"],
+        area=kwargs["area"],
+        local_path=kwargs.get("path"),
+    )
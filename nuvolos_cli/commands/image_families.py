@@ -0,0 +1,82 @@
+import click
+
+from ..config import check_api_key_configured
+from ..api_client import (
+    list_image_families,
+    create_image_family,
+)
+from ..utils import format_response, watch_option
+
+
+@click.group("image-families")
+def nv_image_families():
+    """Manages Nuvolos image families."""
+    pass
+
+
+@nv_image_families.command("list")
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@watch_option
+@format_response
+def nv_image_families_list(**kwargs):
+    """
+    Lists all image families.
+    """
+    check_api_key_configured()
+    return list_image_families()
+
+
+@nv_image_families.command("create")
+@click.option(
+    "-n",
+    "--name",
+    type=str,
+    required=True,
+    help="Name of the image family",
+)
+@click.option(
+    "--icon-url",
+    type=str,
+    required=True,
+    help="URL of the icon for the image family",
+)
+@click.option(
+    "-d",
+    "--description",
+    type=str,
+    help="Description of the image family",
+)
+@click.option(
+    "--groups",
+    type=str,
+    help="Comma-separated list of groups",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@format_response
+def nv_image_families_create(**kwargs):
+    """
+    Creates a new image family. Priority is automatically set.
+    """
+    check_api_key_configured()
+    groups = None
+    if kwargs.get("groups"):
+        groups = [g.strip() for g in kwargs["groups"].split(",")]
+    res = create_image_family(
+        name=kwargs["name"],
+        icon_url=kwargs["icon_url"],
+        description=kwargs.get("description"),
+        groups=groups,
+    )
+    return res
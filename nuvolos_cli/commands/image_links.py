@@ -0,0 +1,29 @@
+import click
+
+from ..config import check_api_key_configured
+from ..api_client import list_image_links
+from ..utils import format_response, watch_option
+
+
+@click.group("image-links")
+def nv_image_links():
+    """Manages Nuvolos image links."""
+    pass
+
+
+@nv_image_links.command("list")
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@watch_option
+@format_response
+def nv_image_links_list(**kwargs):
+    """
+    Lists all image links accessible to the current user.
+    """
+    check_api_key_configured()
+    return list_image_links()
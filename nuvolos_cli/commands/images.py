@@ -0,0 +1,240 @@
+import json
+import click
+
+from ..config import check_api_key_configured
+from ..api_client import (
+    list_images,
+    create_image,
+    update_image,
+)
+from ..utils import format_response, watch_option
+
+
+@click.group("images")
+def nv_images():
+    """Manages Nuvolos images."""
+    pass
+
+
+@nv_images.command("list")
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@watch_option
+@format_response
+def nv_images_list(**kwargs):
+    """
+    Lists all images accessible to the current user.
+    """
+    check_api_key_configured()
+    return list_images()
+
+
+@nv_images.command("create")
+@click.option(
+    "-n",
+    "--name",
+    type=str,
+    required=True,
+    help="Name of the image",
+)
+@click.option(
+    "--docker-image-url",
+    type=str,
+    required=True,
+    help="Docker image URL (e.g. registry/repo:tag)",
+)
+@click.option(
+    "--description-md",
+    type=str,
+    required=True,
+    help="Markdown description of the image",
+)
+@click.option(
+    "--ifid",
+    type=int,
+    required=True,
+    help="Image family ID to associate with",
+)
+@click.option(
+    "-d",
+    "--description",
+    type=str,
+    help="Short description of the image",
+)
+@click.option(
+    "--public/--no-public",
+    default=False,
+    help="Whether the image is public",
+)
+@click.option(
+    "--public-description",
+    type=str,
+    help="Public-facing description",
+)
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="Org slug to scope the image to (omit for global)",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="Space slug to scope the image to",
+)
+@click.option(
+    "--app-type",
+    type=str,
+    help="Application type identifier",
+)
+@click.option(
+    "--configuration",
+    type=str,
+    help="JSON string of configuration parameters",
+)
+@click.option(
+    "--has-tables/--no-tables",
+    default=None,
+    help="Whether the image supports database tables",
+)
+@click.option(
+    "--complexity",
+    type=int,
+    help="Complexity level of the image",
+)
+@click.option(
+    "--tags",
+    type=str,
+    help="JSON string of tags",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@format_response
+def nv_images_create(**kwargs):
+    """
+    Creates a new image record.
+    """
+    check_api_key_configured()
+    configuration = None
+    if kwargs.get("configuration"):
+        configuration = json.loads(kwargs["configuration"])
+    tags = None
+    if kwargs.get("tags"):
+        tags = json.loads(kwargs["tags"])
+    res = create_image(
+        name=kwargs["name"],
+        docker_image_url=kwargs["docker_image_url"],
+        description_md=kwargs["description_md"],
+        ifid=kwargs["ifid"],
+        description=kwargs.get("description"),
+        public=kwargs.get("public", False),
+        public_description=kwargs.get("public_description"),
+        org_slug=kwargs.get("org"),
+        space_slug=kwargs.get("space"),
+        app_type=kwargs.get("app_type"),
+        configuration=configuration,
+        has_tables=kwargs.get("has_tables"),
+        complexity=kwargs.get("complexity"),
+        tags=tags,
+    )
+    return res
+
+
+@nv_images.command("update")
+@click.argument("imid", type=int)
+@click.option(
+    "-n",
+    "--name",
+    type=str,
+    help="New name for the image",
+)
+@click.option(
+    "--docker-image-url",
+    type=str,
+    help="New docker image URL",
+)
+@click.option(
+    "-d",
+    "--description",
+    type=str,
+    help="New short description",
+)
+@click.option(
+    "--description-md",
+    type=str,
+    help="New markdown description",
+)
+@click.option(
+    "--public/--no-public",
+    default=None,
+    help="Whether the image is public",
+)
+@click.option(
+    "--public-description",
+    type=str,
+    help="New public-facing description",
+)
+@click.option(
+    "--app-type",
+    type=str,
+    help="New application type identifier",
+)
+@click.option(
+    "--configuration",
+    type=str,
+    help="JSON string of new configuration parameters",
+)
+@click.option(
+    "--complexity",
+    type=int,
+    help="New complexity level",
+)
+@click.option(
+    "--tags",
+    type=str,
+    help="JSON string of new tags",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@format_response
+def nv_images_update(imid, **kwargs):
+    """
+    Updates an existing image record. Only provided fields are updated.
+    """
+    check_api_key_configured()
+    configuration = None
+    if kwargs.get("configuration"):
+        configuration = json.loads(kwargs["configuration"])
+    tags = None
+    if kwargs.get("tags"):
+        tags = json.loads(kwargs["tags"])
+    res = update_image(
+        imid=imid,
+        name=kwargs.get("name"),
+        docker_image_url=kwargs.get("docker_image_url"),
+        description=kwargs.get("description"),
+        description_md=kwargs.get("description_md"),
+        public=kwargs.get("public"),
+        public_description=kwargs.get("public_description"),
+        app_type=kwargs.get("app_type"),
+        configuration=configuration,
+        complexity=kwargs.get("complexity"),
+        tags=tags,
+    )
+    return res
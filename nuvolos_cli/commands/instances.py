@@ -0,0 +1,112 @@
+import click
+
+from ..config import check_api_key_configured
+from ..api_client import (
+    list_instances,
+    create_instance,
+)
+from ..utils import (
+    format_response,
+    watch_option,
+    get_effective_instance_context,
+)
+
+
+@click.group("instances")
+@click.pass_context
+def nv_instances(ctx):
+    """Manages Nuvolos instances."""
+    pass
+
+
+@nv_instances.command("list")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the Nuvolos organization to use to list instances",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="The slug of the Nuvolos space to use to list instances",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+@watch_option
+@format_response
+def nv_instances_list(ctx, **kwargs):
+    """
+    Lists the Nuvolos instances available to the current user.
+    """
+    check_api_key_configured()
+    instance_ctx = get_effective_instance_context(ctx, **kwargs)
+    return list_instances(
+        org_slug=instance_ctx.get("org_slug"), space_slug=instance_ctx.get("space_slug")
+    )
+
+
+@nv_instances.command("create")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the Nuvolos organization",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="The slug of the Nuvolos space",
+)
+@click.option(
+    "-n",
+    "--name",
+    type=str,
+    required=True,
+    help="The name of the instance to create",
+)
+@click.option(
+    "--slug",
+    type=str,
+    help="The slug for the new instance (auto-generated from name if not provided)",
+)
+@click.option(
+    "-d",
+    "--description",
+    type=str,
+    help="The description of the instance to create",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+@format_response
+def nv_instances_create(ctx, **kwargs):
+    """
+    Creates a new instance in the specified space.
+    """
+    check_api_key_configured()
+    instance_ctx = get_effective_instance_context(ctx, **kwargs)
+    from slugify import slugify
+
+    slug = kwargs.get("slug") or slugify(kwargs["name"], separator="_")
+    res = create_instance(
+        org_slug=instance_ctx.get("org_slug"),
+        space_slug=instance_ctx.get("space_slug"),
+        instance_name=kwargs["name"],
+        instance_slug=slug,
+        instance_description=kwargs.get("description"),
+    )
+    return res
@@ -0,0 +1,32 @@
+import click
+
+from ..config import check_api_key_configured
+from ..api_client import list_orgs
+from ..utils import format_response, watch_option
+
+
+@click.group("orgs")
+@click.pass_context
+def nv_orgs(ctx):
+    """Manages Nuvolos organizations."""
+    pass
+
+
+@nv_orgs.command("list")
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+@watch_option
+@format_response
+def nv_orgs_list(ctx, **kwargs):
+    """
+    Lists the Nuvolos organizations available to the current user.
+    """
+    check_api_key_configured()
+    res = list_orgs()
+    return res
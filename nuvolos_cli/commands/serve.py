@@ -0,0 +1,90 @@
+import subprocess
+import sys
+import time
+
+import click
+
+from .. import daemon
+from ..logging import clog
+
+
+@click.command("serve")
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    envvar="NUVOLOS_CLI_SOCKET",
+    help="Path of the Unix socket to listen on (default: ~/.nuvolos/daemon.sock)",
+)
+@click.option(
+    "--idle-timeout",
+    type=click.FloatRange(min=0),
+    default=0,
+    show_default=True,
+    help="Stop after this many seconds without receiving a command, 0 runs until stopped",
+)
+@click.option(
+    "--max-workers",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="Maximum number of commands to run at the same time, further commands run in-process",
+)
+@click.option(
+    "--background",
+    is_flag=True,
+    help="Start the daemon as a background process and return once it is listening",
+)
+@click.option("--stop", is_flag=True, help="Stop the running daemon")
+def nv_serve(socket_path, idle_timeout, max_workers, background, stop):
+    """
+    Runs the Nuvolos CLI as a daemon that keeps the CLI, the configuration, the API client
+    and an in-memory copy of the response cache loaded between commands.
+
+    While the daemon is running, `nuvolos` commands are forwarded to it over a per-user Unix socket
+    and run in worker processes forked from it, each with its own connections to the API. Long-running commands, e.g. with `--follow`, `--watch`
+    or `--wait`, are not forwarded. Set NUVOLOS_CLI_DAEMON=false to run a command in-process regardless.
+    """
+    socket_path = socket_path or daemon.get_socket_path()
+    if stop:
+        if not daemon.stop(socket_path):
+            raise click.ClickException(f"No daemon is listening on [{socket_path}]")
+        clog.info("Stopped the Nuvolos CLI daemon")
+        return
+
+    if background:
+        args = [
+            sys.executable,
+            "-m",
+            "nuvolos_cli",
+            "serve",
+            "--socket",
+            str(socket_path),
+            "--max-workers",
+            str(max_workers),
+        ]
+        if idle_timeout:
+            args += ["--idle-timeout", str(idle_timeout)]
+        process = subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if daemon.is_running(socket_path):
+                clog.info(
+                    f"Started the Nuvolos CLI daemon (pid {process.pid}) on [{socket_path}]"
+                )
+                return
+            if process.poll() is not None:
+                break
+            time.sleep(0.05)
+        raise click.ClickException("The Nuvolos CLI daemon did not start")
+
+    try:
+        daemon.serve(socket_path, idle_timeout=idle_timeout, max_workers=max_workers)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
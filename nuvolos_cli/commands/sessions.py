@@ -0,0 +1,599 @@
+import csv
+import json
+import os
+import pathlib
+import click
+from tabulate import tabulate
+
+from ..logging import clog
+from ..config import check_api_key_configured
+from ..api_client import (
+    list_sessions,
+    iter_sessions,
+    get_session_logs,
+    follow_session_logs,
+    iter_session_log_chunks,
+    merge_session_logs,
+    LogCursor,
+)
+from ..utils import (
+    format_response,
+    watch_option,
+    get_effective_snapshot_context,
+    print_models,
+    echo,
+    get_output,
+)
+
+
+@click.group("sessions")
+def nv_sessions():
+    """Manages Nuvolos application sessions."""
+    pass
+
+
+@nv_sessions.command("list")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the Nuvolos organization",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="The slug of the Nuvolos space",
+)
+@click.option(
+    "-i",
+    "--instance",
+    type=str,
+    help="The slug of the Nuvolos instance",
+)
+@click.option(
+    "-a",
+    "--app",
+    type=str,
+    required=True,
+    help="The slug of the Nuvolos application",
+)
+@click.option(
+    "--page",
+    type=int,
+    help="Page number (default: 1)",
+)
+@click.option(
+    "--per-page",
+    type=int,
+    help="Results per page (default: 100, or NUVOLOS_CLI_SESSIONS_PER_PAGE or 1000 with --all)",
+)
+@click.option(
+    "--session-id",
+    type=str,
+    help="Filter by a specific session ID",
+)
+@click.option(
+    "--sort",
+    type=click.Choice(["asc", "desc"]),
+    help="Sort order (default: desc)",
+)
+@click.option(
+    "--all",
+    "all_pages",
+    is_flag=True,
+    help="List the sessions of all pages. The `ndjson`, `csv` and `json` formats print every page as it arrives",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+@watch_option
+@format_response
+def nv_sessions_list(ctx, **kwargs):
+    """
+    Lists sessions for a given application.
+    """
+    check_api_key_configured()
+    snapshot_ctx = get_effective_snapshot_context(ctx, **kwargs)
+    if kwargs.get("all_pages"):
+        if kwargs.get("page") is not None or kwargs.get("session_id"):
+            raise click.UsageError(
+                "--all cannot be combined with --page or --session-id"
+            )
+        return iter_sessions(
+            org_slug=snapshot_ctx.get("org_slug"),
+            space_slug=snapshot_ctx.get("space_slug"),
+            instance_slug=snapshot_ctx.get("instance_slug"),
+            app_slug=kwargs["app"],
+            per_page=kwargs.get("per_page"),
+            sort=kwargs.get("sort"),
+        )
+    return list_sessions(
+        org_slug=snapshot_ctx.get("org_slug"),
+        space_slug=snapshot_ctx.get("space_slug"),
+        instance_slug=snapshot_ctx.get("instance_slug"),
+        app_slug=kwargs["app"],
+        page=kwargs.get("page"),
+        per_page=kwargs.get("per_page"),
+        session_id=kwargs.get("session_id"),
+        sort=kwargs.get("sort"),
+    )
+
+
+@nv_sessions.command("stats")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the Nuvolos organization",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="The slug of the Nuvolos space",
+)
+@click.option(
+    "-i",
+    "--instance",
+    type=str,
+    help="The slug of the Nuvolos instance",
+)
+@click.option(
+    "-a",
+    "--app",
+    type=str,
+    required=True,
+    help="The slug of the Nuvolos application",
+)
+@click.option(
+    "--daily",
+    is_flag=True,
+    help="Print the number of sessions, runtime, NCU hours and credits per day instead of the summary",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+@format_response
+def nv_sessions_stats(ctx, **kwargs):
+    """
+    Computes statistics of all sessions of an application: the count, total, mean, maximum and
+    p50/p90/p99 percentiles of the session runtime, NCU, NCU hours and credits, or daily totals with `--daily`.
+    """
+    from ..stats import SessionColumns, summarize, daily_histogram
+
+    check_api_key_configured()
+    snapshot_ctx = get_effective_snapshot_context(ctx, **kwargs)
+    columns = SessionColumns.from_sessions(
+        iter_sessions(
+            org_slug=snapshot_ctx.get("org_slug"),
+            space_slug=snapshot_ctx.get("space_slug"),
+            instance_slug=snapshot_ctx.get("instance_slug"),
+            app_slug=kwargs["app"],
+            prefetch=4,
+        )
+    )
+    clog.debug(f"Computing statistics of {len(columns)} sessions")
+    if kwargs.get("daily"):
+        return daily_histogram(columns)
+    return summarize(columns)
+
+
+@nv_sessions.command("logs")
+@click.option(
+    "--session-id",
+    type=str,
+    required=True,
+    help="The session ID to get logs for",
+)
+@click.option(
+    "-c",
+    "--container",
+    "containers",
+    type=str,
+    required=True,
+    multiple=True,
+    help="The container name to get logs from. Can be repeated, or set to `all` to merge the logs of every container of the session",
+)
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the Nuvolos organization, used to look up the containers with `-c all`",
+)
+@click.option(
+    "-s",
+    "--space",
+    type=str,
+    help="The slug of the Nuvolos space, used to look up the containers with `-c all`",
+)
+@click.option(
+    "-i",
+    "--instance",
+    type=str,
+    help="The slug of the Nuvolos instance, used to look up the containers with `-c all`",
+)
+@click.option(
+    "-a",
+    "--app",
+    type=str,
+    help="The slug of the Nuvolos application, required to look up the containers with `-c all`",
+)
+@click.option(
+    "--max-lines",
+    type=int,
+    help="Maximum number of log lines to return (default: 100)",
+)
+@click.option(
+    "--from-start",
+    type=str,
+    help="ISO datetime to start reading logs from",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=click.Choice(["tabulated", "json", "ndjson", "csv"]),
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `ndjson`, `csv`",
+)
+@click.option(
+    "--columns",
+    type=str,
+    help="Comma-separated list of columns to include (e.g. 'msg,ts')",
+)
+@click.option(
+    "--follow",
+    is_flag=True,
+    help="Keep polling for new log lines and print them as they arrive, until interrupted",
+)
+@click.pass_context
+def nv_sessions_logs(ctx, **kwargs):
+    """
+    Retrieves logs for a specific session and container.
+
+    The logs of several containers are fetched concurrently and merged in timestamp order,
+    with an additional `container` column.
+    """
+    check_api_key_configured()
+    containers = _resolve_containers(ctx, **kwargs)
+    selected_columns = None
+    if kwargs.get("columns"):
+        selected_columns = [
+            c.strip() for c in kwargs["columns"].split(",") if c.strip()
+        ]
+        if not selected_columns:
+            raise click.ClickException(
+                "--columns must include at least one column name"
+            )
+
+    if kwargs.get("follow"):
+        if len(containers) > 1:
+            raise click.UsageError("--follow supports a single container")
+        return _follow_logs(selected_columns, containers[0], **kwargs)
+
+    if len(containers) > 1:
+        result = merge_session_logs(
+            session_id=kwargs["session_id"],
+            container_names=containers,
+            max_lines=kwargs.get("max_lines"),
+            from_start=kwargs.get("from_start"),
+        )
+        if kwargs["format"] in ("ndjson", "csv"):
+            # Stream the merged entries instead of collecting them first
+            if selected_columns:
+                result = _select_columns(result, selected_columns)
+            print_models(result, kwargs["format"])
+            return
+        result = list(result)
+    else:
+        result = get_session_logs(
+            session_id=kwargs["session_id"],
+            container_name=containers[0],
+            max_lines=kwargs.get("max_lines"),
+            from_start=kwargs.get("from_start"),
+        )
+
+    if result is None:
+        if kwargs["format"] == "json":
+            echo("[]")
+        elif kwargs["format"] == "tabulated":
+            echo("No logs found.")
+        return
+
+    original_is_dict = isinstance(result, dict)
+    structured_result = None
+    if isinstance(result, dict):
+        structured_result = [result]
+    elif isinstance(result, list) and all(isinstance(entry, dict) for entry in result):
+        structured_result = result
+
+    if selected_columns:
+        if structured_result is None:
+            raise click.ClickException(
+                "--columns is only supported for structured log entries"
+            )
+        _check_columns(
+            selected_columns,
+            set().union(*(entry.keys() for entry in structured_result)),
+        )
+        structured_result = [
+            {column: entry.get(column, "") for column in selected_columns}
+            for entry in structured_result
+        ]
+
+    if kwargs["format"] in ("ndjson", "csv"):
+        if structured_result is None:
+            lines = result.splitlines() if isinstance(result, str) else result
+            structured_result = [{"msg": line} for line in lines]
+        print_models(structured_result, kwargs["format"])
+        return
+
+    if kwargs["format"] == "json":
+        if structured_result is not None:
+            if original_is_dict:
+                echo(json.dumps(structured_result[0], indent=2))
+            else:
+                echo(json.dumps(structured_result, indent=2))
+        else:
+            echo(json.dumps(result, indent=2))
+        return
+
+    if structured_result is not None:
+        if not structured_result:
+            echo("No logs found.")
+            return
+
+        table_columns = selected_columns or list(structured_result[0].keys())
+        rows = [
+            [entry.get(column, "") for column in table_columns]
+            for entry in structured_result
+        ]
+        echo(tabulate(rows, headers=table_columns, tablefmt="github"))
+    else:
+        echo(result)
+
+
+def _check_columns(selected_columns, available_columns):
+    """
+    Fails if any of the columns selected with `--columns` is not one of the available columns.
+    """
+    missing_columns = [c for c in selected_columns if c not in available_columns]
+    if missing_columns:
+        raise click.ClickException(
+            f"Unknown columns: {', '.join(missing_columns)}. Available columns: {', '.join(sorted(available_columns))}"
+        )
+
+
+def _select_columns(entries, selected_columns):
+    """
+    Keeps only the selected columns of streamed log entries, checking them against the first entry.
+    """
+    for i, entry in enumerate(entries):
+        if i == 0:
+            _check_columns(selected_columns, entry.keys())
+        yield {column: entry.get(column, "") for column in selected_columns}
+
+
+def _resolve_containers(ctx, **kwargs):
+    """
+    Returns the containers to read logs from, looking up the logging containers of the session for `all`.
+    """
+    containers = list(dict.fromkeys(kwargs["containers"]))
+    if "all" not in containers:
+        return containers
+    if not kwargs.get("app"):
+        raise click.UsageError(
+            "--app is required to look up the containers with `-c all`"
+        )
+    snapshot_ctx = get_effective_snapshot_context(ctx, **kwargs)
+    sessions = list_sessions(
+        org_slug=snapshot_ctx.get("org_slug"),
+        space_slug=snapshot_ctx.get("space_slug"),
+        instance_slug=snapshot_ctx.get("instance_slug"),
+        app_slug=kwargs["app"],
+        session_id=kwargs["session_id"],
+    )
+    session = next((s for s in sessions if s.session_id == kwargs["session_id"]), None)
+    if session is None:
+        raise click.ClickException(
+            f"Session [{kwargs['session_id']}] not found for app [{kwargs['app']}]"
+        )
+    if not session.logging_containers:
+        raise click.ClickException(
+            f"Session [{kwargs['session_id']}] has no logging containers"
+        )
+    return list(session.logging_containers)
+
+
+def _follow_logs(selected_columns, container, **kwargs):
+    """
+    Streams new log entries until interrupted. The `json` format prints one entry per line, the `tabulated`
+    and `csv` formats print the header once and then a row for every entry as it arrives.
+    """
+    format_ = kwargs["format"]
+    entries = follow_session_logs(
+        session_id=kwargs["session_id"],
+        container_name=container,
+        max_lines=kwargs.get("max_lines"),
+        from_start=kwargs.get("from_start"),
+    )
+    columns = selected_columns
+    csv_writer = None
+    header_printed = False
+    # The selected columns are checked against the first entry, like without --follow
+    checked = selected_columns is None
+    try:
+        for entry in entries:
+            if columns is None:
+                columns = list(entry.keys())
+            if not checked:
+                _check_columns(selected_columns, entry.keys())
+                checked = True
+            row = [entry.get(column, "") for column in columns]
+            if format_ in ("json", "ndjson"):
+                echo(json.dumps(dict(zip(columns, row)), default=str))
+            elif format_ == "csv":
+                if csv_writer is None:
+                    csv_writer = csv.writer(get_output(), lineterminator="\n")
+                    csv_writer.writerow(columns)
+                csv_writer.writerow(row)
+            elif header_printed:
+                # Only keep the row, without the separator line tabulate adds on top of it
+                echo(tabulate([row], tablefmt="github").splitlines()[-1])
+            else:
+                echo(tabulate([row], headers=columns, tablefmt="github"))
+                header_printed = True
+    except KeyboardInterrupt:
+        pass
+
+
+def _get_compressor(compression: str):
+    """Returns a function compressing one chunk into a self-contained gzip member or zstd frame."""
+    if compression == "gzip":
+        import gzip
+
+        return gzip.compress
+    elif compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise click.ClickException(
+                "zstd compression requires the `zstandard` package, install it with `pip install nuvolos-cli[zstd]`"
+            )
+        return zstandard.ZstdCompressor().compress
+    return lambda data: data
+
+
+def _write_export_state(state_path: pathlib.Path, state: dict):
+    tmp_path = state_path.with_name(state_path.name + ".tmp")
+    with tmp_path.open(mode="w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+
+@nv_sessions.command("export-logs")
+@click.argument("output", type=click.Path(dir_okay=False, path_type=pathlib.Path))
+@click.option(
+    "--session-id",
+    type=str,
+    required=True,
+    help="The session ID to export logs for",
+)
+@click.option(
+    "-c",
+    "--container",
+    type=str,
+    required=True,
+    help="The container name to export logs from",
+)
+@click.option(
+    "--from-start",
+    type=str,
+    help="ISO datetime to start exporting logs from (default: the beginning of the session)",
+)
+@click.option(
+    "--compress",
+    type=click.Choice(["auto", "none", "gzip", "zstd"]),
+    default="auto",
+    show_default=True,
+    help="Compression of the output file. `auto` picks gzip for `.gz` and zstd for `.zst` files",
+)
+@click.option(
+    "--chunk-lines",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Number of log lines fetched per request",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue a previous export of OUTPUT from the last exported line",
+)
+def nv_sessions_export_logs(
+    output, session_id, container, from_start, compress, chunk_lines, resume
+):
+    """
+    Exports the entire log history of a session container to OUTPUT as newline-delimited JSON.
+
+    The logs are fetched in chunks, and every chunk is written to the file as soon as it arrives, so memory use
+    does not depend on the size of the logs. The position of the export is saved next to OUTPUT, so an
+    interrupted export can be continued with `--resume`, which also picks up new lines of a running session.
+    """
+    check_api_key_configured()
+    if compress == "auto":
+        compress = {".gz": "gzip", ".zst": "zstd"}.get(output.suffix, "none")
+    compressor = _get_compressor(compress)
+    state_path = output.with_name(output.name + ".cursor.json")
+
+    offset = 0
+    cursor = LogCursor(from_start)
+    if resume and state_path.exists() and not output.exists():
+        clog.warning(
+            f"[{output}] does not exist anymore, restarting the export from the beginning"
+        )
+        state_path.unlink()
+    if resume and state_path.exists():
+        with state_path.open(mode="r") as f:
+            state = json.load(f)
+        if (state["session_id"], state["container"]) != (session_id, container):
+            raise click.ClickException(
+                f"[{output}] is an export of session [{state['session_id']}], container [{state['container']}]"
+            )
+        # Chunks compressed differently cannot be appended to the same file
+        if state.get("compress", compress) != compress:
+            raise click.ClickException(
+                f"[{output}] was exported with --compress {state['compress']}, resume it with the same compression"
+            )
+        if output.stat().st_size < state["offset"]:
+            raise click.ClickException(
+                f"[{output}] is shorter than its saved position and cannot be resumed, remove it to restart the export"
+            )
+        offset = state["offset"]
+        cursor = LogCursor.from_dict(state["cursor"])
+        clog.info(f"Resuming export of [{output}] from [{cursor.position}]")
+    elif output.exists():
+        raise click.ClickException(
+            f"[{output}] already exists and cannot be resumed, remove the file to restart the export"
+            if resume
+            else f"[{output}] already exists, use --resume to continue the export or remove the file"
+        )
+
+    exported = 0
+    with output.open(mode="r+b" if offset else "wb") as f:
+        # Drop anything written after the last saved position, e.g. a partially written chunk
+        f.truncate(offset)
+        f.seek(offset)
+        for entries in iter_session_log_chunks(
+            session_id=session_id,
+            container_name=container,
+            cursor=cursor,
+            max_lines=chunk_lines,
+        ):
+            data = "".join(json.dumps(e, default=str) + "\n" for e in entries)
+            f.write(compressor(data.encode("utf-8")))
+            f.flush()
+            os.fsync(f.fileno())
+            exported += len(entries)
+            _write_export_state(
+                state_path,
+                {
+                    "session_id": session_id,
+                    "container": container,
+                    "compress": compress,
+                    "offset": f.tell(),
+                    "cursor": cursor.to_dict(),
+                },
+            )
+            clog.debug(f"Exported {exported} log lines up to [{cursor.last_ts}]")
+    clog.info(f"Exported {exported} log lines to [{output}]")
@@ -0,0 +1,42 @@
+import click
+
+from ..config import check_api_key_configured
+from ..api_client import list_spaces
+from ..utils import (
+    format_response,
+    watch_option,
+    get_effective_space_context,
+)
+
+
+@click.group("spaces")
+@click.pass_context
+def nv_spaces(ctx):
+    """Manages Nuvolos spaces."""
+    pass
+
+
+@nv_spaces.command("list")
+@click.option(
+    "-o",
+    "--org",
+    type=str,
+    help="The slug of the Nuvolos organization to use to list spaces",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+@watch_option
+@format_response
+def nv_spaces_list(ctx, **kwargs):
+    """
+    Lists the Nuvolos organizations / spaces / instances / apps available to the current user.
+    """
+    check_api_key_configured()
+    space_ctx = get_effective_space_context(ctx, **kwargs)
+    return list_spaces(org_slug=space_ctx.get("org_slug"))
@@ -0,0 +1,106 @@
+import click
+
+from ..logging import clog
+from ..config import check_api_key_configured
+from ..api_client import get_task, wait_for_tasks
+from ..utils import format_response, watch_option, print_models
+
+
+@click.group("tasks")
+@click.pass_context
+def nv_tasks(ctx):
+    """Manages Nuvolos tasks."""
+    pass
+
+
+@nv_tasks.command("get")
+@click.argument("tkid", type=int)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+@watch_option
+@format_response
+def nv_task_get(ctx, tkid, **kwargs):
+    """
+    Retrieves the status and details of a specific task by its ID.
+    """
+    check_api_key_configured()
+    task = get_task(tkid=tkid)
+    return task
+
+
+@nv_tasks.command("wait")
+@click.argument("tkids", nargs=-1)
+@click.option(
+    "--timeout",
+    type=click.IntRange(min=1),
+    help="Maximum time in seconds to wait for all tasks (default: APP_TASK_TIMEOUT_SECS or 600)",
+)
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    help="Stop waiting as soon as a task fails or is cancelled",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    help="Maximum number of concurrent status requests (default: NUVOLOS_CLI_POLL_CONCURRENCY or 8)",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=str,
+    default="tabulated",
+    help="Sets the output into the desired format. Available values: `tabulated`, `json`, `yaml`, `ndjson`, `csv`",
+)
+@click.pass_context
+def nv_tasks_wait(ctx, tkids, timeout, fail_fast, concurrency, format):
+    """
+    Waits for one or more tasks to finish and prints their final status.
+
+    Task IDs can be given as arguments, or read from the standard input (whitespace separated) if no
+    arguments or `-` is given. Every finished task is reported as soon as it completes. The command fails
+    if any of the tasks failed or was cancelled.
+    """
+    check_api_key_configured()
+    if not tkids or tkids == ("-",):
+        tkids = click.get_text_stream("stdin").read().split()
+    try:
+        tkids = [int(tkid) for tkid in tkids]
+    except ValueError as e:
+        raise click.BadParameter(f"Task IDs must be integers: {e}", param_hint="TKIDS")
+    if not tkids:
+        raise click.UsageError("No task IDs were given.")
+
+    finished = []
+    failed = []
+
+    def report():
+        for task in wait_for_tasks(
+            tkids, timeout_secs=timeout, max_workers=concurrency
+        ):
+            finished.append(task)
+            if task.status == "COMPLETED":
+                clog.info(f"Task [{task.id}] completed successfully")
+            else:
+                failed.append(task)
+                clog.error(
+                    f"Task [{task.id}] ended with status {task.status}: {task.result}"
+                )
+            yield task
+            if failed and fail_fast:
+                return
+
+    # Streaming formats print every task as soon as it finishes
+    print_models(report(), format)
+    if failed:
+        pending = len(set(tkids)) - len(finished)
+        raise click.ClickException(
+            f"{len(failed)} of {len(set(tkids))} task(s) did not complete successfully"
+            + (f", {pending} task(s) were not waited for" if pending else "")
+        )
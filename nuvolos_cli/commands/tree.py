@@ -0,0 +1,88 @@
+import json
+
+import click
+
+from ..config import check_api_key_configured
+from ..api_client import crawl_hierarchy, HIERARCHY_LEVELS
+from ..utils import _model_to_dict, echo
+
+
+def _path_key(path: dict):
+    return tuple(
+        path[f"{level}_slug"] for level in HIERARCHY_LEVELS if f"{level}_slug" in path
+    )
+
+
+def build_tree(records):
+    """
+    Nests the flat records of `crawl_hierarchy` into a list of organizations, each with its `spaces`,
+    each space with its `instances`, and so on.
+    """
+    roots = []
+    nodes = {}
+    for record in records:
+        key = _path_key(record["path"])
+        if "error" in record:
+            nodes[key]["error"] = record["error"]
+            continue
+        node = dict(_model_to_dict(record["data"]))
+        nodes[key] = node
+        if len(key) == 1:
+            roots.append(node)
+        else:
+            nodes[key[:-1]].setdefault(f"{record['level']}s", []).append(node)
+    return roots
+
+
+@click.command("tree")
+@click.option(
+    "-o",
+    "--org",
+    "orgs",
+    type=str,
+    multiple=True,
+    help="The slug of a Nuvolos organization to crawl, can be repeated (default: all organizations)",
+)
+@click.option(
+    "-d",
+    "--depth",
+    type=click.Choice(HIERARCHY_LEVELS),
+    default="instance",
+    show_default=True,
+    help="The deepest level of the hierarchy to list. The `app` level lists the applications of every snapshot.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    help="Maximum number of concurrent requests (default: NUVOLOS_CLI_CRAWL_CONCURRENCY or 16)",
+)
+@click.option(
+    "-f",
+    "--format",
+    type=click.Choice(["json", "yaml", "ndjson"]),
+    default="json",
+    show_default=True,
+    help="Sets the output into the desired format. `ndjson` prints every entry as soon as it is fetched.",
+)
+def nv_tree(orgs, depth, concurrency, format):
+    """
+    Lists the organizations, spaces and instances (and optionally snapshots and applications) available
+    to the current user in a single crawl.
+    """
+    check_api_key_configured()
+    records = crawl_hierarchy(org_slugs=orgs, depth=depth, max_workers=concurrency)
+    if format == "ndjson":
+        for record in records:
+            if "data" in record:
+                record = dict(record, data=_model_to_dict(record["data"]))
+            echo(json.dumps(record, default=str))
+    elif format == "json":
+        echo(json.dumps(build_tree(records), indent=2, default=str))
+    else:
+        import yaml
+
+        echo(
+            yaml.dump(
+                json.loads(json.dumps(build_tree(records), default=str)), sort_keys=True
+            )
+        )
@@ -1,6 +1,9 @@
 import os
 import yaml
 import pathlib
+import threading
+from functools import lru_cache
+from types import MappingProxyType
 
 from click import ClickException
 
@@ -8,8 +11,6 @@ from .logging import clog
 from .utils import mask_api_key_in_config
 from .version import __version__
 
-import nuvolos_client_api
-
 
 def get_default_config_path():
     return pathlib.Path.home() / ".nuvolos" / "config.yaml"
@@ -35,12 +36,41 @@ class DictConfig(object):
             return yaml.dump(d, f)
 
 
+def _secret_key(variable_name):
+    """
+    Returns the (path, mtime, size) of the secret file of a variable, or None if there is no such file.
+    """
+    path = f"/secrets/{variable_name}"
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=64)
+def _read_secret_file(path, mtime_ns, size):
+    try:
+        with pathlib.Path(path).open(mode="r") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _read_secret(variable_name):
+    # Keyed on the mtime of the file, so that created or edited secrets are read again
+    key = _secret_key(variable_name)
+    if key is None:
+        return None
+    return _read_secret_file(*key)
+
+
 def from_variable(variable_name, default=None):
     val = os.environ.get(variable_name, default=default)
     if not val:
-        if pathlib.Path(f"/secrets/{variable_name}").exists():
-            with pathlib.Path(f"/secrets/{variable_name}").open(mode="r") as f:
-                val = f.read()
+        secret = _read_secret(variable_name)
+        if secret is not None:
+            val = secret
     return val
 
 
@@ -56,11 +86,87 @@ def get_global_dict_config():
     return DictConfig(get_default_config_path(), default_global_configs)
 
 
-def get_config():
+# The environment variables that affect the loaded configuration
+CONFIG_VARIABLES = (
+    "NUVOLOS_API_KEY",
+    "NUVOLOS_API_HOST",
+    "NUVOLOS_CLI_DEBUG",
+    "NUVOLOS_CLI_POOL_SIZE",
+)
+
+
+class ConfigCache(object):
+    """
+    Process-wide cache of the CLI configuration and the matching API configuration.
+    The configuration file is only parsed again when its mtime, one of the CONFIG_VARIABLES
+    or the mtime of one of their secret files changes.
+    """
+
+    def __init__(self):
+        self._key = None
+        self._global_config = None
+        self._config = None
+        self._api_config = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _current_key():
+        path = get_default_config_path()
+        try:
+            stat = path.stat()
+            file_key = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            file_key = None
+        return (
+            (str(path), file_key)
+            + tuple(os.environ.get(v) for v in CONFIG_VARIABLES)
+            + tuple(_secret_key(v) for v in CONFIG_VARIABLES)
+        )
+
+    def _refresh(self):
+        key = self._current_key()
+        if key != self._key:
+            clog.debug(f"Loading Nuvolos CLI configuration from [{key[0]}]")
+            self._global_config = None
+            self._config = None
+            self._api_config = None
+            self._key = key
+
+    def global_config(self):
+        with self._lock:
+            self._refresh()
+            if self._global_config is None:
+                self._global_config = MappingProxyType(get_global_dict_config().read())
+            return self._global_config
+
+    def config(self):
+        with self._lock:
+            self._refresh()
+            if self._config is None:
+                self._config = MappingProxyType(_load_config())
+            return self._config
+
+    def api_config(self):
+        with self._lock:
+            config = self.config()
+            if self._api_config is None:
+                self._api_config = _build_api_config(config)
+            return self._api_config
+
+    def clear(self):
+        with self._lock:
+            self._key = None
+            _read_secret_file.cache_clear()
+
+
+config_cache = ConfigCache()
+
+
+def _load_config():
     if not get_default_config_path().exists():
         return default_global_configs()
     else:
-        dc = get_global_dict_config().read()
+        dc = dict(config_cache.global_config())
         api_key = from_variable("NUVOLOS_API_KEY")
         if api_key:
             # Prioritize the environment variable
@@ -76,13 +182,30 @@ def get_config():
         return dc
 
 
+def get_config():
+    """
+    Returns the effective CLI configuration as a read-only mapping, loaded once per process.
+    """
+    return config_cache.config()
+
+
 def get_api_config():
-    config = get_config()
+    """
+    Returns the shared API configuration, rebuilt only when the CLI configuration changes.
+    """
+    return config_cache.api_config()
+
+
+def _build_api_config(config):
+    import nuvolos_client_api
+
+    pool_size = from_variable("NUVOLOS_CLI_POOL_SIZE")
     return nuvolos_client_api.Configuration(
         host=config["host"],
         api_key={"ApiKeyAuth": config["api_key"]},
         api_key_prefix={"ApiKeyAuth": "basic"},
         debug=os.getenv("NUVOLOS_CLI_DEBUG", "false").lower() in ("true", "1", "yes"),
+        connection_pool_maxsize=int(pool_size) if pool_size else None,
     )
 
 
@@ -95,6 +218,7 @@ def init_cli_config(
         global_settings["nuvolos_cli_version"] = __version__
         global_settings["api_key"] = api_key
         gdc.write(global_settings)
+        config_cache.clear()
         clog.info(f"Nuvolos CLI global configuration written to [{gdc.path}].")
 
 
@@ -105,7 +229,7 @@ def check_api_key_configured():
             raise ClickException(
                 "The Nuvolos API key must be set either as the NUVOLOS_API_KEY environment variable or with the `nuvolos config --api-key` command."
             )
-        gdc = get_global_dict_config().read()
+        gdc = config_cache.global_config()
         api_key = gdc["api_key"]
         if api_key is None:
             raise ClickException(
@@ -126,7 +250,7 @@ def info(nuvolos_ctx=None):
 """
     )
     clog.info(f"Version: {__version__}")
-    gc = mask_api_key_in_config(get_config())
+    gc = mask_api_key_in_config(dict(get_config()))
     if nuvolos_ctx:
         clog.info(
             f"""\nThe Nuvolos CLI context:
@@ -0,0 +1,466 @@
+"""
+Daemon mode: a long-running process that executes Nuvolos CLI commands sent over a per-user Unix socket.
+
+The daemon imports the CLI and all of its commands once, loads the configuration, creates the pooled API client
+and keeps an in-memory copy of the response cache. Every forwarded command runs in a worker process forked from
+it, so it starts with all of this already in place and runs concurrently with other commands without sharing
+their environment, working directory or standard streams. The responses cached by a worker are sent back to the
+daemon when it finishes, so that later workers find them in memory. Connections to the API cannot be shared
+between processes, so every worker opens its own.
+
+When the daemon is running, the `nuvolos` entry point forwards its arguments, environment and working directory
+to it and relays the output, falling back to running the command in-process if the daemon is unavailable or all
+of its workers are busy. Long-running commands, e.g. with `--follow`, `--watch` or `--wait`, are always run
+in-process.
+
+Protocol: newline-delimited JSON messages. The client sends the request
+(`{"args": [...], "env": {...}, "cwd": ..., "tty": {...}}`). The daemon replies with `{"busy": true}` if it cannot
+run the command now, or with `{"accepted": true}` once a worker starts it, then with `{"out": ...}` and
+`{"err": ...}` messages, `{"stdin": true}` when the command reads the standard input (answered by the client with
+`{"stdin": ...}`) and finally `{"exit": code}`. Closing the connection cancels the command.
+"""
+
+import io
+import json
+import os
+import pathlib
+import socket
+import sys
+import threading
+
+# Set in the daemon process, so that commands are never forwarded from the daemon to itself
+_in_daemon = False
+
+
+def get_socket_path():
+    path = os.environ.get("NUVOLOS_CLI_SOCKET")
+    if path:
+        return pathlib.Path(path)
+    return pathlib.Path.home() / ".nuvolos" / "daemon.sock"
+
+
+def forwarding_enabled():
+    return (
+        not _in_daemon
+        and hasattr(socket, "AF_UNIX")
+        and os.environ.get("NUVOLOS_CLI_DAEMON", "true").lower()
+        not in ("false", "0", "no", "off")
+    )
+
+
+# Options of commands that poll or stream until they are interrupted, which are neither forwarded nor run in a batch
+LONG_RUNNING_OPTIONS = ("--follow", "--watch", "--wait", "-w")
+LONG_RUNNING_COMMANDS = (("tasks", "wait"),)
+
+
+def is_long_running(args):
+    """
+    Returns whether the command line polls or streams until it is interrupted, e.g. with `--follow`, `--watch`
+    or `--wait`, or `tasks wait`.
+    """
+    args = list(args)
+    if any(
+        arg in LONG_RUNNING_OPTIONS or arg.split("=", 1)[0] in LONG_RUNNING_OPTIONS
+        for arg in args
+    ):
+        return True
+    commands = [arg for arg in args if not arg.startswith("-")]
+    return any(
+        commands[i : i + len(command)] == list(command)
+        for command in LONG_RUNNING_COMMANDS
+        for i in range(len(commands))
+    )
+
+
+def _connect(socket_path):
+    """Returns a socket connected to the daemon, or None if no daemon is listening."""
+    if not socket_path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def is_running(socket_path=None):
+    sock = _connect(pathlib.Path(socket_path or get_socket_path()))
+    if sock is None:
+        return False
+    sock.close()
+    return True
+
+
+def _send(f, message: dict):
+    f.write(json.dumps(message).encode("utf-8") + b"\n")
+    f.flush()
+
+
+def _recv(f):
+    line = f.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def forward(args):
+    """
+    Runs the command in the daemon if it is listening on the socket, relaying its output.
+    Returns the exit code of the command, or None if the daemon is not available.
+    """
+    if not forwarding_enabled() or is_long_running(args):
+        return None
+    sock = _connect(get_socket_path())
+    if sock is None:
+        return None
+    with sock, sock.makefile("rwb") as f:
+        try:
+            return _relay(f, args)
+        except KeyboardInterrupt:
+            # Closing the connection cancels the command in the daemon
+            sys.stderr.write("Aborted!\n")
+            return 1
+
+
+def _relay(f, args):
+    """Sends the command to the daemon and relays its output until it exits."""
+    try:
+        _send(
+            f,
+            {
+                "args": list(args),
+                "env": dict(os.environ),
+                "cwd": os.getcwd(),
+                "tty": {"out": sys.stdout.isatty(), "err": sys.stderr.isatty()},
+            },
+        )
+        accepted = _recv(f)
+    except OSError:
+        accepted = None
+    if not accepted or not accepted.get("accepted"):
+        # The daemon is busy or shutting down and did not start the command, so it is safe to run it in-process
+        return None
+    while True:
+        message = _recv(f)
+        if message is None:
+            sys.stderr.write("Error: The Nuvolos CLI daemon closed the connection\n")
+            return 1
+        if "out" in message:
+            try:
+                sys.stdout.buffer.write(
+                    message["out"].encode("utf-8", "surrogateescape")
+                )
+                sys.stdout.buffer.flush()
+            except BrokenPipeError:
+                # The output is piped into a command that exited early, e.g. `head`:
+                # disconnecting makes the daemon cancel the command.
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+                return 1
+        elif "err" in message:
+            sys.stderr.buffer.write(message["err"].encode("utf-8", "surrogateescape"))
+            sys.stderr.buffer.flush()
+        elif "stdin" in message:
+            _send(
+                f,
+                {"stdin": sys.stdin.buffer.read().decode("utf-8", "surrogateescape")},
+            )
+        elif "exit" in message:
+            return message["exit"]
+
+
+class _ClientStream(io.RawIOBase):
+    """Writable stream forwarding everything written to it to the client as `out` or `err` messages."""
+
+    def __init__(self, f, name, tty):
+        self._f = f
+        self._name = name
+        self._tty = tty
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return self._tty
+
+    def write(self, b):
+        _send(self._f, {self._name: bytes(b).decode("utf-8", "surrogateescape")})
+        return len(b)
+
+
+class _ClientStdin(io.RawIOBase):
+    """Readable stream that requests the standard input of the client when it is first read."""
+
+    def __init__(self, f):
+        self._f = f
+        self._data = None
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self._data is None:
+            _send(self._f, {"stdin": True})
+            message = _recv(self._f) or {}
+            self._data = io.BytesIO(
+                message.get("stdin", "").encode("utf-8", "surrogateescape")
+            )
+        data = self._data.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+
+def _watch_disconnect(sock):
+    """
+    Exits the worker when the client disconnects, e.g. when it is interrupted with Ctrl+C,
+    cancelling the command even if it does not write any output.
+    """
+    import select
+    import time
+
+    while True:
+        try:
+            readable, _, _ = select.select([sock], [], [], 0.5)
+            if readable and not sock.recv(1, socket.MSG_PEEK):
+                os._exit(1)
+        except OSError:
+            os._exit(1)
+        if readable:
+            # The client sent the standard input and the command did not read it yet
+            time.sleep(0.1)
+
+
+def _report_cache(report_fd, cached_before: dict):
+    """Sends the changes of the in-memory response cache to the daemon."""
+    from .cache import memory_cache_changes
+
+    data = json.dumps(memory_cache_changes(cached_before), default=str).encode("utf-8")
+    with os.fdopen(report_fd, "wb") as report:
+        report.write(data)
+
+
+def _run_worker(sock, request, report_fd):
+    """
+    Runs one command in a forked worker process with the environment, working directory and standard streams
+    of the client, reports the responses it cached to the daemon through `report_fd` and exits the worker.
+    Only the worker's own process state is changed.
+    """
+    import atexit
+
+    from . import cache
+    from .interface import nuvolos
+
+    exit_code = 1
+    cached_before = dict(cache._memory_cache or {})
+    try:
+        f = sock.makefile("rwb")
+        threading.Thread(target=_watch_disconnect, args=(sock,), daemon=True).start()
+        os.environ.clear()
+        os.environ.update(request.get("env", {}))
+        os.chdir(request.get("cwd", os.getcwd()))
+        tty = request.get("tty", {})
+        sys.stdin = io.TextIOWrapper(
+            io.BufferedReader(_ClientStdin(f)), encoding="utf-8"
+        )
+        sys.stdout, sys.stderr = (
+            io.TextIOWrapper(
+                _ClientStream(f, name, tty.get(name, False)),
+                encoding="utf-8",
+                errors="surrogateescape",
+                write_through=True,
+            )
+            for name in ("out", "err")
+        )
+        _send(f, {"accepted": True})
+        try:
+            nuvolos.main(args=request["args"], prog_name="nuvolos")
+            exit_code = 0
+        except SystemExit as e:
+            exit_code = (
+                e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            )
+            if isinstance(e.code, str):
+                sys.stderr.write(e.code + "\n")
+        except Exception as e:
+            sys.stderr.write(f"Error: {type(e).__name__}: {e}\n")
+        # The worker exits with os._exit, so run the exit handlers (e.g. closing the API clients) here
+        atexit._run_exitfuncs()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        _send(f, {"exit": exit_code})
+        # After the exit message, so that the client does not wait for it
+        _report_cache(report_fd, cached_before)
+    except (BrokenPipeError, ConnectionResetError):
+        # The client disconnected, e.g. its output was piped into a command that exited early
+        pass
+    finally:
+        os._exit(exit_code)
+
+
+def _preload():
+    """
+    Loads everything that the forked workers inherit: all commands, the configuration, the pooled API client
+    (which has no open connection yet) and the in-memory response cache.
+    """
+    from click import ClickException
+
+    from .api_client import client_manager
+    from .cache import enable_memory_cache
+    from .interface import nuvolos
+    from .logging import clog
+
+    for cmd_name in nuvolos.list_commands(None):
+        nuvolos.get_command(None, cmd_name)
+    enable_memory_cache()
+    try:
+        client_manager.get()
+    except ClickException as e:
+        # Not configured yet, the workers load the configuration themselves
+        clog.debug(f"Could not load the configuration: {e.format_message()}")
+
+
+def _read_report(fd, reports: dict):
+    """Reads the report of a worker, and applies it to the in-memory response cache once it is complete."""
+    from .cache import apply_memory_cache_changes
+    from .logging import clog
+
+    data = os.read(fd, 65536)
+    if data:
+        reports[fd] += data
+        return
+    os.close(fd)
+    report = reports.pop(fd)
+    if not report:
+        # The worker was cancelled
+        return
+    try:
+        changes = json.loads(report)
+    except ValueError as e:
+        clog.debug(f"Discarding the cache report of a worker: {e}")
+        return
+    apply_memory_cache_changes(changes)
+    clog.debug(
+        f"A worker cached {len(changes['set'])} and removed {len(changes['deleted'])} response(s)"
+    )
+
+
+def serve(socket_path=None, idle_timeout: float = None, max_workers: int = 8):
+    """
+    Listens on the Unix socket and runs each received command in a forked worker process,
+    until stopped or until no command was received for `idle_timeout` seconds.
+
+    At most `max_workers` commands run at the same time. When all workers are busy, the client is told
+    to run the command in-process instead of waiting.
+    """
+    import select
+    import time
+
+    from .logging import clog
+
+    global _in_daemon
+    if not hasattr(os, "fork"):
+        raise RuntimeError("The Nuvolos CLI daemon is not supported on this platform")
+    _in_daemon = True
+
+    socket_path = pathlib.Path(socket_path or get_socket_path())
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if is_running(socket_path):
+        raise RuntimeError(f"A daemon is already listening on [{socket_path}]")
+    if socket_path.exists():
+        # Stale socket of a daemon that did not shut down cleanly
+        socket_path.unlink()
+
+    _preload()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(str(socket_path))
+    finally:
+        os.umask(old_umask)
+    server.listen(64)
+
+    # The daemon itself is single-threaded, so that forking a worker is safe
+    workers = set()
+    # Cache reports being read from the workers, by file descriptor
+    reports = {}
+    last_activity = time.monotonic()
+    clog.info(f"Nuvolos CLI daemon listening on [{socket_path}]")
+    try:
+        while True:
+            while workers:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+                if not pid:
+                    break
+                workers.discard(pid)
+                last_activity = time.monotonic()
+            if (
+                idle_timeout
+                and not workers
+                and time.monotonic() - last_activity > idle_timeout
+            ):
+                clog.info(f"No command received for {idle_timeout} seconds, stopping")
+                return
+            readable, _, _ = select.select([server, *reports], [], [], 0.5)
+            for fd in readable:
+                if fd in reports:
+                    _read_report(fd, reports)
+            if server not in readable:
+                continue
+            conn, _ = server.accept()
+            last_activity = time.monotonic()
+            with conn:
+                conn.settimeout(5)
+                try:
+                    with conn.makefile("rwb") as f:
+                        request = _recv(f)
+                        if request is None:
+                            continue
+                        if request.get("control") == "stop":
+                            # Remove the socket before replying, so that new clients run their commands in-process
+                            socket_path.unlink(missing_ok=True)
+                            _send(f, {"exit": 0})
+                            return
+                        if len(workers) >= max_workers:
+                            _send(f, {"busy": True})
+                            continue
+                except (OSError, ValueError) as e:
+                    clog.debug(f"Could not read the request of a client: {e}")
+                    continue
+                conn.settimeout(None)
+                report_fd, report_write_fd = os.pipe()
+                try:
+                    pid = os.fork()
+                except OSError as e:
+                    clog.warning(f"Could not start a worker: {e}")
+                    os.close(report_fd)
+                    os.close(report_write_fd)
+                    conn.sendall(json.dumps({"busy": True}).encode("utf-8") + b"\n")
+                    continue
+                if pid == 0:
+                    server.close()
+                    for fd in [report_fd, *reports]:
+                        os.close(fd)
+                    _run_worker(conn, request, report_write_fd)
+                os.close(report_write_fd)
+                reports[report_fd] = b""
+                workers.add(pid)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        socket_path.unlink(missing_ok=True)
+
+
+def stop(socket_path=None):
+    """
+    Asks the daemon listening on the socket to stop. Returns False if no daemon is running.
+    """
+    sock = _connect(pathlib.Path(socket_path or get_socket_path()))
+    if sock is None:
+        return False
+    with sock, sock.makefile("rwb") as f:
+        _send(f, {"control": "stop"})
+        while _recv(f) is not None:
+            pass
+    return True
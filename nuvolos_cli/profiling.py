@@ -0,0 +1,85 @@
+"""
+CPU and memory profiling of a single command, enabled with the `--profile` and `--memprofile` options.
+
+The profilers are started in the callback of the `nuvolos` group and stopped when its context closes, so they cover
+the subcommand, the API calls and the rendering of the output, but not the startup of the interpreter.
+"""
+
+import click
+
+# Frames of the import machinery (code objects of lazily imported modules) and of the profiler itself,
+# excluded from the memory report
+_MEMPROFILE_EXCLUDED = (
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    "<unknown>",
+    "*/tracemalloc.py",
+)
+
+
+def start_profile(profile_file: str = None, top: int = 25):
+    """
+    Profiles the current command with cProfile. Only the calling thread is profiled.
+
+    Returns a function that stops the profiler and either writes the statistics to `profile_file`
+    (to be opened with `python -m pstats` or snakeviz) or prints the `top` functions by cumulative time
+    to standard error.
+    """
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    def stop():
+        import io
+        import pstats
+
+        profiler.disable()
+        if profile_file:
+            profiler.dump_stats(profile_file)
+            click.echo(f"> CPU profile written to [{profile_file}]", err=True)
+            return
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+        click.echo(out.getvalue().strip("\n"), err=True)
+
+    return stop
+
+
+def start_memprofile(top: int = 25, frames: int = 1):
+    """
+    Traces memory allocations of the current command with tracemalloc.
+
+    Returns a function that stops tracing and prints the peak memory and the `top` allocation sites
+    (by the size of the memory still allocated at the end of the command) to standard error.
+    """
+    import tracemalloc
+
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start(frames)
+    tracemalloc.reset_peak()
+
+    def stop():
+        from humanize import naturalsize
+
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in _MEMPROFILE_EXCLUDED]
+        )
+        if not already_tracing:
+            tracemalloc.stop()
+        click.echo(
+            f"> Peak traced memory: {naturalsize(peak, binary=True)}, "
+            f"still allocated: {naturalsize(current, binary=True)}",
+            err=True,
+        )
+        for i, stat in enumerate(snapshot.statistics("lineno")[:top], start=1):
+            frame = stat.traceback[0]
+            click.echo(
+                f"{i:>3}. {frame.filename}:{frame.lineno}: "
+                f"{naturalsize(stat.size, binary=True)} in {stat.count} block(s)",
+                err=True,
+            )
+
+    return stop
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import pathlib
+import threading
+import time
+
+from .logging import clog
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+_settings = {}
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def set_rate_limit(rate: float = None, burst: int = None, shared: bool = None):
+    """
+    Sets the client-side rate limit of the current process, e.g. from the `--rate-limit`, `--rate-burst`
+    and `--rate-limit-shared` options.
+    """
+    _settings["rate"] = rate
+    _settings["burst"] = burst
+    _settings["shared"] = shared
+    with _buckets_lock:
+        _buckets.clear()
+
+
+def get_rate_limit():
+    """
+    Returns the configured (requests per second, burst, shared) limit, or None if rate limiting is disabled.
+    """
+    rate = _settings.get("rate")
+    if rate is None:
+        rate = float(os.environ.get("NUVOLOS_CLI_RATE_LIMIT", 0))
+    if rate <= 0:
+        return None
+    burst = _settings.get("burst")
+    if burst is None:
+        burst = int(os.environ.get("NUVOLOS_CLI_RATE_BURST", 0)) or max(1, int(rate))
+    shared = _settings.get("shared")
+    if shared is None:
+        shared = os.environ.get("NUVOLOS_CLI_RATE_LIMIT_SHARED", "false").lower() in (
+            "true",
+            "1",
+            "yes",
+        )
+    return rate, burst, shared
+
+
+class TokenBucket(object):
+    """
+    Token bucket shared by all threads of the process: `burst` requests can be made at once,
+    and the bucket refills at `rate` tokens per second.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self):
+        """Takes a token, returning 0 on success or the time to wait for the next token."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        waited = 0.0
+        while True:
+            wait = self._take()
+            if not wait:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket whose state is kept in a lock file, so that it is shared by all processes
+    of the current user that use the same file.
+    """
+
+    def __init__(self, rate: float, burst: int, path):
+        super().__init__(rate, burst)
+        self.path = pathlib.Path(path)
+
+    def _take(self):
+        with self._lock:
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            with open(self.path, mode="a+") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read() or "{}")
+                    except ValueError:
+                        state = {}
+                    # Wall-clock time, as monotonic clocks are not comparable across processes
+                    now = time.time()
+                    tokens = min(
+                        self.burst,
+                        state.get("tokens", self.burst)
+                        + max(0.0, now - state.get("updated", now)) * self.rate,
+                    )
+                    wait = 0
+                    if tokens >= 1:
+                        tokens -= 1
+                    else:
+                        wait = (1 - tokens) / self.rate
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps({"tokens": tokens, "updated": now}))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+            return wait
+
+
+def get_bucket(host: str):
+    """
+    Returns the token bucket of the given API host, or None if rate limiting is disabled.
+    """
+    limit = get_rate_limit()
+    if limit is None:
+        return None
+    rate, burst, shared = limit
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            if shared and fcntl is not None:
+                digest = hashlib.sha256(host.encode("utf-8")).hexdigest()[:16]
+                path = pathlib.Path.home() / ".nuvolos" / f"ratelimit-{digest}.lock"
+                bucket = FileTokenBucket(rate, burst, path)
+            else:
+                if shared:
+                    clog.debug(
+                        "Cross-process rate limiting is not supported on this platform"
+                    )
+                bucket = TokenBucket(rate, burst)
+            _buckets[host] = bucket
+        return bucket
+
+
+def throttle(host: str):
+    """
+    Blocks until a request to the given API host is allowed by the rate limit.
+    """
+    bucket = get_bucket(host)
+    if bucket is not None:
+        waited = bucket.acquire()
+        if waited:
+            clog.debug(f"Rate limited requests to [{host}] for {waited:.2f}s")
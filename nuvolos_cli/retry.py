@@ -0,0 +1,156 @@
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+from .logging import clog
+from .utils import parse_retry_after, PollSchedule
+
+# Responses with these statuses are considered transient and are retried
+RETRY_STATUSES = (429, 502, 503, 504)
+# Methods that can always be retried safely
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BUDGET_SECS = 60
+
+_policy = {}
+_local = threading.local()
+_stats_lock = threading.Lock()
+retry_stats = Counter()
+
+
+def set_retry_policy(max_attempts: int = None, budget_secs: float = None):
+    """
+    Sets the retry policy of the current process, e.g. from the `--retries` and `--retry-budget` options.
+    """
+    _policy["max_attempts"] = max_attempts
+    _policy["budget_secs"] = budget_secs
+
+
+def get_max_attempts():
+    if _policy.get("max_attempts") is not None:
+        return _policy["max_attempts"]
+    return int(os.environ.get("NUVOLOS_CLI_RETRY_ATTEMPTS", DEFAULT_MAX_ATTEMPTS))
+
+
+def get_budget_secs():
+    if _policy.get("budget_secs") is not None:
+        return _policy["budget_secs"]
+    return float(os.environ.get("NUVOLOS_CLI_RETRY_BUDGET_SECS", DEFAULT_BUDGET_SECS))
+
+
+@contextmanager
+def retry_unsafe_requests():
+    """
+    Allows retrying non-idempotent requests made by the current thread within the block.
+    Only use it for mutations that are safe to repeat, like stopping an application.
+    """
+    previous = getattr(_local, "unsafe", False)
+    _local.unsafe = True
+    try:
+        yield
+    finally:
+        _local.unsafe = previous
+
+
+def safe_to_retry(f):
+    """
+    Marks an API client function whose requests can be retried even if they are not idempotent.
+    """
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        with retry_unsafe_requests():
+            return f(*args, **kwargs)
+
+    return wrapper
+
+
+def is_retryable(method: str):
+    return method.upper() in IDEMPOTENT_METHODS or getattr(_local, "unsafe", False)
+
+
+def _count(name: str):
+    with _stats_lock:
+        retry_stats[name] += 1
+
+
+def log_retry_stats():
+    if retry_stats:
+        clog.debug(
+            "Retry statistics: "
+            + ", ".join(f"{k}={v}" for k, v in sorted(retry_stats.items()))
+        )
+
+
+def _discard(response):
+    """
+    Returns the connection of a response that is not used to its pool. Responses of requests made without
+    preloading the content still hold their connection until the body is read.
+    """
+    raw = getattr(response, "response", response)
+    try:
+        raw.drain_conn()
+        raw.release_conn()
+    except Exception as e:
+        clog.debug(f"Could not release the connection of a discarded response: {e}")
+
+
+def call_with_retry(request, method: str, url: str):
+    """
+    Performs `request` and retries it on transient failures with exponential backoff and jitter:
+    connection errors and responses with one of the RETRY_STATUSES.
+
+    A request is attempted at most NUVOLOS_CLI_RETRY_ATTEMPTS times (default: 4), and no retry is scheduled
+    once NUVOLOS_CLI_RETRY_BUDGET_SECS (default: 60) have passed since the first attempt.
+    The server's Retry-After header is honoured. Non-idempotent requests are only attempted once,
+    unless they are explicitly marked as safe to retry.
+    """
+    import urllib3
+    import nuvolos_client_api
+
+    max_attempts = get_max_attempts() if is_retryable(method) else 1
+    budget_secs = get_budget_secs()
+    schedule = PollSchedule(initial_secs=0.5, max_secs=10)
+    start = time.monotonic()
+    attempt = 1
+    while True:
+        _count("requests")
+        try:
+            response = request()
+            if response.status not in RETRY_STATUSES:
+                return response
+            reason = f"HTTP {response.status}"
+            retry_after = parse_retry_after(response.headers)
+            error = None
+        except (urllib3.exceptions.HTTPError, nuvolos_client_api.ApiException) as e:
+            if isinstance(e, nuvolos_client_api.ApiException) and e.status:
+                raise
+            reason = type(e).__name__
+            retry_after = None
+            response = None
+            error = e
+
+        elapsed = time.monotonic() - start
+        delay = schedule.next_delay(retry_after=retry_after)
+        if attempt >= max_attempts or elapsed + delay > budget_secs:
+            if attempt > 1:
+                _count("exhausted")
+                clog.debug(
+                    f"Giving up {method} {url} after {attempt} attempts ({reason})"
+                )
+            if error is not None:
+                raise error
+            return response
+        if response is not None:
+            _discard(response)
+        _count("retries")
+        _count(reason)
+        clog.debug(
+            f"Retrying {method} {url} after {reason} in {delay:.2f}s (attempt {attempt + 1}/{max_attempts})"
+        )
+        time.sleep(delay)
+        attempt += 1
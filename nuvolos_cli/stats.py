@@ -0,0 +1,146 @@
+"""
+Statistics of application sessions.
+
+The sessions are loaded into compact columns (`array.array`, or NumPy arrays if NumPy is installed)
+so that the statistics of 100k+ sessions can be computed quickly and with little memory.
+"""
+
+import math
+from array import array
+from datetime import date
+
+from .utils import percentile
+
+# Numeric session fields that are summarized
+SESSION_METRICS = ("runtime_seconds", "ncu", "ncu_hours_used", "credits_spent")
+PERCENTILES = (50, 90, 99)
+
+
+class SessionColumns(object):
+    """
+    Columnar store of the session fields used for statistics. Missing values are stored as NaN.
+    """
+
+    def __init__(self):
+        self.days = array("q")
+        self.metrics = {metric: array("d") for metric in SESSION_METRICS}
+
+    def append(self, session):
+        self.days.append(
+            session.start_time.date().toordinal() if session.start_time else 0
+        )
+        for metric, column in self.metrics.items():
+            value = getattr(session, metric, None)
+            column.append(math.nan if value is None else float(value))
+
+    @classmethod
+    def from_sessions(cls, sessions):
+        columns = cls()
+        for session in sessions:
+            columns.append(session)
+        return columns
+
+    def __len__(self):
+        return len(self.days)
+
+
+def _summarize_column(metric, column):
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is not None:
+        values = np.frombuffer(column, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return {"metric": metric, "count": 0}
+        percentiles = np.percentile(values, PERCENTILES)
+        summary = {
+            "metric": metric,
+            "count": int(len(values)),
+            "total": float(values.sum()),
+            "mean": float(values.mean()),
+            "max": float(values.max()),
+        }
+        summary.update({f"p{p}": float(v) for p, v in zip(PERCENTILES, percentiles)})
+        return summary
+
+    values = sorted(v for v in column if not math.isnan(v))
+    if not values:
+        return {"metric": metric, "count": 0}
+    total = math.fsum(values)
+    summary = {
+        "metric": metric,
+        "count": len(values),
+        "total": total,
+        "mean": total / len(values),
+        "max": values[-1],
+    }
+    summary.update({f"p{p}": percentile(values, p) for p in PERCENTILES})
+    return summary
+
+
+def summarize(columns: SessionColumns):
+    """
+    Returns the count, total, mean, maximum and percentiles of every metric in SESSION_METRICS.
+    """
+    return [
+        _summarize_column(metric, column) for metric, column in columns.metrics.items()
+    ]
+
+
+def daily_histogram(columns: SessionColumns):
+    """
+    Returns the number of sessions started per day, with the total runtime, NCU hours and credits of these sessions.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is not None:
+        days = np.frombuffer(columns.days, dtype=np.int64)
+        unique_days, inverse, counts = np.unique(
+            days, return_inverse=True, return_counts=True
+        )
+        totals = {}
+        for metric in ("runtime_seconds", "ncu_hours_used", "credits_spent"):
+            values = np.nan_to_num(
+                np.frombuffer(columns.metrics[metric], dtype=np.float64)
+            )
+            totals[metric] = np.bincount(
+                inverse, weights=values, minlength=len(unique_days)
+            )
+        rows = zip(
+            unique_days.tolist(),
+            counts.tolist(),
+            totals["runtime_seconds"].tolist(),
+            totals["ncu_hours_used"].tolist(),
+            totals["credits_spent"].tolist(),
+        )
+    else:
+        by_day = {}
+        for day, runtime, ncu_hours, credits in zip(
+            columns.days,
+            columns.metrics["runtime_seconds"],
+            columns.metrics["ncu_hours_used"],
+            columns.metrics["credits_spent"],
+        ):
+            row = by_day.setdefault(day, [0, 0.0, 0.0, 0.0])
+            row[0] += 1
+            row[1] += 0.0 if math.isnan(runtime) else runtime
+            row[2] += 0.0 if math.isnan(ncu_hours) else ncu_hours
+            row[3] += 0.0 if math.isnan(credits) else credits
+        rows = ((day, *row) for day, row in sorted(by_day.items()))
+
+    return [
+        {
+            "date": date.fromordinal(day).isoformat() if day else None,
+            "sessions": count,
+            "runtime_hours": runtime / 3600,
+            "ncu_hours_used": ncu_hours,
+            "credits_spent": credits,
+        }
+        for day, count, runtime, ncu_hours, credits in rows
+    ]
@@ -0,0 +1,233 @@
+"""
+Instrumentation of API requests and output rendering, enabled with the `--trace` and `--trace-file` options.
+
+Every attempt of an API request is recorded as a span with its endpoint, status, response size, connection time
+(DNS, TCP and TLS, zero for reused keep-alive connections) and total latency including reading the response body.
+Rendering the output of a command is recorded as a `render` span. `--trace` prints a per-endpoint summary to standard
+error when the command finishes, and `--trace-file` writes every span as a JSON line.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+import click
+
+from .utils import percentile
+
+# Path segments followed by a path parameter of the API
+PATH_PARAMETERS = (
+    "org",
+    "space",
+    "instance",
+    "snapshot",
+    "app",
+    "table",
+    "container",
+)
+# Path segments followed by a file path, which may span several segments
+FILE_AREAS = ("files", "home")
+
+_settings = {"summary": False, "file": None}
+_spans = []
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def set_tracing(summary: bool = False, trace_file=None):
+    """
+    Enables tracing for the current command, e.g. from the `--trace` and `--trace-file` options.
+    `trace_file` is an open text file that receives every span as a JSON line.
+    """
+    with _lock:
+        _settings["summary"] = summary
+        _settings["file"] = trace_file
+        _spans.clear()
+
+
+def tracing_enabled():
+    return bool(_settings["summary"] or _settings["file"])
+
+
+def endpoint_of(method: str, url: str):
+    """
+    Returns the endpoint of a request URL with the path parameters replaced by placeholders,
+    e.g. `GET /apps/v1/org/{org}/space/{space}/instance/{instance}/snapshot/{snapshot}`.
+    """
+    segments = urlparse(url).path.split("/")
+    endpoint = segments[:3]
+    i = 3
+    while i < len(segments):
+        segment = segments[i]
+        if segment in FILE_AREAS and i + 1 < len(segments):
+            endpoint += [segment, "{path}"]
+            break
+        elif segment in PATH_PARAMETERS and i + 1 < len(segments):
+            endpoint += [segment, "{" + segment + "}"]
+            i += 2
+            continue
+        elif i == 3:
+            # e.g. /tasks/v1/{id}
+            endpoint.append("{id}")
+        else:
+            endpoint.append(segment)
+        i += 1
+    return f"{method} {'/'.join(endpoint)}"
+
+
+def record(span: dict):
+    if not tracing_enabled():
+        return
+    with _lock:
+        _spans.append(span)
+        if _settings["file"] is not None:
+            _settings["file"].write(json.dumps(span, default=str) + "\n")
+            _settings["file"].flush()
+
+
+def _new_span(kind: str, name: str):
+    return {
+        "kind": kind,
+        "name": name,
+        "start": datetime.now(timezone.utc).isoformat(),
+        "thread": threading.current_thread().name,
+    }
+
+
+def trace_request(request, method: str, url: str):
+    """
+    Calls `request`, which returns a (not yet read) `RESTResponse`, and records it as a `request` span.
+    The response body is read here, so that the latency and size include the transfer of the body.
+    """
+    if not tracing_enabled():
+        return request()
+    span = _new_span("request", endpoint_of(method, url))
+    span.update(status=None, bytes=0, connect_secs=0.0, error=None)
+    _local.span = span
+    started = time.perf_counter()
+    try:
+        response = request()
+        span["status"] = response.status
+        span["bytes"] = len(response.read() or b"")
+        return response
+    except Exception as e:
+        span["status"] = getattr(e, "status", None)
+        span["error"] = type(e).__name__
+        raise
+    finally:
+        _local.span = None
+        span["duration_secs"] = round(time.perf_counter() - started, 6)
+        span["connect_secs"] = round(span["connect_secs"], 6)
+        record(span)
+
+
+@contextmanager
+def timed(kind: str, name: str):
+    """
+    Records the enclosed block as a span of the given kind, e.g. rendering the output of a command.
+    """
+    if not tracing_enabled():
+        yield
+        return
+    s = _new_span(kind, name)
+    s["error"] = None
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        s["error"] = type(e).__name__
+        raise
+    finally:
+        s["duration_secs"] = round(time.perf_counter() - started, 6)
+        record(s)
+
+
+def _timed_connect(connection_cls):
+    class TracedConnection(connection_cls):
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                return super(TracedConnection, self).connect()
+            finally:
+                current = getattr(_local, "span", None)
+                if current is not None:
+                    current["connect_secs"] += time.perf_counter() - started
+
+    TracedConnection.__name__ = f"Traced{connection_cls.__name__}"
+    return TracedConnection
+
+
+def instrument_pool_manager(pool_manager):
+    """
+    Makes the connection pools of a urllib3 PoolManager record the time spent opening connections.
+    """
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class TracedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = _timed_connect(HTTPConnection)
+
+    class TracedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = _timed_connect(HTTPSConnection)
+
+    pool_manager.pool_classes_by_scheme = {
+        "http": TracedHTTPConnectionPool,
+        "https": TracedHTTPSConnectionPool,
+    }
+
+
+def summarize(spans=None):
+    """
+    Returns the count, errors, bytes and latency percentiles (in milliseconds) of the spans, per kind and name.
+    """
+    if spans is None:
+        with _lock:
+            spans = list(_spans)
+    groups = defaultdict(list)
+    for s in spans:
+        groups[(s["kind"], s["name"])].append(s)
+    rows = []
+    for (kind, name), group in sorted(groups.items()):
+        durations = sorted(s["duration_secs"] * 1000 for s in group)
+        connects = [s.get("connect_secs", 0) * 1000 for s in group]
+        rows.append(
+            {
+                "kind": kind,
+                "name": name,
+                "count": len(group),
+                "errors": sum(
+                    1 for s in group if s.get("error") or (s.get("status") or 0) >= 400
+                ),
+                "bytes": sum(s.get("bytes", 0) for s in group),
+                "connect_ms": round(sum(connects), 1),
+                "p50_ms": round(percentile(durations, 50), 1),
+                "p95_ms": round(percentile(durations, 95), 1),
+                "max_ms": round(durations[-1], 1),
+                "total_ms": round(sum(durations), 1),
+            }
+        )
+    return rows
+
+
+def report():
+    """
+    Prints the summary of the recorded spans to standard error if `--trace` is set, and closes the trace file.
+    """
+    from tabulate import tabulate
+
+    if _settings["summary"]:
+        rows = summarize()
+        if rows:
+            click.echo(
+                tabulate(rows, tablefmt="github", headers="keys"),
+                err=True,
+            )
+        else:
+            click.echo("No spans were recorded", err=True)
+    if _settings["file"] is not None:
+        _settings["file"].close()
+    set_tracing()
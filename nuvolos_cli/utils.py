@@ -1,17 +1,52 @@
+import contextvars
 import json as json_mod
+import math
+import os
+import random
 
 import click
 from click import ClickException
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from contextlib import contextmanager
 from copy import deepcopy
+from email.utils import parsedate_to_datetime
 from functools import wraps
-from pydantic import BaseModel
-from tabulate import tabulate
-from typing import List
-import yaml
+from types import GeneratorType
+from typing import Iterable, List, TYPE_CHECKING
 
 from .logging import clog
 
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+
+# Stream that the results of the current command are printed to, set per operation by `nuvolos batch`
+_output = contextvars.ContextVar("nuvolos_output", default=None)
+
+
+@contextmanager
+def output_to(stream):
+    """
+    Prints the results of the commands run by the current thread within the block to `stream`
+    instead of the standard output.
+    """
+    token = _output.set(stream)
+    try:
+        yield stream
+    finally:
+        _output.reset(token)
+
+
+def get_output():
+    """Returns the stream that results are printed to, the standard output by default."""
+    stream = _output.get()
+    return stream if stream is not None else click.get_text_stream("stdout")
+
+
+def echo(message=None, **kwargs):
+    """Prints a result of the current command, like `click.echo` but to the stream of `output_to`."""
+    click.echo(message, file=_output.get(), **kwargs)
+
 
 def _model_to_dict(m):
     """Convert a pydantic model to a dict, supporting both v1 and v2 APIs."""
@@ -29,42 +64,260 @@ def _model_to_dict(m):
     return m.dict()
 
 
-def print_model_tabulated(model: BaseModel, tablefmt="github"):
-    click.echo(tabulate(_model_to_dict(model), tablefmt=tablefmt, headers="keys"))
+def print_model_tabulated(model: "BaseModel", tablefmt="github"):
+    from tabulate import tabulate
+
+    echo(tabulate(_model_to_dict(model), tablefmt=tablefmt, headers="keys"))
+
 
+def print_models_tabulated(models: List["BaseModel"], tablefmt="github"):
+    from tabulate import tabulate
 
-def print_models_tabulated(models: List[BaseModel], tablefmt="github"):
-    click.echo(
+    echo(
         tabulate([_model_to_dict(m) for m in models], tablefmt=tablefmt, headers="keys")
     )
 
 
-def print_models_json(models: List[BaseModel]):
-    click.echo(
-        json_mod.dumps([_model_to_dict(m) for m in models], indent=2, default=str)
-    )
+def print_models_json(models: Iterable["BaseModel"]):
+    """
+    Prints the models as a JSON array, writing one element at a time.
+    The output is the same as dumping the whole list with an indent of 2, and is closed even on errors.
+    """
+    empty = True
+    try:
+        for m in models:
+            element = json_mod.dumps(_model_to_dict(m), indent=2, default=str)
+            echo(
+                ("[\n" if empty else ",\n") + "  " + element.replace("\n", "\n  "),
+                nl=False,
+            )
+            empty = False
+    finally:
+        # Close the array even if the models fail midway, e.g. on a timeout, so that the output stays valid JSON
+        echo("[]" if empty else "\n]")
+
 
+def print_models_yaml(models: List["BaseModel"]):
+    import yaml
 
-def print_models_yaml(models: List[BaseModel]):
     list_of_dicts = [_model_to_dict(m) for m in models]
-    click.echo(yaml.dump_all(list_of_dicts, sort_keys=True))
+    echo(yaml.dump_all(list_of_dicts, sort_keys=True))
+
+
+def print_models_ndjson(models: Iterable["BaseModel"]):
+    """Prints one JSON document per line, converting and writing the models one at a time."""
+    for m in models:
+        echo(json_mod.dumps(_model_to_dict(m), default=str))
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json_mod.dumps(value, default=str)
+    return value
+
+
+def print_models_csv(models: Iterable["BaseModel"]):
+    """
+    Prints the models as CSV, converting and writing them one at a time.
+    The header is taken from the fields of the first model, nested values are written as JSON.
+    """
+    import csv
+
+    writer = None
+    out = get_output()
+    for m in models:
+        d = _model_to_dict(m)
+        if writer is None:
+            # to_dict() leaves out unset fields, so take the header from the model fields when possible
+            fieldnames = list(
+                m.model_dump(by_alias=True) if hasattr(m, "model_dump") else d
+            )
+            writer = csv.DictWriter(
+                out,
+                fieldnames=fieldnames,
+                extrasaction="ignore",
+                lineterminator="\n",
+            )
+            writer.writeheader()
+        writer.writerow({k: _csv_value(v) for k, v in d.items()})
+    out.flush()
+
+
+STREAMING_FORMATS = ("json", "ndjson", "csv")
+FORMATS = ("tabulated", "yaml") + STREAMING_FORMATS
+
+
+def print_models(models: Iterable["BaseModel"], format_: str):
+    if format_ == "ndjson":
+        return print_models_ndjson(models)
+    elif format_ == "csv":
+        return print_models_csv(models)
+    elif format_ == "json":
+        return print_models_json(models)
+    elif format_ not in FORMATS:
+        raise click.ClickException(f"{format_} is not a valid format option")
+    models = list(models)
+    if format_ == "tabulated":
+        return print_models_tabulated(models)
+    else:
+        return print_models_yaml(models)
+
+
+# Fields that identify a row when diffing the results of `--watch`, in order of preference
+WATCH_KEY_FIELDS = ("id", "tkid", "imid", "session_id", "slug", "name")
+DEFAULT_WATCH_INTERVAL_SECS = 2.0
+
+
+def watch_option(f):
+    """
+    Adds the `--watch [INTERVAL]` option to a read-only command decorated with `format_response`.
+    """
+    return click.option(
+        "--watch",
+        type=click.FloatRange(min=0, min_open=True),
+        is_flag=False,
+        flag_value=DEFAULT_WATCH_INTERVAL_SECS,
+        default=None,
+        metavar="[INTERVAL]",
+        help=f"Polls the result every INTERVAL seconds (default: {DEFAULT_WATCH_INTERVAL_SECS:g}) and only prints the rows that were added, removed or changed",
+    )(f)
+
+
+# Fields that scope an identifying slug, e.g. application slugs are only unique within an instance
+WATCH_SCOPE_FIELDS = ("org_slug", "space_slug", "instance_slug", "snapshot_slug")
+
+
+def _row_key(row: dict):
+    for field in WATCH_KEY_FIELDS:
+        if row.get(field) is not None:
+            scope = [str(row[s]) for s in WATCH_SCOPE_FIELDS if row.get(s)]
+            return "/".join(scope + [str(row[field])])
+    return json_mod.dumps(row, sort_keys=True, default=str)
+
+
+def diff_rows(previous: dict, current: dict):
+    """
+    Compares two results keyed by `_row_key` and returns the change events between them:
+    `added` and `removed` rows, and `changed` rows with the old and new values of their changed fields.
+    """
+    at = datetime.now(timezone.utc).isoformat()
+    events = []
+    for key, row in current.items():
+        old = previous.get(key)
+        if old is None:
+            events.append({"event": "added", "key": key, "at": at, "data": row})
+        elif old != row:
+            changes = {
+                field: {"old": old.get(field), "new": row.get(field)}
+                for field in dict.fromkeys(list(old) + list(row))
+                if old.get(field) != row.get(field)
+            }
+            events.append(
+                {
+                    "event": "changed",
+                    "key": key,
+                    "at": at,
+                    "data": row,
+                    "changes": changes,
+                }
+            )
+    for key, row in previous.items():
+        if key not in current:
+            events.append({"event": "removed", "key": key, "at": at, "data": row})
+    return events
+
+
+_CHANGE_MARKERS = {"added": "+", "removed": "-", "changed": "~"}
+
+
+def _with_change_marker(event: dict):
+    # The marker is the first column, named so that it does not replace a field of the row
+    field = "change"
+    while field in event["data"]:
+        field = "_" + field
+    return {field: _CHANGE_MARKERS[event["event"]], **event["data"]}
+
+
+def _print_changes(events, format_: str):
+    if format_ in ("json", "ndjson"):
+        # A JSON array cannot be streamed forever, so both formats print one change event per line
+        return print_models_ndjson(events)
+    if format_ == "tabulated":
+        echo(f"\n{events[0]['at']}")
+    print_models([_with_change_marker(e) for e in events], format_)
+
+
+def watch_response(fetch, format_: str, interval_secs: float):
+    """
+    Calls `fetch` repeatedly in the same process, bypassing the response cache, and prints only what changed.
+
+    The full result is printed first (with `json` and `ndjson`, as `added` events), then only the rows that were
+    added, removed or changed since the previous poll. Polling backs off up to four times the interval while the
+    result does not change, and returns to the interval as soon as it does. Runs until interrupted.
+    """
+    from .cache import cache_mode, CACHE_MODE_OFF
+
+    with cache_mode(CACHE_MODE_OFF):
+        _watch(fetch, format_, interval_secs)
+
+
+def _watch(fetch, format_: str, interval_secs: float):
+    import time
+
+    schedule = PollSchedule(
+        initial_secs=interval_secs, max_secs=interval_secs * 4, jitter=0.1
+    )
+    previous = None
+    try:
+        while True:
+            try:
+                res = fetch()
+            except ClickException as e:
+                clog.warning(f"Could not refresh the result: {e.format_message()}")
+                time.sleep(schedule.next_delay())
+                continue
+            if not isinstance(res, (list, tuple, GeneratorType)):
+                res = [] if res is None else [res]
+            current = {}
+            for m in res:
+                row = json_mod.loads(json_mod.dumps(_model_to_dict(m), default=str))
+                current[_row_key(row)] = row
+            if previous is None and format_ not in ("json", "ndjson"):
+                print_models(list(current.values()), format_)
+            else:
+                events = diff_rows(previous or {}, current)
+                if events:
+                    _print_changes(events, format_)
+                    schedule.reset()
+            previous = current
+            time.sleep(schedule.next_delay())
+    except KeyboardInterrupt:
+        pass
 
 
 def format_response(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
-        res = f(*args, **kwargs)
-        if not isinstance(res, list):
+        watch = kwargs.pop("watch", None)
+        if watch:
+            if kwargs.get("format") not in FORMATS:
+                raise click.ClickException(
+                    f"{kwargs.get('format')} is not a valid format option"
+                )
+            return watch_response(
+                lambda: f(*args, **kwargs), kwargs.get("format"), watch
+            )
+        from .tracing import timed
+
+        with timed("command", f.__name__):
+            res = f(*args, **kwargs)
+        # Generators are passed through, so that streaming formats can print them lazily
+        if not isinstance(res, (list, tuple, GeneratorType)):
             res = [res]
-        format_ = kwargs.get("format")
-        if format_ == "tabulated":
-            return print_models_tabulated(res)
-        elif format_ == "json":
-            return print_models_json(res)
-        elif format_ == "yaml":
-            return print_models_yaml(res)
-        else:
-            raise click.ClickException(f"{format_} is not a valid format option")
+        with timed("render", kwargs.get("format")):
+            return print_models(res, kwargs.get("format"))
 
     return wrapper
 
@@ -163,7 +416,99 @@ def mask_api_key_in_config(config: dict):
     return config
 
 
+def percentile(sorted_values, q):
+    """Percentile with linear interpolation between the closest ranks, like numpy.percentile."""
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * q / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (
+        rank - low
+    )
+
+
 def exit_on_timeout(start_time: datetime, timeout_secs: int, err: str):
     difftime = datetime.utcnow() - start_time
     if difftime > timedelta(seconds=timeout_secs):
         raise ClickException(err)
+
+
+def parse_retry_after(headers) -> float:
+    """
+    Returns the number of seconds requested by a Retry-After response header, or None if there is no such header.
+    The header can either contain a number of seconds or an HTTP date.
+    """
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+_poll_bounds = {}
+
+
+def set_poll_bounds(min_secs: float = None, max_secs: float = None):
+    """
+    Sets the default polling bounds of the current process, e.g. from the `--poll-min-secs` and `--poll-max-secs` options.
+    """
+    _poll_bounds["min_secs"] = min_secs
+    _poll_bounds["max_secs"] = max_secs
+
+
+class PollSchedule(object):
+    """
+    Exponential backoff with jitter for polling loops.
+
+    Polling starts at `initial_secs` and the interval is multiplied by `factor` after every poll, up to `max_secs`.
+    The bounds default to the values set with `set_poll_bounds`, then to the NUVOLOS_CLI_POLL_MIN_SECS and
+    NUVOLOS_CLI_POLL_MAX_SECS environment variables.
+    """
+
+    def __init__(
+        self,
+        initial_secs: float = None,
+        max_secs: float = None,
+        factor: float = 2.0,
+        jitter: float = 0.2,
+    ):
+        if initial_secs is None:
+            initial_secs = _poll_bounds.get("min_secs") or float(
+                os.environ.get("NUVOLOS_CLI_POLL_MIN_SECS", 0.25)
+            )
+        if max_secs is None:
+            max_secs = _poll_bounds.get("max_secs") or float(
+                os.environ.get("NUVOLOS_CLI_POLL_MAX_SECS", 15)
+            )
+        self.initial_secs = initial_secs
+        self.max_secs = max(initial_secs, max_secs)
+        self.factor = factor
+        self.jitter = jitter
+        self._interval = initial_secs
+
+    def reset(self):
+        self._interval = self.initial_secs
+
+    def next_delay(self, retry_after: float = None) -> float:
+        """
+        Returns the time to wait before the next poll and advances the schedule.
+        A Retry-After value requested by the server takes precedence if it is longer than the computed delay.
+        """
+        delay = self._interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+        delay = min(delay, self.max_secs)
+        self._interval = min(self._interval * self.factor, self.max_secs)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
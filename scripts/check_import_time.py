@@ -0,0 +1,98 @@
+"""
+Import-time regression check for the Nuvolos CLI.
+
+Runs short CLI invocations under `python -X importtime` and fails if any of the heavy modules are imported
+or if the cumulative import time of the CLI exceeds the budget.
+
+Usage:
+    python scripts/check_import_time.py [--budget-ms 250]
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Modules that must only be imported once a subcommand that needs them runs
+HEAVY_MODULES = (
+    "nuvolos_client_api",
+    "pydantic",
+    "humanize",
+    "slugify",
+    "tabulate",
+    "yaml",
+    "nuvolos_cli.api_client",
+)
+
+# CLI invocations that must stay cheap, with the heavy modules they are allowed to import
+INVOCATIONS = {
+    ("--help",): (),
+    ("config", "--help"): ("yaml",),
+}
+
+
+def import_times(args):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "nuvolos_cli"] + list(args),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"`nuvolos {' '.join(args)}` failed:\n{proc.stderr}")
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        cumulative = cumulative.strip()
+        if cumulative.isdigit():
+            # Top-level imports are the ones without indentation
+            times[module.strip()] = (int(cumulative), module[1:] == module.strip())
+    return times
+
+
+def check(args, allowed, budget_ms):
+    times = import_times(args)
+    errors = []
+    heavy = sorted(
+        {
+            h
+            for h in HEAVY_MODULES
+            for m in times
+            if (m == h or m.startswith(h + ".")) and h not in allowed
+        }
+    )
+    if heavy:
+        errors.append(f"heavy modules imported: {', '.join(heavy)}")
+    total_ms = (
+        sum(
+            us
+            for m, (us, top_level) in times.items()
+            if top_level and m.startswith("nuvolos_cli")
+        )
+        / 1000
+    )
+    if total_ms > budget_ms:
+        errors.append(f"import time {total_ms:.1f} ms exceeds {budget_ms} ms")
+    print(f"nuvolos {' '.join(args)}: {total_ms:.1f} ms")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=250,
+        help="Maximum cumulative import time of the nuvolos_cli package",
+    )
+    opts = parser.parse_args()
+    failed = False
+    for args, allowed in INVOCATIONS.items():
+        for error in check(args, allowed, opts.budget_ms):
+            print(f"  FAIL: {error}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
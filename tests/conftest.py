@@ -0,0 +1,47 @@
+import pytest
+from click.testing import CliRunner
+
+from nuvolos_cli.api_client import client_manager
+from nuvolos_cli.config import config_cache
+from nuvolos_cli.interface import nuvolos
+
+from .mock_server import Dataset, MockNuvolosServer
+
+
+@pytest.fixture
+def mock_api(monkeypatch, tmp_path):
+    """
+    Starts a `MockNuvolosServer` on a free port and points the CLI at it, with an empty home directory
+    (so no configuration file or response cache is shared between tests) and without the daemon.
+
+    Call it with the arguments of `MockNuvolosServer`, e.g. `mock_api(Dataset(sessions_per_app=250))`;
+    it returns the started server.
+    """
+    servers = []
+
+    def start(dataset: Dataset = None, **kwargs):
+        server = MockNuvolosServer(dataset, port=0, **kwargs).start()
+        servers.append(server)
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.setenv("NUVOLOS_API_HOST", server.url)
+        monkeypatch.setenv("NUVOLOS_API_KEY", "test")
+        monkeypatch.setenv("NUVOLOS_CLI_DAEMON", "false")
+        config_cache.clear()
+        return server
+
+    yield start
+    client_manager.close()
+    config_cache.clear()
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def cli():
+    """Runs a `nuvolos` command in-process and returns the click `Result`."""
+    runner = CliRunner()
+
+    def invoke(*args, input=None):
+        return runner.invoke(nuvolos, list(args), input=input, catch_exceptions=False)
+
+    return invoke
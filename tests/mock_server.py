@@ -0,0 +1,905 @@
+"""
+Local stand-in for the Nuvolos API, to run the CLI offline in tests and benchmarks.
+
+The server implements the endpoints used by the CLI (orgs, spaces, instances, snapshots, apps, workloads, tasks,
+sessions, session logs, files, tables, images, image families, image links and distribution) on top of a generated
+dataset of configurable size. Listings are generated on the fly from the dataset sizes, so even large datasets
+(e.g. 100k sessions) do not have to be kept in memory. Started workloads and created tasks are kept in memory and
+progress with time: workloads are STARTING for `start_delay_secs` before they are RUNNING, and tasks are RUNNING
+for `task_duration_secs` before they are COMPLETED.
+
+Latency and failures can be injected into every request, or only into requests whose path matches `fail_paths`:
+`error_rate` requests fail with 503, `throttle_rate` requests fail with 429 and a Retry-After header, and
+`timeout_rate` requests hang for `timeout_secs` before they are answered.
+
+Start it from the command line and point the CLI at it:
+
+    python -m tests.mock_server --port 8765 --sessions-per-app 100000 --latency 0.05 --error-rate 0.05
+    NUVOLOS_API_HOST=http://127.0.0.1:8765 NUVOLOS_API_KEY=test nuvolos sessions list \\
+        -o org-0 -s space-0 -i instance-0 -a app-0 --all -f ndjson
+
+or from Python, on a free port:
+
+    with MockNuvolosServer(Dataset(sessions_per_app=1000), latency_secs=0.01) as server:
+        os.environ["NUVOLOS_API_HOST"] = server.url
+        ...
+        assert server.request_counts["GET /orgs/v1"] == 1
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+# Time origin of the generated timestamps
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+LOG_CONTAINERS = ("app", "sidecar")
+
+
+@dataclass
+class Dataset(object):
+    """
+    Sizes of the generated dataset. Entities are named after their type and index, e.g. `org-0`, `space-1`,
+    `instance-2`, `snapshot-3` (besides `development`), `app-4`, `table-5` and `sess-6`.
+    """
+
+    orgs: int = 2
+    spaces_per_org: int = 3
+    instances_per_space: int = 3
+    snapshots_per_instance: int = 2
+    apps_per_instance: int = 3
+    sessions_per_app: int = 50
+    log_lines_per_container: int = 200
+    files_per_area: int = 20
+    tables_per_snapshot: int = 5
+    columns_per_table: int = 8
+    images: int = 10
+    image_families: int = 3
+    node_pools: int = 3
+
+
+def _ts(secs: float):
+    # Fixed precision, so that the timestamps can be compared as strings
+    return (
+        (EPOCH + timedelta(seconds=secs))
+        .isoformat(timespec="milliseconds")
+        .replace("+00:00", "Z")
+    )
+
+
+def _index(slug: str, prefix: str, count: int):
+    """
+    Returns the index of a generated entity from its slug, or None if no such entity exists.
+    """
+    m = re.fullmatch(re.escape(prefix) + r"-(\d+)", slug or "")
+    if m and int(m[1]) < count:
+        return int(m[1])
+    return None
+
+
+class NotFound(Exception):
+    pass
+
+
+class MockState(object):
+    """
+    Generated dataset and the mutable state of the server: workloads, tasks and renamed or deleted tables.
+    """
+
+    def __init__(
+        self,
+        dataset: Dataset,
+        start_delay_secs: float = 1.0,
+        stop_delay_secs: float = 1.0,
+        task_duration_secs: float = 1.0,
+    ):
+        self.dataset = dataset
+        self.start_delay_secs = start_delay_secs
+        self.stop_delay_secs = stop_delay_secs
+        self.task_duration_secs = task_duration_secs
+        self.lock = threading.Lock()
+        # (org, space, instance, app) -> {"started": t, "stopped": t or None, "node_pool": ...}
+        self.workloads = {}
+        self.tasks = {}
+        self.next_tkid = 1000
+        self.tables = {}
+
+    # Hierarchy
+
+    def check(self, org=None, space=None, instance=None, snapshot=None, app=None):
+        d = self.dataset
+        checks = [
+            (org, "org", d.orgs),
+            (space, "space", d.spaces_per_org),
+            (instance, "instance", d.instances_per_space),
+            (app, "app", d.apps_per_instance),
+        ]
+        for slug, prefix, count in checks:
+            if slug is not None and _index(slug, prefix, count) is None:
+                raise NotFound(f"{prefix} [{slug}] does not exist")
+        if (
+            snapshot is not None
+            and snapshot != "development"
+            and _index(snapshot, "snapshot", d.snapshots_per_instance) is None
+        ):
+            raise NotFound(f"snapshot [{snapshot}] does not exist")
+
+    def orgs(self):
+        return [
+            {"slug": f"org-{i}", "name": f"Organization {i}", "role": "ADMIN"}
+            for i in range(self.dataset.orgs)
+        ]
+
+    def spaces(self, org):
+        self.check(org=org)
+        return [
+            {
+                "slug": f"space-{i}",
+                "name": f"Space {i}",
+                "type": "RESEARCH",
+                "visibility_type": "PRIVATE",
+                "video_library_enabled": False,
+                "role": "ADMIN",
+            }
+            for i in range(self.dataset.spaces_per_org)
+        ]
+
+    def instances(self, org, space):
+        self.check(org=org, space=space)
+        return [
+            {"slug": f"instance-{i}", "name": f"Instance {i}", "role": "EDITOR"}
+            for i in range(self.dataset.instances_per_space)
+        ]
+
+    def snapshots(self, org, space, instance):
+        self.check(org=org, space=space, instance=instance)
+        snapshots = [
+            {"slug": "development", "name": "Current state", "snapshot_type": "DEV"}
+        ]
+        snapshots += [
+            {
+                "slug": f"snapshot-{i}",
+                "name": f"Snapshot {i}",
+                "snapshot_type": "SNAPSHOT",
+                "snapshot_timestamp": _ts(i * 86400),
+            }
+            for i in range(self.dataset.snapshots_per_instance)
+        ]
+        return snapshots
+
+    def apps(self, org, space, instance, snapshot):
+        self.check(org=org, space=space, instance=instance, snapshot=snapshot)
+        return [
+            {
+                "slug": f"app-{i}",
+                "name": f"Application {i}",
+                "description": "",
+                "status": "OK",
+                "storage_used": (i + 1) * 1024**3,
+                "shared": False,
+                "exportable": True,
+                "aoid": i + 1,
+            }
+            for i in range(self.dataset.apps_per_instance)
+        ]
+
+    # Workloads
+
+    def _workload_status(self, w, now):
+        if w["stopped"] is not None:
+            if now - w["stopped"] >= self.stop_delay_secs:
+                return None
+            return "STOPPING"
+        if now - w["started"] < self.start_delay_secs:
+            return "STARTING"
+        return "RUNNING"
+
+    def workloads_of(self, key=None):
+        now = time.monotonic()
+        workloads = []
+        with self.lock:
+            for k, w in list(self.workloads.items()):
+                status = self._workload_status(w, now)
+                if status is None:
+                    del self.workloads[k]
+                    continue
+                if key is not None and k != key:
+                    continue
+                org, space, instance, app = k
+                workloads.append(
+                    {
+                        "session_id": w["session_id"],
+                        "slug": app,
+                        "name": app,
+                        "status": status,
+                        "org_slug": org,
+                        "space_slug": space,
+                        "instance_slug": instance,
+                        "node_pool": w["node_pool"],
+                        "creation_timestamp": w["created"],
+                    }
+                )
+        return workloads
+
+    def start_workload(self, key, node_pool=None):
+        self.check(*key[:3], app=key[3])
+        with self.lock:
+            self.workloads[key] = {
+                "started": time.monotonic(),
+                "stopped": None,
+                "node_pool": node_pool or "np-0",
+                "session_id": f"sess-{len(self.workloads)}",
+                "created": datetime.now(timezone.utc).isoformat(),
+            }
+        return self.create_task("START_APP")
+
+    def stop_workload(self, key):
+        self.check(*key[:3], app=key[3])
+        with self.lock:
+            w = self.workloads.get(key)
+            if w is not None and w["stopped"] is None:
+                w["stopped"] = time.monotonic()
+
+    def node_pools(self, org, space):
+        self.check(org=org, space=space)
+        return [
+            {
+                "slug": f"np-{i}",
+                "description": f"Node pool {i}",
+                "credits_per_hour": 0.5 * (i + 1),
+                "cpu": 2 ** (i + 1),
+                "memory": 2 ** (i + 3),
+                "ssd": 100,
+                "available_in_teaching_spaces": i == 0,
+            }
+            for i in range(self.dataset.node_pools)
+        ]
+
+    # Tasks
+
+    def create_task(self, operation):
+        with self.lock:
+            self.next_tkid += 1
+            tkid = self.next_tkid
+            self.tasks[tkid] = {"operation": operation, "created": time.monotonic()}
+        return {"tkid": tkid, "operation": operation}
+
+    def task(self, tkid):
+        with self.lock:
+            task = self.tasks.get(tkid)
+        if task is None:
+            # Tasks that were not created by this server are reported as completed
+            return {"id": tkid, "description": "Unknown task", "status": "COMPLETED"}
+        elapsed = time.monotonic() - task["created"]
+        if elapsed < self.task_duration_secs / 4:
+            status = "QUEUED"
+        elif elapsed < self.task_duration_secs:
+            status = "RUNNING"
+        else:
+            status = "COMPLETED"
+        return {
+            "id": tkid,
+            "description": task["operation"],
+            "status": status,
+            "result": "OK" if status == "COMPLETED" else None,
+        }
+
+    # Sessions
+
+    def session(self, i):
+        start = i * 3600
+        runtime = 600 + (i * 7919) % 7200
+        return {
+            "session_id": f"sess-{i}",
+            "start_time": _ts(start),
+            "stop_time": _ts(start + runtime),
+            "start_uid": 1 + i % 50,
+            "start_uid_full_name": f"User {1 + i % 50}",
+            "runtime_seconds": runtime,
+            "ncu": 1 + i % 4,
+            "ncu_hours_used": round(runtime / 3600 * (1 + i % 4), 3),
+            "credits_spent": round(runtime / 3600 * (1 + i % 4) * 0.1, 4),
+            "node_pool": f"np-{i % max(1, self.dataset.node_pools)}",
+            "can_read_logs": True,
+            "logging_containers": list(LOG_CONTAINERS),
+        }
+
+    def sessions(self, org, space, instance, app, query):
+        self.check(org=org, space=space, instance=instance, app=app)
+        total = self.dataset.sessions_per_app
+        session_id = query.get("session_id")
+        if session_id:
+            i = _index(session_id, "sess", total)
+            return [] if i is None else [self.session(i)]
+        page = max(1, int(query.get("page") or 1))
+        per_page = max(1, int(query.get("per_page") or 10))
+        indexes = range(total)
+        if query.get("sort") == "desc":
+            indexes = indexes[::-1]
+        # Slicing a range is O(1), so deep pages of large datasets are as fast as the first one
+        return [
+            self.session(i) for i in indexes[(page - 1) * per_page : page * per_page]
+        ]
+
+    def session_logs(self, session_id, container, query):
+        if container not in LOG_CONTAINERS:
+            raise NotFound(f"container [{container}] does not exist")
+        i = _index(session_id, "sess", self.dataset.sessions_per_app)
+        if i is None:
+            raise NotFound(f"session [{session_id}] does not exist")
+        start = i * 3600
+        lines = (
+            {
+                "ts": _ts(start + n * 0.5),
+                "level": "error" if n % 97 == 0 else "info",
+                "msg": f"{container} line {n}",
+            }
+            for n in range(self.dataset.log_lines_per_container)
+        )
+        from_start = query.get("from_start")
+        if from_start:
+            lines = (line for line in lines if line["ts"] >= from_start)
+        max_lines = int(query.get("max_lines") or 100)
+        batch = []
+        for line in lines:
+            if len(batch) == max_lines:
+                break
+            batch.append(line)
+        # Newest entries first
+        return list(reversed(batch))
+
+    # Files
+
+    def files(self, org, space, instance, snapshot, area, path=None):
+        self.check(org=org, space=space, instance=instance, snapshot=snapshot)
+        prefix = f"{path.strip('/')}/" if path else ""
+        files = []
+        for i in range(self.dataset.files_per_area):
+            is_dir = i % 5 == 0
+            name = (
+                f"{prefix}{'dir' if is_dir else 'file'}-{i}{'' if is_dir else '.csv'}"
+            )
+            files.append(
+                {
+                    "fid": f"{area}-{i}",
+                    "short_id": f"f{i}",
+                    "local_path": name,
+                    "area": area,
+                    "type": "folder" if is_dir else "file",
+                    "size": None if is_dir else (i + 1) * 4096,
+                    "snapshot_slug": snapshot,
+                    "last_modified_timestamp": _ts(i * 60),
+                }
+            )
+        return files
+
+    # Tables
+
+    def _table_key(self, org, space, instance, snapshot):
+        return (org, space, instance, snapshot)
+
+    def tables_of(self, org, space, instance, snapshot):
+        self.check(org=org, space=space, instance=instance, snapshot=snapshot)
+        key = self._table_key(org, space, instance, snapshot)
+        with self.lock:
+            if key not in self.tables:
+                self.tables[key] = {
+                    f"table-{i}": {
+                        "slug": f"table-{i}",
+                        "name": f"TABLE_{i}",
+                        "database": "DB",
+                        "var_schema": "PUBLIC",
+                        "bytes": (i + 1) * 10**6,
+                        "row_count": (i + 1) * 1000,
+                        "is_external": False,
+                    }
+                    for i in range(self.dataset.tables_per_snapshot)
+                }
+            return self.tables[key]
+
+    def table(self, org, space, instance, snapshot, table):
+        tables = self.tables_of(org, space, instance, snapshot)
+        if table not in tables:
+            raise NotFound(f"table [{table}] does not exist")
+        return tables[table]
+
+    def columns(self, table):
+        return [
+            {
+                "table_slug": table["slug"],
+                "short_id": f"c{i}",
+                "long_id": f"COLUMN_{i}",
+                "coltype": ("NUMBER", "VARCHAR", "TIMESTAMP_NTZ")[i % 3],
+            }
+            for i in range(self.dataset.columns_per_table)
+        ]
+
+    def ddl(self, table):
+        columns = ",\n  ".join(
+            f"{c['long_id']} {c['coltype']}" for c in self.columns(table)
+        )
+        return f"create or replace TABLE {table['name']} (\n  {columns}\n);"
+
+    # Images
+
+    def images(self):
+        return [
+            {
+                "imid": i + 1,
+                "name": f"Image {i}",
+                "docker_image_url": f"registry.example.com/image-{i}:latest",
+                "public": i % 2 == 0,
+                "app_type": ("jupyter", "rstudio", "vscode")[i % 3],
+                "complexity": i % 3,
+                "release_date": (EPOCH + timedelta(days=i)).date().isoformat(),
+            }
+            for i in range(self.dataset.images)
+        ]
+
+    def image_families(self):
+        return [
+            {
+                "ifid": i + 1,
+                "name": f"Family {i}",
+                "groups": ["default"],
+                "priority": i,
+            }
+            for i in range(self.dataset.image_families)
+        ]
+
+    def image_links(self):
+        return [
+            {
+                "imid": i + 1,
+                "linkid": 100 + i,
+                "org_slug": "org-0",
+                "space_slug": f"space-{i % max(1, self.dataset.spaces_per_org)}",
+                "priority": i,
+            }
+            for i in range(self.dataset.images)
+        ]
+
+
+SLUG = r"([^/]+)"
+HIERARCHY = rf"org/{SLUG}/space/{SLUG}/instance/{SLUG}"
+SNAPSHOT = rf"{HIERARCHY}/snapshot/{SLUG}"
+
+
+def _routes():
+    """
+    Returns the (method, path regex, handler) routes of the API. Handlers are called with the state,
+    the path parameters, the query parameters and the JSON body, and return a (status, response) tuple.
+    """
+    routes = [
+        ("GET", r"/orgs/v1", lambda s, p, q, b: (200, s.orgs())),
+        ("GET", rf"/spaces/v1/org/{SLUG}", lambda s, p, q, b: (200, s.spaces(*p))),
+        (
+            "GET",
+            rf"/instances/v1/org/{SLUG}/space/{SLUG}",
+            lambda s, p, q, b: (200, s.instances(*p)),
+        ),
+        (
+            "POST",
+            rf"/instances/v1/org/{SLUG}/space/{SLUG}",
+            lambda s, p, q, b: (
+                201,
+                {"slug": b.get("slug") or "new-instance", "name": b.get("name", "")},
+            ),
+        ),
+        (
+            "POST",
+            rf"/instances/v1/{HIERARCHY}/snapshots",
+            lambda s, p, q, b: (201, s.create_task("CREATE_SNAPSHOT")),
+        ),
+        (
+            "GET",
+            rf"/snapshots/v1/{HIERARCHY}",
+            lambda s, p, q, b: (200, s.snapshots(*p)),
+        ),
+        (
+            "DELETE",
+            rf"/snapshots/v1/{SNAPSHOT}",
+            lambda s, p, q, b: (201, s.create_task("DELETE_SNAPSHOT")),
+        ),
+        ("GET", rf"/apps/v1/{SNAPSHOT}", lambda s, p, q, b: (200, s.apps(*p))),
+        (
+            "POST",
+            rf"/apps/v1/{HIERARCHY}/applications",
+            lambda s, p, q, b: (201, {"slug": b.get("slug") or "new-app"}),
+        ),
+        (
+            "POST",
+            rf"/apps/v1/{HIERARCHY}/app/{SLUG}/derived_images",
+            lambda s, p, q, b: (202, s.create_task("DERIVE_APP")),
+        ),
+        ("GET", r"/workloads/v1", lambda s, p, q, b: (200, s.workloads_of())),
+        (
+            "GET",
+            rf"/workloads/v1/{HIERARCHY}/app/{SLUG}",
+            lambda s, p, q, b: (200, s.check(*p[:3], app=p[3]) or s.workloads_of(p)),
+        ),
+        (
+            "POST",
+            rf"/workloads/v1/{HIERARCHY}/app/{SLUG}",
+            lambda s, p, q, b: (202, s.start_workload(p, b.get("node_pool"))),
+        ),
+        (
+            "DELETE",
+            rf"/workloads/v1/{HIERARCHY}/app/{SLUG}",
+            lambda s, p, q, b: (204, s.stop_workload(p)),
+        ),
+        (
+            "POST",
+            rf"/workloads/v1/{HIERARCHY}/app/{SLUG}/execute",
+            lambda s, p, q, b: (
+                202,
+                s.check(*p[:3], app=p[3])
+                or {
+                    "reqid": f"req-{int(time.time() * 1000)}",
+                    "output_path": f"/files/.cli/{p[3]}.out",
+                    "error_path": f"/files/.cli/{p[3]}.err",
+                    "metadata_path": f"/files/.cli/{p[3]}.json",
+                },
+            ),
+        ),
+        (
+            "GET",
+            rf"/workloads/v1/org/{SLUG}/space/{SLUG}/nodepools",
+            lambda s, p, q, b: (200, s.node_pools(*p)),
+        ),
+        ("GET", r"/tasks/v1/(\d+)", lambda s, p, q, b: (200, s.task(int(p[0])))),
+        (
+            "GET",
+            rf"/sessions/v1/{HIERARCHY}/app/{SLUG}",
+            lambda s, p, q, b: (200, s.sessions(*p, q)),
+        ),
+        (
+            "GET",
+            rf"/sessions/v1/{SLUG}/container/{SLUG}/logs",
+            lambda s, p, q, b: (200, s.session_logs(*p, q)),
+        ),
+        (
+            "GET",
+            rf"/tables/v1/{SNAPSHOT}",
+            lambda s, p, q, b: (200, list(s.tables_of(*p).values())),
+        ),
+        (
+            "GET",
+            rf"/tables/v1/{SNAPSHOT}/get_ddl",
+            lambda s, p, q, b: (
+                200,
+                {"ddl": "\n\n".join(s.ddl(t) for t in s.tables_of(*p).values())},
+            ),
+        ),
+        (
+            "GET",
+            rf"/tables/v1/{SNAPSHOT}/table/{SLUG}/columns",
+            lambda s, p, q, b: (200, s.columns(s.table(*p))),
+        ),
+        (
+            "GET",
+            rf"/tables/v1/{SNAPSHOT}/table/{SLUG}/get_ddl",
+            lambda s, p, q, b: (200, {"ddl": s.ddl(s.table(*p))}),
+        ),
+        (
+            "PATCH",
+            rf"/tables/v1/{SNAPSHOT}/table/{SLUG}",
+            lambda s, p, q, b: (200, _rename_table(s, p, b)),
+        ),
+        (
+            "DELETE",
+            rf"/tables/v1/{SNAPSHOT}/table/{SLUG}",
+            lambda s, p, q, b: (204, s.tables_of(*p[:4]).pop(s.table(*p)["slug"])),
+        ),
+        ("GET", r"/images/v1", lambda s, p, q, b: (200, s.images())),
+        (
+            "PUT",
+            r"/images/v1",
+            lambda s, p, q, b: (201, {"imid": s.dataset.images + 1}),
+        ),
+        (
+            "PATCH",
+            r"/images/v1/(\d+)",
+            lambda s, p, q, b: (200, _update_image(s, int(p[0]), b)),
+        ),
+        ("GET", r"/image_families/v1", lambda s, p, q, b: (200, s.image_families())),
+        (
+            "PUT",
+            r"/image_families/v1",
+            lambda s, p, q, b: (201, {"ifid": s.dataset.image_families + 1}),
+        ),
+        ("GET", r"/image_links/v1", lambda s, p, q, b: (200, s.image_links())),
+        (
+            "POST",
+            rf"/distribution/v1/{SNAPSHOT}",
+            lambda s, p, q, b: (
+                202,
+                s.check(*p) or s.create_task("DISTRIBUTE_CONTENT"),
+            ),
+        ),
+    ]
+    for area in ("files", "home"):
+        routes += [
+            (
+                "GET",
+                rf"/files/v1/{SNAPSHOT}/{area}",
+                lambda s, p, q, b, area=area: (200, s.files(*p, area)),
+            ),
+            (
+                "GET",
+                rf"/files/v1/{SNAPSHOT}/{area}/(.+)",
+                lambda s, p, q, b, area=area: (
+                    200,
+                    s.files(*p[:4], area, unquote(p[4])),
+                ),
+            ),
+        ]
+    return [(method, re.compile(path), handler) for method, path, handler in routes]
+
+
+def _rename_table(state, path, body):
+    tables = state.tables_of(*path[:4])
+    table = state.table(*path)
+    table.update({k: v for k, v in body.items() if k in ("name", "description")})
+    if body.get("slug"):
+        tables[body["slug"]] = dict(table, slug=body["slug"])
+        del tables[path[4]]
+        return tables[body["slug"]]
+    return table
+
+
+def _update_image(state, imid, body):
+    images = {i["imid"]: i for i in state.images()}
+    if imid not in images:
+        raise NotFound(f"image [{imid}] does not exist")
+    image = images[imid]
+    image.update({k: v for k, v in body.items() if k in image or v is not None})
+    return image
+
+
+ROUTES = _routes()
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # The headers and the body are written separately, which would otherwise be delayed by Nagle's algorithm
+    disable_nagle_algorithm = True
+    server: "MockNuvolosServer"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, payload=None, headers=None):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _error(self, status, message, headers=None):
+        self._send(
+            status, {"err": {"code": status}, "msg": {"message": message}}, headers
+        )
+
+    def _handle(self):
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+        if not isinstance(body, dict):
+            body = {}
+
+        for method, pattern, handler in ROUTES:
+            if method != self.command:
+                continue
+            m = pattern.fullmatch(url.path)
+            if m:
+                break
+        else:
+            self.server.count(f"{self.command} {url.path}")
+            return self._error(404, f"No route for {self.command} {url.path}")
+
+        endpoint = f"{self.command} {pattern.pattern}"
+        self.server.count(endpoint)
+        if self.server.api_key and self.headers.get("Authorization") != (
+            f"basic {self.server.api_key}"
+        ):
+            return self._error(401, "Invalid API key")
+        failure = self.server.inject(url.path)
+        if failure == "timeout":
+            time.sleep(self.server.timeout_secs)
+        elif failure == "throttle":
+            return self._error(
+                429,
+                "Too many requests",
+                {"Retry-After": str(self.server.retry_after_secs)},
+            )
+        elif failure == "error":
+            return self._error(503, "Injected failure")
+        try:
+            status, payload = handler(self.server.state, m.groups(), query, body)
+        except NotFound as e:
+            return self._error(404, str(e))
+        self._send(status, None if status == 204 else payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+
+class MockNuvolosServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server that serves a `MockState`. Use it as a context manager to serve in a background thread.
+
+    Every request is delayed by `latency_secs` plus a uniformly random `jitter_secs`, then failures are injected
+    with the given rates into the requests whose path matches the `fail_paths` regex (all requests by default).
+    `request_counts` counts the requests per endpoint pattern, e.g. `request_counts["GET /orgs/v1"]`.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        dataset: Dataset = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_secs: float = 0.0,
+        jitter_secs: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        timeout_secs: float = 30.0,
+        retry_after_secs: int = 1,
+        fail_paths: str = None,
+        api_key: str = None,
+        start_delay_secs: float = 1.0,
+        stop_delay_secs: float = 1.0,
+        task_duration_secs: float = 1.0,
+        seed: int = None,
+        verbose: bool = False,
+    ):
+        super().__init__((host, port), MockRequestHandler)
+        self.state = MockState(
+            dataset or Dataset(),
+            start_delay_secs=start_delay_secs,
+            stop_delay_secs=stop_delay_secs,
+            task_duration_secs=task_duration_secs,
+        )
+        self.latency_secs = latency_secs
+        self.jitter_secs = jitter_secs
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_secs = timeout_secs
+        self.retry_after_secs = retry_after_secs
+        self.fail_paths = re.compile(fail_paths) if fail_paths else None
+        self.api_key = api_key
+        self.verbose = verbose
+        self.request_counts = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, endpoint: str):
+        with self._lock:
+            self.request_counts[endpoint] += 1
+
+    def inject(self, path: str):
+        """
+        Sleeps for the configured latency and returns the failure to inject into the request, if any:
+        `timeout`, `throttle` or `error`.
+        """
+        with self._lock:
+            delay = self.latency_secs + self._random.uniform(0, self.jitter_secs)
+            roll = self._random.random()
+        if delay > 0:
+            time.sleep(delay)
+        if self.fail_paths is not None and not self.fail_paths.search(path):
+            return None
+        if roll < self.timeout_rate:
+            return "timeout"
+        if roll < self.timeout_rate + self.throttle_rate:
+            return "throttle"
+        if roll < self.timeout_rate + self.throttle_rate + self.error_rate:
+            return "error"
+        return None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="mock-nuvolos-api", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.stop()
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    for field, default in Dataset().__dict__.items():
+        parser.add_argument(
+            f"--{field.replace('_', '-')}",
+            type=int,
+            default=default,
+            help=f"Dataset size (default: {default})",
+        )
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-secs", type=float, default=30.0)
+    parser.add_argument("--retry-after-secs", type=int, default=1)
+    parser.add_argument("--fail-paths", help="Regex of the paths to inject failures")
+    parser.add_argument("--api-key", help="Reject requests with another API key")
+    parser.add_argument("--start-delay-secs", type=float, default=1.0)
+    parser.add_argument("--stop-delay-secs", type=float, default=1.0)
+    parser.add_argument("--task-duration-secs", type=float, default=1.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    dataset = Dataset(**{f: getattr(args, f) for f in Dataset().__dict__})
+    server = MockNuvolosServer(
+        dataset,
+        host=args.host,
+        port=args.port,
+        latency_secs=args.latency,
+        jitter_secs=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        timeout_rate=args.timeout_rate,
+        timeout_secs=args.timeout_secs,
+        retry_after_secs=args.retry_after_secs,
+        fail_paths=args.fail_paths,
+        api_key=args.api_key,
+        start_delay_secs=args.start_delay_secs,
+        stop_delay_secs=args.stop_delay_secs,
+        task_duration_secs=args.task_duration_secs,
+        seed=args.seed,
+        verbose=args.verbose,
+    )
+    print(f"Serving the mock Nuvolos API on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
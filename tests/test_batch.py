@@ -0,0 +1,61 @@
+"""
+Tests of parsing and checking the operations of a batch file.
+"""
+
+import click
+import pytest
+
+from nuvolos_cli.commands.batch import check_operation, parse_operation
+
+
+def test_parses_command_line_syntax():
+    assert parse_operation("apps stop -o my_org -a 'My app'") == (
+        ["apps", "stop", "-o", "my_org", "-a", "My app"],
+        None,
+    )
+
+
+def test_parses_json_operations():
+    line = (
+        '{"id": "op-1", "command": "apps start", "arguments": ["extra"], "options": '
+        '{"org": "o", "app_slug": "a", "wait": true, "quiet": false, "node_pool": null, "tag": ["x", "y"]}}'
+    )
+
+    args, op_id = parse_operation(line)
+
+    assert op_id == "op-1"
+    assert args == [
+        "apps", "start", "--org", "o", "--app-slug", "a", "--wait",
+        "--tag", "x", "--tag", "y", "extra",
+    ]  # fmt: skip
+
+
+def test_parses_json_commands_given_as_lists():
+    assert parse_operation('{"command": ["orgs", "list"]}') == (["orgs", "list"], None)
+
+
+@pytest.mark.parametrize("line", ['{"command": ', '{"options": {"org": "o"}}'])
+def test_rejects_invalid_json_operations(line):
+    with pytest.raises(click.UsageError):
+        parse_operation(line)
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        [],
+        ["serve"],
+        ["batch", "ops.txt"],
+        ["apps", "list", "--watch"],
+        ["sessions", "logs", "--follow"],
+        ["tasks", "wait", "1"],
+        ["tasks", "wait", "-"],
+    ],
+)
+def test_rejects_operations_that_cannot_run_in_a_batch(args):
+    with pytest.raises(click.UsageError):
+        check_operation(args)
+
+
+def test_accepts_other_operations():
+    check_operation(["apps", "stop", "-o", "o", "-s", "s", "-i", "i", "-a", "a"])
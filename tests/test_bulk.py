@@ -0,0 +1,71 @@
+"""
+Tests of reading the manifests of bulk operations.
+"""
+
+import io
+
+import click
+import pytest
+
+from nuvolos_cli.bulk import load_manifest
+
+
+def _file(content, name=""):
+    f = io.StringIO(content)
+    f.name = name
+    return f
+
+
+def test_loads_csv_manifests():
+    manifest = _file(
+        "org,space,instance,app,node_pool\no,s,i1,a1,\no, s, i2, a2, gpu\n",
+        "apps.csv",
+    )
+
+    assert load_manifest(manifest) == [
+        {"org_slug": "o", "space_slug": "s", "instance_slug": "i1", "app_slug": "a1", "node_pool": None},
+        {"org_slug": "o", "space_slug": "s", "instance_slug": "i2", "app_slug": "a2", "node_pool": "gpu"},
+    ]  # fmt: skip
+
+
+def test_loads_csv_manifests_without_csv_extension():
+    manifest = _file("org_slug,space_slug,instance_slug,app_slug\no,s,i,a\n")
+
+    assert [app["app_slug"] for app in load_manifest(manifest)] == ["a"]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "- {org: o, space: s, instance: i, app: a}\n",
+        "apps:\n  - {org_slug: o, space_slug: s, instance_slug: i, app_slug: a}\n",
+    ],
+)
+def test_loads_yaml_manifests(content):
+    assert load_manifest(_file(content, "apps.yaml")) == [
+        {"org_slug": "o", "space_slug": "s", "instance_slug": "i", "app_slug": "a", "node_pool": None}
+    ]  # fmt: skip
+
+
+def test_takes_missing_values_from_the_defaults():
+    manifest = _file(
+        "- {instance: i1, app: a1}\n- {instance: i2, app: a2, org: other}\n"
+    )
+    defaults = {"org_slug": "o", "space_slug": "s", "node_pool": "np"}
+
+    apps = load_manifest(manifest, defaults)
+
+    assert [(a["org_slug"], a["space_slug"], a["node_pool"]) for a in apps] == [
+        ("o", "s", "np"),
+        ("other", "s", "np"),
+    ]
+
+
+def test_rejects_entries_with_missing_fields():
+    with pytest.raises(click.ClickException, match=r"Entry 2 .* \[app\]"):
+        load_manifest(_file("org,space,instance,app\no,s,i,a\no,s,i,\n", "apps.csv"))
+
+
+def test_rejects_empty_manifests():
+    with pytest.raises(click.ClickException, match="does not contain"):
+        load_manifest(_file("org,space,instance,app\n", "apps.csv"))
@@ -0,0 +1,116 @@
+"""
+Tests of the response cache: expiry, LRU eviction, the in-memory copy and the invalidation after mutations.
+"""
+
+import os
+
+import pytest
+
+from nuvolos_cli import api_client, cache
+from nuvolos_cli.cache import ResponseCache
+
+
+class Clock(object):
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    return clock
+
+
+@pytest.fixture(autouse=True)
+def no_memory_cache(monkeypatch):
+    monkeypatch.setattr(cache, "_memory_cache", None)
+
+
+def _entry(n=0):
+    return {"model": None, "is_list": True, "items": [{"n": n}]}
+
+
+def test_entries_expire_after_their_ttl(tmp_path, clock):
+    response_cache = ResponseCache(tmp_path, max_size=1024 * 1024)
+    response_cache.set("orgs-1", _entry())
+
+    clock.now += 59
+    assert response_cache.get("orgs-1", ttl=60)["items"] == [{"n": 0}]
+    clock.now += 2
+    assert response_cache.get("orgs-1", ttl=60) is None
+
+
+def test_evicts_the_least_recently_used_entries(tmp_path):
+    response_cache = ResponseCache(tmp_path, max_size=1024 * 1024)
+    for n, key in enumerate(("a", "b", "c")):
+        response_cache.set(key, _entry(n))
+        os.utime(tmp_path / f"{key}.json", (1000 + n, 1000 + n))
+    entry_size = (tmp_path / "a.json").stat().st_size
+    # Room for 3 entries, and a hit makes `a` the most recently used one
+    response_cache.max_size = int(entry_size * 3.5)
+    assert response_cache.get("a", ttl=60) is not None
+
+    response_cache.set("d", _entry(3))
+
+    assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["a", "c", "d"]
+    assert response_cache.get("b", ttl=60) is None
+
+
+def test_memory_cache_notices_entries_removed_by_another_process(tmp_path):
+    cache.enable_memory_cache()
+    response_cache = ResponseCache(tmp_path, max_size=1024 * 1024)
+    response_cache.set("a", _entry())
+    before = dict(cache._memory_cache)
+    response_cache.set("b", _entry(1))
+
+    assert response_cache.get("a", ttl=60)["items"] == [{"n": 0}]
+    changes = cache.memory_cache_changes(before)
+    assert [key for key, _ in changes["set"]] == [[str(tmp_path), "b"]]
+
+    (tmp_path / "a.json").unlink()
+    assert response_cache.get("a", ttl=60) is None
+    assert (str(tmp_path), "a") not in cache._memory_cache
+
+
+def test_memory_cache_changes_are_applied_to_another_memory_cache(tmp_path):
+    cache.enable_memory_cache()
+    response_cache = ResponseCache(tmp_path, max_size=1024 * 1024)
+    response_cache.set("a", _entry())
+    before = dict(cache._memory_cache)
+    response_cache.set("b", _entry(1))
+    response_cache.delete("a")
+    changes = cache.memory_cache_changes(before)
+
+    cache._memory_cache = {(str(tmp_path), "a"): _entry()}
+    cache.apply_memory_cache_changes(changes)
+
+    assert list(cache._memory_cache) == [(str(tmp_path), "b")]
+
+
+def test_create_instance_invalidates_the_cached_instances(mock_api):
+    server = mock_api()
+    endpoint = "GET /instances/v1/org/([^/]+)/space/([^/]+)"
+
+    api_client.list_instances(org_slug="org-0", space_slug="space-0")
+    api_client.list_instances(org_slug="org-0", space_slug="space-0")
+    assert server.request_counts[endpoint] == 1
+
+    api_client.create_instance("org-0", "space-0", "New instance", "new-instance")
+    api_client.list_instances(org_slug="org-0", space_slug="space-0")
+    assert server.request_counts[endpoint] == 2
+
+
+def test_update_image_invalidates_the_cached_images(mock_api):
+    server = mock_api()
+
+    api_client.list_images()
+    api_client.list_images()
+    assert server.request_counts["GET /images/v1"] == 1
+
+    api_client.update_image(1, name="Renamed")
+    api_client.list_images()
+    assert server.request_counts["GET /images/v1"] == 2
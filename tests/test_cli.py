@@ -0,0 +1,156 @@
+"""
+Smoke tests of the CLI against the mock API server.
+"""
+
+import json
+import re
+
+from .mock_server import Dataset
+
+APP_ARGS = ("-o", "org-0", "-s", "space-0", "-i", "instance-0", "-a", "app-0")
+SESSIONS_ENDPOINT = (
+    r"GET /sessions/v1/org/([^/]+)/space/([^/]+)/instance/([^/]+)/app/([^/]+)"
+)
+
+
+def inject_failures(server, path: str, failures):
+    """
+    Makes the requests whose path matches `path` fail in the given order, e.g. `["throttle", None, "error"]`,
+    and succeed once the failures are used up.
+    """
+    failures = list(failures)
+    inject = server.inject
+
+    def scripted(request_path):
+        if failures and re.search(path, request_path):
+            return failures.pop(0) or inject(request_path)
+        return inject(request_path)
+
+    server.inject = scripted
+
+
+def _messages(path):
+    return [json.loads(line)["msg"] for line in path.read_text().splitlines()]
+
+
+def test_retries_throttled_and_unavailable_requests(mock_api, cli):
+    server = mock_api(retry_after_secs=0)
+    inject_failures(server, r"^/orgs/v1$", ["throttle", "error"])
+
+    result = cli("--no-cache", "orgs", "list", "-f", "json")
+
+    assert result.exit_code == 0, result.output
+    assert [org["slug"] for org in json.loads(result.stdout)] == ["org-0", "org-1"]
+    assert server.request_counts["GET /orgs/v1"] == 3
+
+
+def test_gives_up_after_the_configured_retries(mock_api, cli):
+    server = mock_api()
+    inject_failures(server, r"^/orgs/v1$", ["error"] * 10)
+
+    result = cli("--no-cache", "--retries", "2", "orgs", "list")
+
+    assert result.exit_code != 0
+    assert server.request_counts["GET /orgs/v1"] == 2
+
+
+def test_sessions_list_all_pages(mock_api, cli):
+    server = mock_api(Dataset(sessions_per_app=250))
+
+    result = cli("--no-cache", "sessions", "list", *APP_ARGS, "--all", "-f", "ndjson")
+
+    assert result.exit_code == 0, result.output
+    sessions = [json.loads(line) for line in result.stdout.splitlines()]
+    assert len(sessions) == 250
+    assert len({s["session_id"] for s in sessions}) == 250
+    # One page with all sessions, and at most two empty pages prefetched after it
+    assert server.request_counts[SESSIONS_ENDPOINT] in (2, 3)
+
+
+def test_sessions_list_all_pages_of_the_requested_size(mock_api, cli):
+    server = mock_api(Dataset(sessions_per_app=250))
+
+    result = cli(
+        "--no-cache", "sessions", "list", *APP_ARGS, "--all", "--per-page", "100",
+        "-f", "ndjson",
+    )  # fmt: skip
+
+    assert result.exit_code == 0, result.output
+    assert len(result.stdout.splitlines()) == 250
+    # 3 pages of 100 sessions, and at most one empty page prefetched after the last one
+    assert server.request_counts[SESSIONS_ENDPOINT] in (3, 4)
+
+
+def test_export_logs_resumes_after_a_failure(mock_api, cli, tmp_path):
+    server = mock_api(Dataset(log_lines_per_container=200))
+    output = tmp_path / "logs.ndjson"
+    args = ("sessions", "export-logs", str(output), "--session-id", "sess-1")
+    args += ("-c", "app", "--chunk-lines", "50")
+    inject_failures(server, r"/logs$", [None, None, "error"])
+
+    result = cli("--no-cache", "--retries", "1", *args)
+
+    assert result.exit_code != 0
+    assert output.with_name(output.name + ".cursor.json").exists()
+    # The first two chunks were exported before the failure
+    assert 50 < len(_messages(output)) < 200
+    assert _messages(output) == [f"app line {n}" for n in range(len(_messages(output)))]
+
+    result = cli("--no-cache", *args, "--resume")
+
+    assert result.exit_code == 0, result.output
+    assert _messages(output) == [f"app line {n}" for n in range(200)]
+
+
+def test_export_logs_refuses_to_overwrite_without_resume(mock_api, cli, tmp_path):
+    mock_api()
+    output = tmp_path / "logs.ndjson"
+    output.write_text("")
+
+    result = cli(
+        "sessions", "export-logs", str(output), "--session-id", "sess-1", "-c", "app"
+    )
+
+    assert result.exit_code != 0
+    assert "already exists" in result.output
+
+
+def test_tasks_wait(mock_api, cli):
+    server = mock_api(task_duration_secs=0.3)
+    tkids = [str(server.state.create_task("CREATE_SNAPSHOT")["tkid"]) for _ in range(3)]
+
+    result = cli(
+        "--poll-min-secs", "0.05", "--poll-max-secs", "0.1",
+        "tasks", "wait", *tkids, "-f", "json",
+    )  # fmt: skip
+
+    assert result.exit_code == 0, result.output
+    tasks = json.loads(result.stdout)
+    assert sorted(str(t["id"]) for t in tasks) == sorted(tkids)
+    assert {t["status"] for t in tasks} == {"COMPLETED"}
+
+
+def test_tasks_wait_reads_task_ids_from_stdin(mock_api, cli):
+    server = mock_api(task_duration_secs=0.1)
+    tkid = server.state.create_task("CREATE_SNAPSHOT")["tkid"]
+
+    result = cli(
+        "--poll-min-secs", "0.05", "tasks", "wait", "-f", "json", input=f"{tkid}\n"
+    )
+
+    assert result.exit_code == 0, result.output
+    assert [t["status"] for t in json.loads(result.stdout)] == ["COMPLETED"]
+
+
+def test_tasks_wait_prints_valid_json_on_timeout(mock_api, cli):
+    server = mock_api(task_duration_secs=60)
+    slow = server.state.create_task("CREATE_SNAPSHOT")["tkid"]
+
+    result = cli(
+        "--poll-min-secs", "0.05", "tasks", "wait", "999", str(slow),
+        "--timeout", "1", "-f", "json",
+    )  # fmt: skip
+
+    assert result.exit_code != 0
+    # The task that is not known to the server is reported as completed before the timeout
+    assert [t["id"] for t in json.loads(result.stdout)] == [999]
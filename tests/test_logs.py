@@ -0,0 +1,96 @@
+"""
+Tests of paging through session logs with `LogCursor` and of merging the logs of several containers.
+"""
+
+import click
+import pytest
+
+from nuvolos_cli import api_client
+from nuvolos_cli.api_client import LogCursor, iter_session_log_chunks
+
+
+def _entries(timestamps, container="app"):
+    return [{"ts": ts, "msg": f"{container} {n}"} for n, ts in enumerate(timestamps)]
+
+
+@pytest.fixture
+def logs(monkeypatch):
+    """
+    Serves the entries of `logs[container]` like the API: the first `max_lines` entries from `from_start` on,
+    inclusive. Returns the dict of entries per container and records the requests in `logs["requests"]`.
+    """
+    logs = {"requests": []}
+
+    def get_session_logs(session_id, container_name, max_lines=None, from_start=None):
+        logs["requests"].append(from_start)
+        entries = [
+            e
+            for e in logs[container_name]
+            if from_start is None or e["ts"] >= from_start
+        ]
+        return entries[: max_lines or api_client.DEFAULT_LOG_LINES]
+
+    monkeypatch.setattr(api_client, "get_session_logs", get_session_logs)
+    return logs
+
+
+def test_cursor_skips_the_entries_already_seen_at_the_last_timestamp():
+    cursor = LogCursor()
+    first = _entries(["t1", "t2", "t2"])
+
+    assert cursor.advance(first) == first
+    assert cursor.position == "t2"
+    # The next batch starts at the last timestamp, which is inclusive
+    assert cursor.advance(first[1:] + [{"ts": "t2", "msg": "new"}]) == [
+        {"ts": "t2", "msg": "new"}
+    ]
+    assert cursor.advance([{"ts": "t1", "msg": "old"}, {"ts": "t3", "msg": "x"}]) == [
+        {"ts": "t3", "msg": "x"}
+    ]
+
+
+def test_cursor_rejects_unstructured_logs():
+    with pytest.raises(click.ClickException):
+        LogCursor().advance(["plain text"])
+
+
+def test_chunks_have_no_duplicates_at_chunk_boundaries(logs):
+    # Chunks of 3 lines end in the middle of the entries sharing a timestamp
+    logs["app"] = _entries(["t1", "t2", "t2", "t3", "t3", "t4", "t5"])
+
+    chunks = list(iter_session_log_chunks("sess-1", "app", LogCursor(), max_lines=3))
+
+    assert [e for chunk in chunks for e in chunk] == logs["app"]
+    assert logs["requests"] == [None, "t2", "t3", "t4"]
+
+
+def test_chunks_resume_from_a_saved_cursor(logs):
+    logs["app"] = _entries(["t1", "t2", "t3", "t3", "t4", "t5", "t6"])
+    cursor = LogCursor()
+    chunks = iter_session_log_chunks("sess-1", "app", cursor, max_lines=3)
+    exported = next(chunks) + next(chunks)
+    saved = cursor.to_dict()
+
+    resumed = LogCursor.from_dict(saved)
+    for chunk in iter_session_log_chunks("sess-1", "app", resumed, max_lines=3):
+        exported += chunk
+
+    assert exported == logs["app"]
+
+
+def test_chunks_fail_when_a_timestamp_has_more_entries_than_a_chunk(logs):
+    logs["app"] = _entries(["t1", "t1", "t1", "t1"])
+
+    with pytest.raises(click.ClickException, match="share the timestamp"):
+        list(iter_session_log_chunks("sess-1", "app", LogCursor(), max_lines=2))
+
+
+def test_merges_the_logs_of_several_containers_in_order(logs):
+    logs["app"] = _entries(["t3", "t1", "t5"], "app")
+    logs["sidecar"] = _entries(["t2", "t4", "t6"], "sidecar")
+
+    merged = list(api_client.merge_session_logs("sess-1", ["app", "sidecar"]))
+
+    assert [e["ts"] for e in merged] == ["t1", "t2", "t3", "t4", "t5", "t6"]
+    assert [e["container"] for e in merged] == ["app", "sidecar"] * 3
+    assert merged[0] == {"container": "app", "ts": "t1", "msg": "app 1"}
@@ -0,0 +1,76 @@
+"""
+Tests of the client-side rate limit: burst and refill of the process-local and the file-based token buckets.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from nuvolos_cli import ratelimit
+from nuvolos_cli.ratelimit import FileTokenBucket, TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Replaces the clocks of the rate limiter with a fake clock that only advances when sleeping.
+    The tests use rates whose waits are exact binary fractions, so that a fake sleep refills exactly one token.
+    """
+    clock = SimpleNamespace(now=1000.0, slept=[])
+
+    def sleep(secs):
+        clock.slept.append(secs)
+        clock.now += secs
+
+    monkeypatch.setattr(
+        ratelimit,
+        "time",
+        SimpleNamespace(
+            monotonic=lambda: clock.now, time=lambda: clock.now, sleep=sleep
+        ),
+    )
+    return clock
+
+
+@pytest.fixture(params=["memory", "file"])
+def make_bucket(request, tmp_path):
+    if request.param == "file":
+        if ratelimit.fcntl is None:
+            pytest.skip("File locks are not supported on this platform")
+        return lambda rate, burst: FileTokenBucket(rate, burst, tmp_path / "bucket")
+    return TokenBucket
+
+
+def test_allows_a_burst_then_waits_for_a_token(clock, make_bucket):
+    bucket = make_bucket(4, 3)
+
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.acquire() == 0.25
+    assert clock.slept == [0.25]
+
+
+def test_refills_at_the_rate_up_to_the_burst(clock, make_bucket):
+    bucket = make_bucket(2, 4)
+    for _ in range(4):
+        bucket.acquire()
+
+    clock.now += 1
+    assert [bucket.acquire() for _ in range(2)] == [0, 0]
+    assert bucket.acquire() == 0.5
+
+    clock.now += 60
+    assert [bucket.acquire() for _ in range(4)] == [0] * 4
+    assert bucket.acquire() == 0.5
+
+
+def test_file_buckets_share_their_tokens(clock, tmp_path):
+    if ratelimit.fcntl is None:
+        pytest.skip("File locks are not supported on this platform")
+    first = FileTokenBucket(1, 3, tmp_path / "bucket")
+    second = FileTokenBucket(1, 3, tmp_path / "bucket")
+
+    first.acquire()
+    first.acquire()
+
+    assert second.acquire() == 0
+    assert second.acquire() == 1
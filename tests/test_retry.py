@@ -0,0 +1,111 @@
+"""
+Tests of the retries of transient API failures: retried statuses and methods, Retry-After and the retry budget.
+"""
+
+import pytest
+import urllib3
+
+import nuvolos_client_api
+from nuvolos_cli import retry
+from nuvolos_cli.retry import call_with_retry, retry_unsafe_requests, set_retry_policy
+
+
+class Response(object):
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self.released = False
+
+    def drain_conn(self):
+        pass
+
+    def release_conn(self):
+        self.released = True
+
+
+class Server(object):
+    """Returns the scripted responses (or raises the scripted exceptions) in order, then 200 responses."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.responses = []
+
+    def __call__(self):
+        outcome = self.script.pop(0) if self.script else 200
+        if isinstance(outcome, Exception):
+            raise outcome
+        response = outcome if isinstance(outcome, Response) else Response(outcome)
+        self.responses.append(response)
+        return response
+
+
+@pytest.fixture(autouse=True)
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(retry.time, "sleep", sleeps.append)
+    set_retry_policy(max_attempts=4, budget_secs=60)
+    yield sleeps
+    set_retry_policy()
+
+
+@pytest.mark.parametrize("status", retry.RETRY_STATUSES)
+def test_retries_transient_statuses(status):
+    server = Server(status, status)
+
+    response = call_with_retry(server, "GET", "/orgs/v1")
+
+    assert response.status == 200
+    assert len(server.responses) == 3
+    # The connections of the discarded responses are returned to the pool
+    assert [r.released for r in server.responses] == [True, True, False]
+
+
+@pytest.mark.parametrize("status", (400, 404, 409, 500))
+def test_does_not_retry_other_statuses(status):
+    server = Server(status)
+
+    assert call_with_retry(server, "GET", "/orgs/v1").status == status
+    assert len(server.responses) == 1
+
+
+def test_retries_connection_errors_but_not_api_errors():
+    server = Server(urllib3.exceptions.ProtocolError("Connection reset"))
+    assert call_with_retry(server, "GET", "/orgs/v1").status == 200
+
+    server = Server(nuvolos_client_api.ApiException(status=403))
+    with pytest.raises(nuvolos_client_api.ApiException):
+        call_with_retry(server, "GET", "/orgs/v1")
+    assert server.script == []
+
+
+def test_gives_up_after_the_maximum_attempts():
+    set_retry_policy(max_attempts=2)
+    server = Server(503, 503, 503)
+
+    assert call_with_retry(server, "GET", "/orgs/v1").status == 503
+    assert len(server.responses) == 2
+
+
+def test_retries_non_idempotent_requests_only_when_allowed():
+    server = Server(503)
+    assert call_with_retry(server, "POST", "/workloads/v1").status == 503
+
+    server = Server(503)
+    with retry_unsafe_requests():
+        assert call_with_retry(server, "POST", "/workloads/v1").status == 200
+
+
+def test_honours_retry_after(sleeps):
+    server = Server(Response(429, {"Retry-After": "7"}))
+
+    assert call_with_retry(server, "GET", "/orgs/v1").status == 200
+    assert sleeps == [7]
+
+
+def test_does_not_schedule_retries_past_the_budget(sleeps):
+    set_retry_policy(budget_secs=5)
+    server = Server(503, Response(429, {"Retry-After": "30"}))
+
+    assert call_with_retry(server, "GET", "/orgs/v1").status == 429
+    assert len(server.responses) == 2
+    assert len(sleeps) == 1
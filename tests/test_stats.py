@@ -0,0 +1,70 @@
+"""
+Tests of the session statistics, with and without NumPy.
+"""
+
+import math
+import sys
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from nuvolos_cli.stats import SessionColumns, daily_histogram, summarize
+
+
+def _session(day, runtime_seconds, credits_spent=None):
+    return SimpleNamespace(
+        start_time=datetime(2025, 1, day, 12, tzinfo=timezone.utc),
+        runtime_seconds=runtime_seconds,
+        ncu=1,
+        ncu_hours_used=runtime_seconds / 3600,
+        credits_spent=credits_spent,
+    )
+
+
+SESSIONS = [
+    _session(1 + n % 2, 3600 * (n + 1), credits_spent=n or None) for n in range(10)
+]
+
+
+@pytest.fixture(params=["numpy", "array"])
+def numpy_path(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        # Makes `import numpy` raise ImportError
+        monkeypatch.setitem(sys.modules, "numpy", None)
+    return request.param
+
+
+def test_summarize(numpy_path):
+    summary = {
+        s["metric"]: s for s in summarize(SessionColumns.from_sessions(SESSIONS))
+    }
+
+    runtime = summary["runtime_seconds"]
+    assert runtime["count"] == 10
+    assert runtime["total"] == 3600 * 55
+    assert runtime["mean"] == 3600 * 5.5
+    assert runtime["max"] == 36000
+    assert runtime["p50"] == pytest.approx(3600 * 5.5)
+    assert runtime["p90"] == pytest.approx(3600 * 9.1)
+    assert runtime["p99"] == pytest.approx(3600 * 9.91)
+    # Missing values are not counted
+    assert summary["credits_spent"]["count"] == 9
+    assert summary["credits_spent"]["p50"] == 5
+
+
+def test_summarize_without_values(numpy_path):
+    summary = summarize(SessionColumns.from_sessions([_session(1, 60)]))
+    assert {"metric": "credits_spent", "count": 0} in summary
+
+
+def test_daily_histogram(numpy_path):
+    histogram = daily_histogram(SessionColumns.from_sessions(SESSIONS))
+
+    assert [row["date"] for row in histogram] == ["2025-01-01", "2025-01-02"]
+    assert [row["sessions"] for row in histogram] == [5, 5]
+    assert [row["runtime_hours"] for row in histogram] == [25, 30]
+    assert [row["credits_spent"] for row in histogram] == [20, 25]
+    assert not any(math.isnan(row["credits_spent"]) for row in histogram)
@@ -0,0 +1,37 @@
+"""
+Tests of the endpoint names of traced requests.
+"""
+
+import pytest
+
+from nuvolos_cli.tracing import endpoint_of
+
+HOST = "https://api.example.com"
+
+
+@pytest.mark.parametrize(
+    "url, endpoint",
+    [
+        ("/orgs/v1", "GET /orgs/v1"),
+        ("/spaces/v1/org/my-org", "GET /spaces/v1/org/{org}"),
+        (
+            "/apps/v1/org/o/space/s/instance/i/snapshot/development?x=1",
+            "GET /apps/v1/org/{org}/space/{space}/instance/{instance}/snapshot/{snapshot}",
+        ),
+        (
+            "/workloads/v1/org/o/space/s/instance/i/snapshot/dev/app/a/execute",
+            "GET /workloads/v1/org/{org}/space/{space}/instance/{instance}/snapshot/{snapshot}/app/{app}/execute",
+        ),
+        ("/tasks/v1/1234", "GET /tasks/v1/{id}"),
+        (
+            "/sessions/v1/sess-1/container/app/logs",
+            "GET /sessions/v1/{id}/container/{container}/logs",
+        ),
+        (
+            "/files/v1/org/o/space/s/instance/i/snapshot/dev/files/a/b/c.txt",
+            "GET /files/v1/org/{org}/space/{space}/instance/{instance}/snapshot/{snapshot}/files/{path}",
+        ),
+    ],
+)
+def test_endpoint_of(url, endpoint):
+    assert endpoint_of("GET", HOST + url) == endpoint
@@ -0,0 +1,54 @@
+"""
+Tests of the row keys and change events of `--watch`, and of the percentiles.
+"""
+
+import pytest
+
+from nuvolos_cli.utils import _row_key, diff_rows, percentile
+
+
+def test_row_key_uses_the_identifying_field_within_its_scope():
+    assert _row_key({"id": 7, "slug": "ignored"}) == "7"
+    app = {"org_slug": "o", "space_slug": "s", "instance_slug": "i", "slug": "app"}
+    assert _row_key(app) == "o/s/i/app"
+    # Applications with the same slug in other instances are different rows
+    assert _row_key(dict(app, instance_slug="j")) != _row_key(app)
+
+
+def test_row_key_of_rows_without_identifying_field_is_their_content():
+    assert _row_key({"b": 1, "a": 2}) == _row_key({"a": 2, "b": 1})
+    assert _row_key({"a": 1}) != _row_key({"a": 2})
+
+
+def test_diff_rows():
+    previous = {
+        "a": {"slug": "a", "status": "RUNNING"},
+        "b": {"slug": "b", "status": "RUNNING"},
+    }
+    current = {
+        "a": {"slug": "a", "status": "STOPPING", "node_pool": "np-0"},
+        "c": {"slug": "c", "status": "STARTING"},
+    }
+
+    events = {e["event"]: e for e in diff_rows(previous, current)}
+
+    assert sorted(events) == ["added", "changed", "removed"]
+    assert events["added"]["key"] == "c"
+    assert events["removed"]["data"] == previous["b"]
+    assert events["changed"]["changes"] == {
+        "status": {"old": "RUNNING", "new": "STOPPING"},
+        "node_pool": {"old": None, "new": "np-0"},
+    }
+    assert diff_rows(current, current) == []
+
+
+@pytest.mark.parametrize(
+    "q, expected", [(0, 1), (50, 2.5), (90, 3.7), (99, 3.97), (100, 4)]
+)
+def test_percentile_interpolates_between_ranks(q, expected):
+    assert percentile([1, 2, 3, 4], q) == pytest.approx(expected)
+
+
+def test_percentile_of_no_values():
+    assert percentile([], 50) is None
+    assert percentile([5], 99) == 5
@@ -0,0 +1,93 @@
+"""
+Tests of waiting for many applications with `wait_for_apps`.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from nuvolos_cli import api_client
+from nuvolos_cli.api_client import wait_for_apps
+
+FAST = dict(max_workers=2, poll_min_secs=0.01, poll_max_secs=0.02)
+
+
+def _app(slug):
+    return {"org_slug": "o", "space_slug": "s", "instance_slug": "i", "app_slug": slug}
+
+
+@pytest.fixture
+def workloads(monkeypatch):
+    """
+    Returns a dict of the scripted workload statuses of every application slug: a list of polls,
+    each a list of workload statuses. The last poll is repeated once the others are used up.
+    """
+    workloads = {}
+
+    def list_all_running_workloads_for_app(
+        org_slug, space_slug, instance_slug, app_slug
+    ):
+        polls = workloads[app_slug]
+        statuses = polls.pop(0) if len(polls) > 1 else polls[0]
+        return [SimpleNamespace(status=status) for status in statuses]
+
+    monkeypatch.setattr(
+        api_client,
+        "list_all_running_workloads_for_app",
+        list_all_running_workloads_for_app,
+    )
+    return workloads
+
+
+def test_waits_until_all_apps_are_running(workloads):
+    workloads["a"] = [[], ["STARTING"], ["RUNNING"]]
+    workloads["b"] = [["RUNNING"]]
+
+    events = list(wait_for_apps([_app("a"), _app("b")], timeout_secs=10, **FAST))
+
+    states = [(e["app"]["app_slug"], e["previous"], e["state"]) for e in events]
+    assert states == [
+        ("a", None, "PENDING"),
+        ("b", None, "RUNNING"),
+        ("a", "PENDING", "STARTING"),
+        ("a", "STARTING", "RUNNING"),
+    ]
+    assert [e["final"] for e in events] == [False, True, False, True]
+
+
+def test_fails_apps_whose_workload_failed(workloads):
+    workloads["a"] = [["STARTING"], ["FAILED"]]
+
+    events = list(wait_for_apps([_app("a")], timeout_secs=10, **FAST))
+
+    assert events[-1]["state"] == "FAILED"
+    assert events[-1]["final"]
+    assert "FAILED" in events[-1]["error"]
+
+
+def test_fails_apps_without_workload_after_the_no_workload_timeout(workloads):
+    workloads["a"] = [[]]
+    workloads["b"] = [[], ["STARTING"]]
+
+    events = list(
+        wait_for_apps(
+            [_app("a"), _app("b")],
+            timeout_secs=0.3,
+            no_workload_timeout_secs=0.1,
+            **FAST,
+        )
+    )
+
+    final = {e["app"]["app_slug"]: e for e in events if e["final"]}
+    assert final["a"]["error"] == "No workload is available after 0.1 seconds"
+    # Applications that have a workload wait for the overall timeout instead
+    assert final["b"]["error"] == "Still in STARTING state after 0.3 seconds"
+    assert final["b"]["elapsed_secs"] >= 0.3
+
+
+def test_waits_until_apps_are_stopped(workloads):
+    workloads["a"] = [["RUNNING"], ["STOPPING"], []]
+
+    events = list(wait_for_apps([_app("a")], until="stopped", timeout_secs=10, **FAST))
+
+    assert [e["state"] for e in events] == ["RUNNING", "STOPPING", "STOPPED"]